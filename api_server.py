@@ -0,0 +1,339 @@
+# api_server.py
+"""
+Async HTTP API for the travel planner.
+
+One Tornado process serves every endpoint on a single event loop. Outbound
+calls (OpenAI, Open-Meteo, Nominatim) go through pooled async clients, and
+the geocoding, forecast, packing, profile and contacts caches are the same
+ones the Streamlit app and the batch CLI use.
+
+Endpoints:
+    POST /plan       trip form fields as JSON; add "stream": true (or
+                     ?stream=1) for NDJSON queue position and itinerary
+                     deltas, then the plan. Rate-limited per X-Client-Id
+                     (or IP): 429 when over the limit, 503 when shedding load.
+                     A near-duplicate of a recent trip reuses its itinerary
+                     (see "itinerary_match") without an LLM call or a limit.
+                     An itinerary cut off by its output budget is retried
+                     once with a larger one, then fails with a 502; a streamed
+                     one ends with an "error" event instead
+    GET  /weather    ?destination=&duration_days=
+    GET  /route      ?starting_location=&destination=&travel_mode=
+    POST /packing    {"itinerary", "destination", "duration_days", "interests",
+                      "weather_preference", "forecasts", "dest_coords"}
+    GET  /safety     ?destination=&group_type=&special_conditions=
+    GET  /health     status plus weather provider health (circuit state, latency)
+    GET  /metrics
+
+Usage:
+    python api_server.py --port 8000
+"""
+
+import argparse
+import asyncio
+import json
+import os
+
+import tornado.iostream
+import tornado.web
+
+from config.constants import MIN_DURATION_DAYS, MAX_DURATION_DAYS
+from config.openai_config import build_async_http_client
+from utils.climatology import get_climatology_store
+from utils.admission import get_llm_admission, AdmissionRejected, RateLimited
+from utils.llm_utils import stream_itinerary_async, ItineraryTruncated
+from utils.model_router import route_request, retry_route
+from utils.planner import (
+    normalize_inputs, run_weather_stage_async, run_route_stage_async, route_summary, safety_summary,
+    summarize_plan, usage_labels, reuse_cached_itinerary
+)
+from utils.prompt_builder import build_travel_prompt
+from utils.semantic_cache import remember_itinerary
+from utils.packing_utils import generate_packing_list
+from utils.trip_plan import TripPlan, PLAN_DEFAULTS
+from utils.weather_providers import provider_health
+from utils.telemetry import span, render_metrics
+
+API_PORT = int(os.getenv('API_PORT', '8000'))
+
+
+# Forecast day fields the packing rules read, and their types
+FORECAST_FIELDS = {'description': str, 'temp_max': (int, float), 'temp_min': (int, float),
+                   'rain_chance': (int, float)}
+
+
+def bounded_int(name, value, minimum=None, maximum=None):
+    """value as an int within [minimum, maximum]; raises ValueError (a 400) otherwise."""
+    if isinstance(value, bool):
+        raise ValueError(f"{name} must be an integer")
+    try:
+        value = int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{name} must be an integer")
+    if (minimum is not None and value < minimum) or (maximum is not None and value > maximum):
+        raise ValueError(f"{name} must be between {minimum} and {maximum}")
+    return value
+
+
+def forecast_days(value):
+    """A request's forecast days, checked for the fields packing reads; raises ValueError (a 400)."""
+    if value is None:
+        return None
+    if not isinstance(value, list):
+        raise ValueError("forecasts must be a list")
+    for index, day in enumerate(value):
+        if not isinstance(day, dict):
+            raise ValueError(f"forecasts[{index}] must be an object")
+        for field, kind in FORECAST_FIELDS.items():
+            if not isinstance(day.get(field), kind) or isinstance(day.get(field), bool):
+                raise ValueError(f"forecasts[{index}].{field} is missing or has the wrong type")
+    return value
+
+
+def coordinates(value):
+    """(lat, lon) from a request's [lat, lon], or None; raises ValueError (a 400)."""
+    if value is None:
+        return None
+    if (not isinstance(value, list) or len(value) != 2
+            or not all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in value)
+            or not (-90 <= value[0] <= 90 and -180 <= value[1] <= 180)):
+        raise ValueError("dest_coords must be [lat, lon]")
+    return tuple(value)
+
+
+class BaseHandler(tornado.web.RequestHandler):
+    """JSON in, JSON out; ValueError from the planner becomes a 400."""
+
+    @property
+    def http_client(self):
+        return self.application.settings['http_client']
+
+    def json_body(self):
+        try:
+            body = json.loads(self.request.body or b'{}')
+        except json.JSONDecodeError as e:
+            raise tornado.web.HTTPError(400, reason=f"invalid JSON: {e}")
+        if not isinstance(body, dict):
+            raise tornado.web.HTTPError(400, reason="request body must be a JSON object")
+        return body
+
+    def required_argument(self, name):
+        value = self.get_argument(name, '').strip()
+        if not value:
+            raise tornado.web.HTTPError(400, reason=f"missing required parameter: {name}")
+        return value
+
+    def int_argument(self, name, default, minimum=None, maximum=None):
+        return bounded_int(name, self.get_argument(name, default), minimum, maximum)
+
+    def write_json(self, payload):
+        self.set_header('Content-Type', 'application/json; charset=utf-8')
+        self.finish(json.dumps(payload, ensure_ascii=False, default=str))
+
+    def write_error(self, status_code, **kwargs):
+        reason = self._reason
+        error = kwargs.get('exc_info', (None, None))[1]
+        if isinstance(error, (ValueError, AdmissionRejected, ItineraryTruncated)):
+            reason = str(error)
+        if isinstance(error, AdmissionRejected):
+            self.set_header('Retry-After', str(error.retry_after))
+        self.set_header('Content-Type', 'application/json; charset=utf-8')
+        self.finish(json.dumps({'error': reason}))
+
+    def log_exception(self, typ, value, tb):
+        if isinstance(value, (ValueError, AdmissionRejected)):
+            return
+        super().log_exception(typ, value, tb)
+
+    def send_error(self, status_code=500, **kwargs):
+        error = kwargs.get('exc_info', (None, None))[1]
+        if isinstance(error, AdmissionRejected):
+            # 429 for a client over its rate, 503 when the server sheds load
+            status_code = 429 if isinstance(error, RateLimited) else 503
+        elif isinstance(error, ValueError):
+            status_code = 400
+        elif isinstance(error, ItineraryTruncated):
+            # The model could not finish the itinerary even with the larger retry budget
+            status_code = 502
+        super().send_error(status_code, **kwargs)
+
+
+class PlanHandler(BaseHandler):
+    async def post(self):
+        body = self.json_body()
+        stream = bool(body.get('stream')) or self.get_argument('stream', '') in ('1', 'true')
+        inputs = normalize_inputs(body)
+        plan = TripPlan.for_inputs(inputs)
+
+        # A near-duplicate trip's itinerary is reused without an LLM call; otherwise
+        # rate limits and load shedding apply before any work starts (429/503)
+        reused = reuse_cached_itinerary(plan)
+        if not reused:
+            admission = get_llm_admission()
+            client_ip = self.request.remote_ip
+            ticket = admission.enqueue(self.request.headers.get('X-Client-Id') or client_ip, client_ip)
+
+        with span('api_plan', stream=stream):
+            # Route and weather run while the call queues and the itinerary streams;
+            # weather reuses the route's coordinates
+            async def weather_and_route():
+                await run_route_stage_async(plan, self.http_client)
+                await run_weather_stage_async(plan, self.http_client, coords=plan.dest_coords)
+            side_stages = asyncio.ensure_future(weather_and_route())
+
+            async def send_event(event):
+                self.write(json.dumps(event, ensure_ascii=False) + "\n")
+                await self.flush()
+
+            if stream:
+                self.set_header('Content-Type', 'application/x-ndjson; charset=utf-8')
+                self.set_header('Cache-Control', 'no-cache')
+
+            if reused:
+                if stream:
+                    await send_event({'type': 'itinerary_delta', 'text': plan.itinerary})
+                await side_stages
+                result = summarize_plan(plan)
+                return self._finish_plan(result, stream)
+
+            with span('prompt_build'):
+                prompt = build_travel_prompt(**inputs)
+            try:
+                on_wait = (lambda position: send_event({'type': 'queued', 'position': position})) if stream else None
+                async with admission.admit_async(None, ticket=ticket, on_wait=on_wait):
+                    route = route_request(inputs)
+                    # A streamed client already has the cut-off text, so only a buffered reply is retried, once
+                    retry = not stream
+                    while True:
+                        chunks = []
+                        deltas = stream_itinerary_async(prompt, model=route.model, labels=usage_labels(inputs),
+                                                        max_output_tokens=route.max_output_tokens)
+                        try:
+                            async for delta in deltas:
+                                chunks.append(delta)
+                                if stream:
+                                    await send_event({'type': 'itinerary_delta', 'text': delta})
+                            break
+                        except ItineraryTruncated:
+                            route = retry_route(route) if retry else None
+                            retry = False
+                            if route is None:
+                                raise
+                        finally:
+                            await deltas.aclose()
+            except tornado.iostream.StreamClosedError:
+                side_stages.cancel()
+                return
+            except Exception as e:
+                side_stages.cancel()
+                if not stream or not self._headers_written:
+                    raise
+                message = str(e) if isinstance(e, AdmissionRejected) else f"Failed to generate itinerary: {e}"
+                self.finish(json.dumps({'type': 'error', 'error': message}) + "\n")
+                return
+
+            plan.complete('itinerary', itinerary=''.join(chunks))
+            remember_itinerary(inputs, plan.itinerary)
+            await side_stages
+            result = summarize_plan(plan)
+
+        self._finish_plan(result, stream)
+
+    def _finish_plan(self, result, stream):
+        if stream:
+            self.finish(json.dumps({'type': 'plan', 'plan': result}, ensure_ascii=False, default=str) + "\n")
+        else:
+            self.write_json(result)
+
+
+class WeatherHandler(BaseHandler):
+    async def get(self):
+        plan = TripPlan.for_inputs({
+            'destination': self.required_argument('destination'),
+            'duration_days': self.int_argument(
+                'duration_days', PLAN_DEFAULTS['duration_days'], MIN_DURATION_DAYS, MAX_DURATION_DAYS
+            )
+        })
+        await run_weather_stage_async(plan, self.http_client)
+        self.write_json({'forecasts': plan.weather_forecast, 'notice': plan.weather_notice})
+
+
+class RouteHandler(BaseHandler):
+    async def get(self):
+        plan = TripPlan.for_inputs({
+            'starting_location': self.required_argument('starting_location'),
+            'destination': self.required_argument('destination'),
+            'travel_mode': self.get_argument('travel_mode', PLAN_DEFAULTS['travel_mode'])
+        })
+        await run_route_stage_async(plan, self.http_client)
+        self.write_json(route_summary(plan))
+
+
+class PackingHandler(BaseHandler):
+    def post(self):
+        body = self.json_body()
+        if not body.get('destination') or not isinstance(body['destination'], str):
+            raise ValueError("missing required field: destination")
+        for field in ('itinerary', 'interests', 'weather_preference'):
+            if not isinstance(body.get(field, ''), str):
+                raise ValueError(f"{field} must be a string")
+        items = generate_packing_list(
+            body.get('itinerary', ''), body['destination'],
+            bounded_int('duration_days', body.get('duration_days', PLAN_DEFAULTS['duration_days']),
+                        MIN_DURATION_DAYS, MAX_DURATION_DAYS),
+            body.get('interests', ''), body.get('weather_preference', ''),
+            forecast_days(body.get('forecasts')), coordinates(body.get('dest_coords'))
+        )
+        self.write_json({'items': items})
+
+
+class SafetyHandler(BaseHandler):
+    def get(self):
+        self.write_json(safety_summary(
+            self.required_argument('destination'),
+            self.get_argument('group_type', PLAN_DEFAULTS['group_type']),
+            self.get_argument('special_conditions', '')
+        ))
+
+
+class HealthHandler(BaseHandler):
+    def get(self):
+        self.write_json({'status': 'ok', 'weather_providers': provider_health()})
+
+
+class MetricsHandler(BaseHandler):
+    def get(self):
+        self.set_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.finish(render_metrics())
+
+
+def make_app():
+    return tornado.web.Application([
+        (r'/plan', PlanHandler),
+        (r'/weather', WeatherHandler),
+        (r'/route', RouteHandler),
+        (r'/packing', PackingHandler),
+        (r'/safety', SafetyHandler),
+        (r'/health', HealthHandler),
+        (r'/metrics', MetricsHandler)
+    ], http_client=build_async_http_client())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Async HTTP API for the travel planner")
+    parser.add_argument('--port', type=int, default=API_PORT, help=f"listen port (default {API_PORT})")
+    parser.add_argument('--address', default='0.0.0.0', help="listen address (default 0.0.0.0)")
+    args = parser.parse_args(argv)
+
+    async def serve():
+        get_climatology_store()
+        app = make_app()
+        app.listen(args.port, address=args.address)
+        print(f"Travel planner API listening on http://{args.address}:{args.port}")
+        await asyncio.Event().wait()
+
+    asyncio.run(serve())
+
+
+if __name__ == '__main__':
+    main()
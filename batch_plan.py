@@ -0,0 +1,131 @@
+# batch_plan.py
+"""
+Headless batch planner.
+
+Reads a JSONL file of trip requests - one JSON object per line with the same
+fields as the travel form (destination, starting_location, duration_days,
+budget, group_type, ...) - and plans every trip on a bounded worker pool.
+Each result is written as one JSONL line as soon as it is ready, carrying
+the request's line number and its optional "id".
+
+Usage:
+    python batch_plan.py trips.jsonl -o plans.jsonl --workers 4
+"""
+
+import argparse
+import json
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+from utils.planner import plan_trip
+
+
+def read_requests(path):
+    """Yield (line number, request dict or error message) for each non-blank line."""
+    with open(path, encoding='utf-8') as f:
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                request = json.loads(line)
+            except json.JSONDecodeError as e:
+                yield line_number, f"invalid JSON: {e}"
+                continue
+            if not isinstance(request, dict):
+                yield line_number, "request must be a JSON object"
+                continue
+            yield line_number, request
+
+
+def plan_request(line_number, request):
+    """Plan one request and return its output record (never raises)."""
+    started = time.perf_counter()
+    record = {'line': line_number, 'id': None}
+    try:
+        if isinstance(request, str):
+            raise ValueError(request)
+        record['id'] = request.get('id')
+        record['plan'] = plan_trip(request)
+        record['status'] = 'ok'
+    except Exception as e:
+        record['status'] = 'error'
+        record['error'] = f"{type(e).__name__}: {e}"
+    record['duration_s'] = round(time.perf_counter() - started, 3)
+    return record
+
+
+class Progress:
+    """Prints completed/failed counts, throughput and ETA to stderr."""
+
+    def __init__(self, total, every=1):
+        self.total = total
+        self.every = every
+        self.done = 0
+        self.failed = 0
+        self.started = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def update(self, record):
+        with self._lock:
+            self.done += 1
+            self.failed += record['status'] != 'ok'
+            if self.done % self.every and self.done != self.total:
+                return
+            elapsed = time.perf_counter() - self.started
+            rate = self.done / elapsed if elapsed else 0.0
+            eta = (self.total - self.done) / rate if rate else 0.0
+            print(f"[{self.done}/{self.total}] failed={self.failed} "
+                  f"{rate:.2f} trips/s  elapsed {elapsed:.0f}s  eta {eta:.0f}s", file=sys.stderr, flush=True)
+
+
+def run_batch(requests, output, workers, progress):
+    """Plan requests on `workers` threads, keeping at most 2 x workers in flight."""
+    max_in_flight = workers * 2
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='planner') as pool:
+        in_flight = set()
+        for line_number, request in requests:
+            if len(in_flight) >= max_in_flight:
+                finished, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    write_record(future.result(), output, progress)
+            in_flight.add(pool.submit(plan_request, line_number, request))
+        for future in in_flight:
+            write_record(future.result(), output, progress)
+
+
+def write_record(record, output, progress):
+    output.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+    output.flush()
+    progress.update(record)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Plan a JSONL file of trips without the web UI")
+    parser.add_argument('input', help="JSONL file of trip requests")
+    parser.add_argument('-o', '--output', default='-', help="JSONL output file (default: stdout)")
+    parser.add_argument('-w', '--workers', type=int, default=4, help="concurrent trips (default 4)")
+    parser.add_argument('--progress-every', type=int, default=1, help="print progress every N trips")
+    args = parser.parse_args(argv)
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+
+    requests = list(read_requests(args.input))
+    progress = Progress(len(requests), max(1, args.progress_every))
+    output = sys.stdout if args.output == '-' else open(args.output, 'w', encoding='utf-8')
+    try:
+        run_batch(requests, output, args.workers, progress)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+    elapsed = time.perf_counter() - progress.started
+    print(f"Planned {progress.done - progress.failed}/{progress.total} trips in {elapsed:.1f}s "
+          f"({progress.done / elapsed if elapsed else 0:.2f} trips/s), {progress.failed} failed",
+          file=sys.stderr)
+    return 1 if progress.failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,4 @@
+"""
+Benchmarks Package for AI Travel Planner
+Micro-benchmarks for the pure-Python hot paths, run against recorded fixtures.
+"""
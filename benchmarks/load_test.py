@@ -0,0 +1,305 @@
+"""
+Load Test
+Drives simulated user sessions through the real app.py flow: the app runs
+under `streamlit run` as a subprocess and every session is a websocket
+client speaking Streamlit's own protocol - load the page, fill the trip
+form, submit, wait for the script run with every tab to finish. OpenAI,
+Open-Meteo and Nominatim are served by the local stub server.
+
+(AppTest cannot be used here: it installs a process-global mock runtime for
+each run, so two sessions in one process corrupt each other.)
+
+Concurrency is ramped through --levels. For every level the report shows
+throughput, p50/p99 end-to-end latency, errors and server memory per
+connected session; the saturation point is the first level where
+throughput stops growing or p99 breaks the SLO.
+
+Usage (from the repository root):
+    python -m benchmarks.load_test --levels 1,2,4,8,16 --llm-total 2.0
+"""
+
+import argparse
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+from tornado.websocket import websocket_connect
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_FILE = os.path.join(ROOT_DIR, 'app.py')
+
+# A level "still scales" while throughput grows by at least this much
+SCALING_GAIN = 0.10
+
+# Alert.Format values from Streamlit's protobuf
+ALERT_ERROR = 1
+ALERT_SUCCESS = 4
+
+
+def reserve_port():
+    """A free local port (bound later by the stub or app server)."""
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def rss_bytes(pid):
+    """Resident set size of a process, from /proc (Linux)."""
+    try:
+        with open(f'/proc/{pid}/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError):
+        return None
+
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+def start_app_server(port, env, timeout=60):
+    """Start `streamlit run app.py` and wait until it reports healthy.
+
+    The server's stderr goes to an unlinked temp file, not a pipe: nobody
+    reads a pipe during the run, and a full one would block the server and
+    show up as false saturation.
+    """
+    log = tempfile.TemporaryFile()
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'streamlit', 'run', APP_FILE, '--server.headless', 'true',
+         '--server.port', str(port), '--server.fileWatcherType', 'none',
+         '--browser.gatherUsageStats', 'false'],
+        cwd=ROOT_DIR, env=env, stdout=subprocess.DEVNULL, stderr=log
+    )
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if process.poll() is not None:
+            log.seek(max(0, log.seek(0, os.SEEK_END) - 500))
+            raise RuntimeError(f"app server exited: {log.read().decode(errors='replace')}")
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=1) as response:
+                if response.status == 200:
+                    log.close()  # the server keeps its own handle
+                    return process
+        except OSError:
+            time.sleep(0.25)
+    process.terminate()
+    log.close()
+    raise RuntimeError(f"app server not healthy after {timeout}s")
+
+
+class Session:
+    """One browser tab, speaking the Streamlit websocket protocol."""
+
+    def __init__(self, port):
+        self.url = f"ws://127.0.0.1:{port}/_stcore/stream"
+        self.ws = None
+
+    async def connect(self):
+        self.ws = await websocket_connect(self.url, subprotocols=['streamlit'], max_message_size=256 * 2 ** 20)
+
+    async def rerun(self, widget_states=()):
+        """Request a script run and collect its elements until it finishes."""
+        from streamlit.proto.BackMsg_pb2 import BackMsg
+        from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+        back = BackMsg()
+        back.rerun_script.query_string = ''
+        back.rerun_script.widget_states.SetInParent()
+        for state in widget_states:
+            back.rerun_script.widget_states.widgets.append(state)
+        await self.ws.write_message(back.SerializeToString(), binary=True)
+
+        elements = []
+        while True:
+            raw = await self.ws.read_message()
+            if raw is None:
+                raise ConnectionError("websocket closed during script run")
+            message = ForwardMsg()
+            message.ParseFromString(raw)
+            kind = message.WhichOneof('type')
+            if kind == 'delta' and message.delta.WhichOneof('type') == 'new_element':
+                element = message.delta.new_element
+                elements.append((element.WhichOneof('type'), element))
+            elif kind == 'script_finished':
+                return elements
+
+    def close(self):
+        if self.ws is not None:
+            self.ws.close()
+
+
+async def run_session(port, inputs, timeout):
+    """One user: load the page, submit the trip form, wait for the results. Returns (result, Session)."""
+    from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+    session = Session(port)
+    started = time.perf_counter()
+    try:
+        await session.connect()
+        elements = await asyncio.wait_for(session.rerun(), timeout)
+
+        text_inputs = {e.text_input.label.rstrip('*'): e.text_input.id for kind, e in elements if kind == 'text_input'}
+        submit = next(e.button.id for kind, e in elements if kind == 'button' and e.button.is_form_submitter)
+        states = []
+        for label, field in (('Destination', 'destination'), ('Starting Location', 'starting_location')):
+            states.append(WidgetState(id=text_inputs[label], string_value=inputs[field]))
+        states.append(WidgetState(id=submit, trigger_value=True))
+        elements = await asyncio.wait_for(session.rerun(states), timeout)
+    except Exception as e:
+        return {'latency_s': None, 'ok': False, 'error': f"{type(e).__name__}: {e}"}, session
+    latency = time.perf_counter() - started
+
+    problems = [e.exception.message for kind, e in elements if kind == 'exception']
+    problems += [e.alert.body for kind, e in elements if kind == 'alert' and e.alert.format == ALERT_ERROR]
+    if not problems and not any(kind == 'alert' and e.alert.format == ALERT_SUCCESS for kind, e in elements):
+        problems.append('plan was not generated')
+    return {
+        'latency_s': latency,
+        'ok': not problems,
+        'error': problems[0] if problems else None
+    }, session
+
+
+async def run_level(port, server_pid, concurrency, sessions, inputs, timeout):
+    """Run `sessions` sessions with at most `concurrency` in flight and summarize them."""
+    semaphore = asyncio.Semaphore(concurrency)
+    live = []  # sessions stay connected until the level ends, like open browser tabs
+
+    async def task():
+        async with semaphore:
+            result, session = await run_session(port, inputs, timeout)
+            live.append(session)
+            return result
+
+    rss_before = rss_bytes(server_pid)
+    started = time.perf_counter()
+    results = await asyncio.gather(*(task() for _ in range(sessions)))
+    elapsed = time.perf_counter() - started
+    rss_after = rss_bytes(server_pid)
+    for session in live:
+        session.close()
+
+    latencies = [r['latency_s'] for r in results if r['ok']]
+    errors = [r['error'] for r in results if not r['ok']]
+    rss_per_session = None
+    if rss_before is not None and rss_after is not None:
+        rss_per_session = max(0, rss_after - rss_before) / sessions / 1024
+    return {
+        'concurrency': concurrency,
+        'sessions': sessions,
+        'completed': len(latencies),
+        'errors': len(errors),
+        'first_error': errors[0] if errors else None,
+        'throughput': len(latencies) / elapsed if elapsed else 0.0,
+        'p50_s': percentile(latencies, 0.50) if latencies else None,
+        'p99_s': percentile(latencies, 0.99) if latencies else None,
+        'rss_per_session_kb': rss_per_session
+    }
+
+
+def find_saturation(levels, slo_p99):
+    """First concurrency level that no longer scales or misses the p99 SLO, or (None, None)."""
+    best_throughput = 0.0
+    for level in levels:
+        if level['p99_s'] is None:
+            return level['concurrency'], 'no session completed'
+        if slo_p99 and level['p99_s'] > slo_p99:
+            return level['concurrency'], f"p99 over the {slo_p99:.1f}s SLO"
+        if best_throughput and level['throughput'] < best_throughput * (1 + SCALING_GAIN):
+            return level['concurrency'], 'throughput stopped growing'
+        best_throughput = max(best_throughput, level['throughput'])
+    return None, None
+
+
+def format_seconds(value):
+    return f"{value:.2f}s" if value is not None else '-'
+
+
+def print_report(levels, stub_counts, slo_p99):
+    print(f"\n{'conc':>4} {'done':>5} {'err':>4} {'req/s':>7} {'p50':>7} {'p99':>7} {'RSS/session':>12}")
+    for level in levels:
+        rss = f"{level['rss_per_session_kb']:.0f} KB" if level['rss_per_session_kb'] is not None else '-'
+        print(f"{level['concurrency']:>4} {level['completed']:>5} {level['errors']:>4} {level['throughput']:>7.2f} "
+              f"{format_seconds(level['p50_s']):>7} {format_seconds(level['p99_s']):>7} {rss:>12}")
+        if level['first_error']:
+            print(f"     first error: {str(level['first_error'])[:120]}")
+
+    concurrency, reason = find_saturation(levels, slo_p99)
+    if concurrency is None:
+        print(f"\nNo saturation up to concurrency {levels[-1]['concurrency']}")
+    else:
+        print(f"\nSaturation at concurrency {concurrency} ({reason})")
+    print("Stub requests: " + ", ".join(f"{name}={count}" for name, count in sorted(stub_counts.items())))
+
+
+async def run_levels(port, server_pid, levels, sessions, inputs, timeout):
+    # One warm-up session so imports and process-wide caches are not billed to level 1
+    result, session = await run_session(port, inputs, timeout)
+    session.close()
+    if not result['ok']:
+        raise RuntimeError(f"warm-up session failed: {result['error']}")
+
+    results = []
+    for concurrency in levels:
+        count = sessions or max(4, concurrency * 2)
+        print(f"Running {count} sessions at concurrency {concurrency}...", flush=True)
+        results.append(await run_level(port, server_pid, concurrency, count, inputs, timeout))
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Concurrent-session load test against local stub services")
+    parser.add_argument('--levels', default='1,2,4,8', help="comma-separated concurrency levels (default 1,2,4,8)")
+    parser.add_argument('--sessions', type=int, default=0,
+                        help="sessions per level (default: 2 x concurrency, at least 4)")
+    parser.add_argument('--slo-p99', type=float, default=0.0, help="p99 end-to-end latency SLO in seconds")
+    parser.add_argument('--timeout', type=float, default=120.0, help="per script run timeout in seconds")
+    parser.add_argument('--llm-first-token', type=float, default=0.4)
+    parser.add_argument('--llm-total', type=float, default=2.0)
+    parser.add_argument('--llm-error-rate', type=float, default=0.0)
+    parser.add_argument('--weather-latency', type=float, default=0.15)
+    parser.add_argument('--weather-error-rate', type=float, default=0.0)
+    parser.add_argument('--geocode-latency', type=float, default=0.2)
+    parser.add_argument('--geocode-error-rate', type=float, default=0.0)
+    args = parser.parse_args(argv)
+    levels = [int(level) for level in args.levels.split(',') if level.strip()]
+
+    from benchmarks.cases import load_fixture
+    from benchmarks.stub_servers import StubConfig, StubServer, stub_environment
+
+    config = StubConfig(
+        llm_first_token_s=args.llm_first_token, llm_total_s=args.llm_total, llm_error_rate=args.llm_error_rate,
+        weather_latency_s=args.weather_latency, weather_error_rate=args.weather_error_rate,
+        geocode_latency_s=args.geocode_latency, geocode_error_rate=args.geocode_error_rate
+    )
+    stub = StubServer(config).start()
+    env = dict(os.environ, **stub_environment(stub.url))
+    env.setdefault('TELEMETRY_METRICS_PORT', '0')
+    env.setdefault('TELEMETRY_SPANS_FILE', '')
+    env.setdefault('LLM_IP_RATE_PER_MINUTE', '1000000')  # every simulated session shares 127.0.0.1
+    env.setdefault('SEMANTIC_CACHE_ENABLED', '0')  # every session plans the same trip; measure the LLM path
+
+    port = reserve_port()
+    server = start_app_server(port, env)
+    try:
+        inputs = load_fixture('trip_goa.json')['inputs']
+        results = asyncio.run(run_levels(port, server.pid, levels, args.sessions, inputs, args.timeout))
+        stub_counts = dict(stub.counts)
+    finally:
+        server.terminate()
+        server.wait(timeout=10)
+        stub.shutdown()
+
+    print_report(results, stub_counts, args.slo_p99)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
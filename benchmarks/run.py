@@ -0,0 +1,166 @@
+"""
+Benchmark Runner
+Times every case in benchmarks/cases.py, optionally saves the results as a
+named baseline and compares a run against a saved baseline.
+
+Usage (from the repository root):
+    python -m benchmarks.run                      # run and print
+    python -m benchmarks.run --save               # store as the 'baseline' result
+    python -m benchmarks.run --compare            # compare against 'baseline'
+    python -m benchmarks.run --compare --name main -k packing
+
+With --compare the exit status is 1 if any case's median got slower than the
+baseline by more than --threshold (default 10%).
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime
+
+from benchmarks.cases import build_cases
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results')
+
+MIN_ROUND_TIME_S = 0.05  # loops per round are calibrated to at least this long
+
+
+def time_case(func, rounds):
+    """Return per-call timings in seconds for each round."""
+    loops = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(loops):
+            func()
+        elapsed = time.perf_counter() - started
+        if elapsed >= MIN_ROUND_TIME_S or loops >= 1_000_000:
+            break
+        loops *= 10 if elapsed < MIN_ROUND_TIME_S / 10 else 2
+
+    timings = [elapsed / loops]
+    for _ in range(rounds - 1):
+        started = time.perf_counter()
+        for _ in range(loops):
+            func()
+        timings.append((time.perf_counter() - started) / loops)
+    return timings, loops
+
+
+def run_benchmarks(rounds, keyword=None):
+    """Run all (or the matching) cases and return {name: result}."""
+    results = {}
+    for name, func in build_cases().items():
+        if keyword and keyword not in name:
+            continue
+        timings, loops = time_case(func, rounds)
+        results[name] = {
+            'median_s': statistics.median(timings),
+            'min_s': min(timings),
+            'stdev_s': statistics.stdev(timings) if len(timings) > 1 else 0.0,
+            'rounds': rounds,
+            'loops': loops
+        }
+    return results
+
+
+def format_time(seconds):
+    """Human-friendly duration."""
+    if seconds < 1e-3:
+        return f"{seconds * 1e6:.1f} µs"
+    if seconds < 1:
+        return f"{seconds * 1e3:.2f} ms"
+    return f"{seconds:.2f} s"
+
+
+def result_path(name):
+    return os.path.join(RESULTS_DIR, f"{name}.json")
+
+
+def save_results(results, name):
+    """Store results with enough machine info to tell baselines apart."""
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    payload = {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'machine': f"{platform.system()} {platform.machine()}",
+        'results': results
+    }
+    with open(result_path(name), 'w', encoding='utf-8') as f:
+        json.dump(payload, f, indent=2)
+    return result_path(name)
+
+
+def load_results(name):
+    with open(result_path(name), encoding='utf-8') as f:
+        return json.load(f)
+
+
+def print_results(results):
+    width = max(len(name) for name in results)
+    print(f"{'case':<{width}}  {'median':>10}  {'min':>10}  {'loops':>7}")
+    for name, result in results.items():
+        print(f"{name:<{width}}  {format_time(result['median_s']):>10}  "
+              f"{format_time(result['min_s']):>10}  {result['loops']:>7}")
+
+
+def compare_results(results, baseline, threshold):
+    """Print a comparison table and return the names of regressed cases."""
+    regressions = []
+    width = max(len(name) for name in results)
+    print(f"{'case':<{width}}  {'baseline':>10}  {'current':>10}  {'change':>8}")
+    for name, result in results.items():
+        base = baseline['results'].get(name)
+        if base is None:
+            print(f"{name:<{width}}  {'-':>10}  {format_time(result['median_s']):>10}  {'new':>8}")
+            continue
+        ratio = result['median_s'] / base['median_s']
+        flag = ''
+        if ratio > 1 + threshold:
+            flag = '  REGRESSION'
+            regressions.append(name)
+        elif ratio < 1 - threshold:
+            flag = '  faster'
+        print(f"{name:<{width}}  {format_time(base['median_s']):>10}  "
+              f"{format_time(result['median_s']):>10}  {(ratio - 1) * 100:>+7.1f}%{flag}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Micro-benchmarks for the travel planner hot paths")
+    parser.add_argument('--rounds', type=int, default=7, help="timed rounds per case (default 7)")
+    parser.add_argument('-k', dest='keyword', help="only run cases whose name contains this")
+    parser.add_argument('--name', default='baseline', help="result name for --save/--compare (default 'baseline')")
+    parser.add_argument('--save', action='store_true', help="store this run under --name")
+    parser.add_argument('--compare', action='store_true', help="compare this run against --name")
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help="relative slowdown that counts as a regression (default 0.10)")
+    args = parser.parse_args(argv)
+
+    if args.compare and not os.path.exists(result_path(args.name)):
+        parser.error(f"no saved results named '{args.name}' - run with --save first")
+
+    results = run_benchmarks(args.rounds, args.keyword)
+    if not results:
+        parser.error(f"no benchmark matches '{args.keyword}'")
+
+    if args.compare:
+        regressions = compare_results(results, load_results(args.name), args.threshold)
+    else:
+        print_results(results)
+        regressions = []
+
+    if args.save:
+        print(f"\nSaved results to {save_results(results, args.name)}")
+
+    if regressions:
+        print(f"\n{len(regressions)} regression(s): {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
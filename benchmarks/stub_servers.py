@@ -0,0 +1,211 @@
+"""
+Stub Servers
+Local stand-ins for the OpenAI Responses API, Open-Meteo and Nominatim, for
+load tests. One Tornado server answers all three with configurable
+latency and error rates; point the app at it with `stub_environment(url)`.
+
+    /v1/responses  - streamed (SSE) or plain itinerary from the trip fixture
+    /v1/models     - used by the client warm-up
+    /v1/forecast   - the recorded 7-day Open-Meteo payload
+    /search        - Nominatim search answered from data/gazetteer.json
+"""
+
+import asyncio
+import json
+import random
+import threading
+import time
+from dataclasses import dataclass
+from urllib.parse import urlparse
+
+import tornado.httpserver
+import tornado.netutil
+import tornado.web
+
+from benchmarks.cases import load_fixture
+from utils.destination_profile import get_gazetteer
+
+
+@dataclass
+class StubConfig:
+    """Latency (seconds, mean with +/-25% jitter) and error rate (0-1) per service."""
+    llm_first_token_s: float = 0.4
+    llm_total_s: float = 2.0
+    llm_error_rate: float = 0.0
+    weather_latency_s: float = 0.15
+    weather_error_rate: float = 0.0
+    geocode_latency_s: float = 0.2
+    geocode_error_rate: float = 0.0
+    llm_chunks: int = 40
+
+
+def _jitter(seconds):
+    return max(0.0, seconds * random.uniform(0.75, 1.25))
+
+
+class _StubHandler(tornado.web.RequestHandler):
+    @property
+    def stub(self):
+        return self.application.settings['stub']
+
+    @property
+    def config(self):
+        return self.stub.config
+
+    def _fail(self, service):
+        self.stub.count(f'{service}_errors')
+        self.set_status(503)
+        self.finish({'error': {'message': f'stub {service} error', 'type': 'server_error'}})
+
+
+class _ModelsHandler(_StubHandler):
+    def get(self):
+        self.finish({'object': 'list', 'data': [{'id': 'gpt-4o-mini', 'object': 'model'}]})
+
+
+class _ForecastHandler(_StubHandler):
+    async def get(self):
+        self.stub.count('weather')
+        await asyncio.sleep(_jitter(self.config.weather_latency_s))
+        if random.random() < self.config.weather_error_rate:
+            return self._fail('weather')
+        self.set_header('Content-Type', 'application/json')
+        self.finish(self.stub.forecast_body)
+
+
+class _SearchHandler(_StubHandler):
+    async def get(self):
+        self.stub.count('geocode')
+        await asyncio.sleep(_jitter(self.config.geocode_latency_s))
+        if random.random() < self.config.geocode_error_rate:
+            return self._fail('geocode')
+        self.set_header('Content-Type', 'application/json')
+        self.finish(json.dumps(self.stub.geocode(self.get_argument('q', ''))))
+
+
+class _ResponsesHandler(_StubHandler):
+    async def post(self):
+        request = json.loads(self.request.body or b'{}')
+        self.stub.count('llm')
+        await asyncio.sleep(_jitter(self.config.llm_first_token_s))
+        if random.random() < self.config.llm_error_rate:
+            return self._fail('llm')
+
+        model = request.get('model', 'gpt-4o-mini')
+        text = self.stub.itinerary
+        if not request.get('stream'):
+            return self.finish(_response_object(model, text))
+
+        self.set_header('Content-Type', 'text/event-stream')
+        chunk_count = max(1, self.config.llm_chunks)
+        size = -(-len(text) // chunk_count)
+        pause = max(0.0, self.config.llm_total_s - self.config.llm_first_token_s) / chunk_count
+        sequence = 0
+        for start in range(0, len(text), size):
+            self._send_event('response.output_text.delta', {
+                'type': 'response.output_text.delta', 'item_id': 'msg_stub', 'output_index': 0,
+                'content_index': 0, 'delta': text[start:start + size], 'logprobs': [],
+                'sequence_number': sequence
+            })
+            await self.flush()
+            sequence += 1
+            await asyncio.sleep(_jitter(pause))
+        self._send_event('response.completed', {
+            'type': 'response.completed', 'response': _response_object(model, text), 'sequence_number': sequence
+        })
+        self.finish()
+
+    def _send_event(self, event, data):
+        self.write(f"event: {event}\ndata: {json.dumps(data)}\n\n")
+
+
+def _response_object(model, text):
+    """Minimal Responses API object with output text and token usage."""
+    return {
+        'id': 'resp_stub', 'object': 'response', 'created_at': int(time.time()), 'status': 'completed',
+        'model': model, 'parallel_tool_calls': True, 'tool_choice': 'auto', 'tools': [],
+        'output': [{
+            'type': 'message', 'id': 'msg_stub', 'status': 'completed', 'role': 'assistant',
+            'content': [{'type': 'output_text', 'text': text, 'annotations': []}]
+        }],
+        'usage': {
+            'input_tokens': 350, 'output_tokens': len(text) // 4, 'total_tokens': 350 + len(text) // 4,
+            'input_tokens_details': {'cached_tokens': 0}, 'output_tokens_details': {'reasoning_tokens': 0}
+        }
+    }
+
+
+class StubServer:
+    """All three stub services on one local port, with request counters.
+
+    Runs its own event loop on a background thread, so a single stub keeps
+    up with hundreds of concurrent connections.
+    """
+
+    def __init__(self, config=None, port=0):
+        self.config = config or StubConfig()
+        self.itinerary = load_fixture('trip_goa.json')['itinerary']
+        self.forecast_body = json.dumps(load_fixture('open_meteo_goa_7day.json'))
+        self.place_index = get_gazetteer()[0]
+        self.counts = {}
+        self._lock = threading.Lock()
+        self._sockets = tornado.netutil.bind_sockets(port, '127.0.0.1', backlog=1024)
+        self._loop = None
+        self._ready = threading.Event()
+
+    @property
+    def url(self):
+        host, port = self._sockets[0].getsockname()[:2]
+        return f"http://{host}:{port}"
+
+    def count(self, name):
+        with self._lock:
+            self.counts[name] = self.counts.get(name, 0) + 1
+
+    def geocode(self, query):
+        """Nominatim-style search result for a gazetteer place (the app appends ', India')."""
+        place = self.place_index.lookup(query.rsplit(',', 1)[0])[0]
+        if place is None:
+            return []
+        return [{
+            'place_id': abs(hash(place['name'])) % 10 ** 8, 'lat': str(place['lat']), 'lon': str(place['lon']),
+            'display_name': f"{place['name']}, India", 'class': 'place', 'type': 'city', 'importance': 0.7
+        }]
+
+    def _serve(self):
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        app = tornado.web.Application([
+            (r'/v1/models', _ModelsHandler),
+            (r'/v1/responses', _ResponsesHandler),
+            (r'/v1/forecast', _ForecastHandler),
+            (r'/search', _SearchHandler)
+        ], stub=self)
+        server = tornado.httpserver.HTTPServer(app)
+        server.add_sockets(self._sockets)
+        self._ready.set()
+        self._loop.run_forever()
+        server.stop()
+
+    def start(self):
+        threading.Thread(target=self._serve, name='stub-servers', daemon=True).start()
+        self._ready.wait()
+        return self
+
+    def shutdown(self):
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+
+
+def stub_environment(url):
+    """Environment variables that point the app's clients at a stub server."""
+    host = urlparse(url).netloc
+    return {
+        'OPENAI_API_KEY': 'sk-stub',
+        'OPENAI_BASE_URL': f"{url}/v1",
+        'OPEN_METEO_FORECAST_URL': f"{url}/v1/forecast",
+        'WEATHER_PROVIDERS': 'open-meteo',  # the stub serves no secondary provider
+        'NOMINATIM_DOMAIN': host,
+        'NOMINATIM_SCHEME': 'http',
+        'NOMINATIM_MIN_INTERVAL': '0'
+    }
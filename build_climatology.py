@@ -0,0 +1,213 @@
+# build_climatology.py
+"""
+Builds the climatology store used for trip days beyond the live forecast.
+
+The store is a uint8 array of daily normals - one cell per grid point over
+India and per day of a leap year - saved as data/climatology_india.npy, with
+its grid, field encoding and provenance in data/climatology_india.json.
+utils/climatology.py memory-maps it, so a lookup is a single array index.
+
+Two sources:
+    --from-csv normals.csv   real daily normals, one row per grid cell and day
+                             (lat,lon,month,day,temp_max,temp_min,rain_chance,
+                             humidity,wind_speed), e.g. derived from ERA5 or IMD
+                             gridded data, on a grid as fine as --step (0.5
+                             degrees keeps hill stations apart from the plains)
+    --seed                   the approximate seed dataset shipped with the app:
+                             a smooth seasonal model of temperature, monsoon
+                             rainfall and humidity, not measured normals
+
+Usage:
+    python build_climatology.py --seed
+    python build_climatology.py --from-csv normals.csv --source "ERA5 1991-2020" --step 0.5
+
+The app never shows days from the seed dataset: they are labeled with their
+own source and left out of forecasts, packing lists and tips until a store
+built from real normals replaces it.
+"""
+
+import argparse
+import csv
+import json
+import math
+import os
+import sys
+from datetime import date
+
+import numpy as np
+
+from config.constants import DATA_DIR
+from utils.climatology import (
+    CLIMATOLOGY_FILE, CLIMATOLOGY_META_FILE, FIELDS, SUPPORTED_SCHEMA_VERSION, day_index
+)
+
+# Grid over India (cell centres), in degrees; STEP is the seed model's spacing
+LAT_START, LON_START, STEP = 6.0, 68.0, 2.0
+LAT_SPAN, LON_SPAN = 30.0, 30.0
+LAT_COUNT, LON_COUNT = 16, 16
+DAYS = 366
+
+
+def grid_counts(step):
+    """(lat cells, lon cells) covering the grid's span at `step` degrees."""
+    return round(LAT_SPAN / step) + 1, round(LON_SPAN / step) + 1
+
+SEED_DESCRIPTION = (
+    "Approximate seed dataset generated by build_climatology.py --seed from a smooth seasonal model "
+    "(latitude, rough elevation, monsoon onset/withdrawal and regional rainfall). It is not derived from "
+    "observations; rebuild with --from-csv and real normals for accurate values."
+)
+
+
+def encode(values):
+    """Encode decoded normals (last axis in FIELDS order) into the stored uint8 values."""
+    encoded = np.empty(values.shape, dtype=np.uint8)
+    for index, (_, scale, offset) in enumerate(FIELDS):
+        encoded[..., index] = np.clip(np.round(values[..., index] / scale - offset), 0, 255)
+    return encoded
+
+
+# Seed model
+
+def _elevation_km(lat, lon):
+    """Very rough terrain height, enough to make hill stations and Ladakh cold."""
+    if lat >= 32:
+        return 3.0 if lon <= 80 else 4.0  # Ladakh and the Tibetan plateau
+    if lat >= 30 and 76 <= lon <= 81:
+        return 1.8  # Himachal and Uttarakhand hills
+    if 26.5 <= lat <= 28.5 and 87.5 <= lon <= 89:
+        return 1.5  # Darjeeling and Sikkim
+    if lat >= 25 and lon >= 91:
+        return 0.8  # North-eastern hills
+    if 12 <= lat <= 22 and 74 <= lon <= 80:
+        return 0.5  # Deccan plateau
+    return 0.1
+
+
+def _seasonal_shape(doy, peak):
+    """-1 at the coldest day (10 January) rising to +1 at `peak`, then falling back."""
+    day = doy if doy >= 10 else doy + 365
+    if day <= peak:
+        return -math.cos(math.pi * (day - 10) / (peak - 10))
+    return math.cos(math.pi * (day - peak) / (375 - peak))
+
+
+def _coastal(lat, lon):
+    return (lon <= 75.5 and lat <= 22) or (lat <= 20 and lon >= 79.5) or lat <= 9
+
+
+def _rain_chance(lat, lon, doy):
+    """Daily chance of measurable rain (%) for a day of the year."""
+    def ramp(day, start, length=15):
+        return min(1.0, max(0.0, (day - start) / length))
+
+    onset = 150 + 1.5 * max(0.0, lat - 8)        # south-west monsoon reaches Kerala ~1 June
+    withdrawal = 290 - 1.3 * max(0.0, lat - 10)  # retreats from the north-west first
+    monsoon = ramp(doy, onset) * (1 - ramp(doy, withdrawal))
+
+    if lon <= 76 and lat <= 20:
+        peak = 80   # Western Ghats and the west coast
+    elif lon >= 88:
+        peak = 75   # North-east
+    elif lon <= 74 and lat >= 24:
+        peak = 30   # Thar desert
+    elif lat >= 32:
+        peak = 15   # Ladakh (rain shadow)
+    else:
+        peak = 60
+    chance = 4 + (peak - 4) * monsoon
+
+    if lat <= 14 and lon >= 78 and (288 <= doy <= 350):
+        chance = max(chance, 45)  # north-east monsoon on the Tamil Nadu coast
+    if lon >= 88 and 70 <= doy <= 150:
+        chance = max(chance, 35)  # pre-monsoon thunderstorms in the north-east
+    if lat <= 12 and 95 <= doy <= 150:
+        chance = max(chance, 30)  # pre-monsoon showers in Kerala
+    if lat >= 28 and (doy <= 60 or doy >= 340):
+        chance = max(chance, 20 if lat >= 30 else 10)  # western disturbances
+    return chance
+
+
+def seed_normals():
+    """Decoded normals of the approximate seed model, shape (lat, lon, day, field)."""
+    values = np.zeros((LAT_COUNT, LON_COUNT, DAYS, len(FIELDS)))
+    for i in range(LAT_COUNT):
+        lat = LAT_START + i * STEP
+        for j in range(LON_COUNT):
+            lon = LON_START + j * STEP
+            elevation = _elevation_km(lat, lon)
+            coastal = _coastal(lat, lon)
+            mean_temp = 28.5 - 0.25 * max(0.0, lat - 12) - 5.5 * elevation
+            amplitude = 1.5 + 0.5 * max(0.0, lat - 10) + 2 * elevation - (1.0 if coastal else 0.0)
+            peak = 170 if elevation >= 1.5 else 140  # the mountains warm up later than the plains
+            for doy in range(1, DAYS + 1):
+                rain = _rain_chance(lat, lon, doy)
+                seasonal = amplitude * _seasonal_shape(doy, peak)
+                temp = mean_temp + seasonal - 3.0 * rain / 100  # monsoon clouds cool the days
+                diurnal = (5 if coastal else 8) + 7 * (1 - rain / 100) + 0.1 * max(0.0, lat - 20)
+                humidity = min(95, (35 if not coastal else 55) + 0.5 * rain + (10 if elevation > 1 else 0))
+                wind = 8 + (5 if coastal else 0) + 6 * rain / 100
+                values[i, j, doy - 1] = (temp + diurnal / 2, temp - diurnal / 2, rain, humidity, wind)
+    return values
+
+
+# CSV source
+
+def csv_normals(path, step=STEP):
+    """Decoded normals from a CSV of real daily normals on a `step`-degree grid; every cell-day is required."""
+    lat_count, lon_count = grid_counts(step)
+    values = np.full((lat_count, lon_count, DAYS, len(FIELDS)), np.nan)
+    names = [name for name, _, _ in FIELDS]
+    with open(path, newline='', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            i = round((float(row['lat']) - LAT_START) / step)
+            j = round((float(row['lon']) - LON_START) / step)
+            if not (0 <= i < lat_count and 0 <= j < lon_count):
+                continue
+            day = day_index(date(2000, int(row['month']), int(row['day'])))
+            values[i, j, day] = [float(row[name]) for name in names]
+    missing = int(np.isnan(values[..., 0]).sum())
+    if missing:
+        raise ValueError(f"{path} has no normals for {missing} cell-days of the grid")
+    return values
+
+
+def write_store(values, source, description, step=STEP, data_dir=DATA_DIR):
+    np.save(os.path.join(data_dir, os.path.basename(CLIMATOLOGY_FILE)), encode(values))
+    meta = {
+        'version': SUPPORTED_SCHEMA_VERSION,
+        'updated': date.today().isoformat(),
+        'source': source,
+        'approximate': source == 'seed',
+        'description': description,
+        'grid': {'lat_start': LAT_START, 'lon_start': LON_START, 'step': step,
+                 'lat_count': values.shape[0], 'lon_count': values.shape[1], 'days': DAYS},
+        'fields': [{'name': name, 'scale': scale, 'offset': offset} for name, scale, offset in FIELDS]
+    }
+    with open(os.path.join(data_dir, os.path.basename(CLIMATOLOGY_META_FILE)), 'w', encoding='utf-8') as f:
+        json.dump(meta, f, indent=2)
+        f.write("\n")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build the memory-mapped climatology store")
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument('--seed', action='store_true', help="generate the approximate seed dataset")
+    group.add_argument('--from-csv', metavar='PATH', help="build from a CSV of real daily normals")
+    parser.add_argument('--source', default='', help="provenance recorded for --from-csv data")
+    parser.add_argument('--step', type=float, default=STEP, help="grid spacing of --from-csv data, in degrees")
+    args = parser.parse_args(argv)
+    if args.step <= 0 or args.seed and args.step != STEP:
+        parser.error(f"--step must be positive, and the seed model is only built at {STEP} degrees")
+
+    if args.seed:
+        write_store(seed_normals(), 'seed', SEED_DESCRIPTION)
+    else:
+        write_store(csv_normals(args.from_csv, args.step), args.source or os.path.basename(args.from_csv),
+                    f"Daily normals built from {args.from_csv}.", args.step)
+    print(f"Wrote {CLIMATOLOGY_FILE} and {CLIMATOLOGY_META_FILE}", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,276 @@
+"""
+Result Tabs for AI Travel Planner
+Each tab is a Streamlit fragment that loads the session's generated TripPlan
+from the session store, so widget interactions inside a tab rerun only that
+tab instead of the whole script (and never the LLM or network calls). A tab
+only decompresses the plan artifacts it renders.
+"""
+
+import streamlit as st
+
+from components.ui_components import render_itinerary_content
+from utils.budget_utils import display_budget_breakdown
+from utils.packing_utils import generate_packing_list, display_packing_checklist
+from utils.weather_utils import display_weather_forecast, get_weather_packing_tips
+from utils.safety_utils import display_safety_dashboard
+from utils.map_utils import display_map_in_streamlit, create_static_map
+from utils.element_counter import count_elements
+from utils.export_utils import EXPORT_FORMATS, cached_export, get_export, export_file_name
+from utils.session_store import ARTIFACT_FIELDS, current_session_id, load_plan, save_plan
+from utils.itinerary_parser import parse_itinerary, day_heading
+from utils.planner import regenerate_day
+from utils.admission import get_llm_admission, AdmissionRejected
+from utils.telemetry import span
+
+
+# Plan artifacts the export bundle is built from
+EXPORT_FIELDS = ('itinerary', 'weather_forecast')
+
+
+def _current_plan(fields):
+    """The session's plan with the artifacts in `fields`, or None (with a notice) if it was evicted."""
+    plan = load_plan(current_session_id(), fields)
+    if plan is None:
+        st.info("⌛ This plan was cleared after a period of inactivity - submit the form again to regenerate it.")
+    return plan
+
+
+def render_result_tabs():
+    """Render the result tabs for the session's stored plan."""
+    itinerary_tab, budget_tab, packing_tab, weather_tab, safety_tab, map_tab = st.tabs([
+        "📅 Itinerary", "💰 Budget", "🎒 Packing", "🌤️ Weather", "🛡️ Safety", "🗺️ Route"
+    ])
+
+    with itinerary_tab:
+        render_itinerary_tab()
+    with budget_tab:
+        render_budget_tab()
+    with packing_tab:
+        render_packing_tab()
+    with weather_tab:
+        render_weather_tab()
+    with safety_tab:
+        render_safety_tab()
+    with map_tab:
+        render_route_tab()
+
+
+def render_export_panel(plan, key):
+    """Download the whole trip bundle; the file is only built once the user asks for it."""
+    st.markdown("**📦 Download your trip plan** - itinerary, route, weather, packing and safety in one file")
+    format_col, action_col = st.columns([2, 1])
+    with format_col:
+        fmt = st.selectbox("Format", list(EXPORT_FORMATS), format_func=lambda f: EXPORT_FORMATS[f].label,
+                           key=f"{key}_export_format", label_visibility="collapsed")
+    with action_col:
+        data = cached_export(plan, fmt)
+        if data is None and st.button("Prepare download", key=f"{key}_export_prepare", use_container_width=True):
+            try:
+                with st.spinner("Preparing your file..."):
+                    data = get_export(plan, fmt)
+            except Exception as e:
+                st.error(f"❌ Could not prepare the file: {e}")
+        if data is not None:
+            st.download_button(
+                label=f"📥 Download {EXPORT_FORMATS[fmt].extension.upper()}",
+                data=data,
+                file_name=export_file_name(plan, fmt),
+                mime=EXPORT_FORMATS[fmt].mime,
+                key=f"{key}_export_download",
+                use_container_width=True
+            )
+
+
+def render_day_regenerate_panel(plan):
+    """Rewrite a single day with a small LLM call instead of resubmitting the whole trip."""
+    days = parse_itinerary(plan.itinerary).days
+    if not days:
+        return
+
+    regenerated = st.session_state.pop('regenerated_day', None)
+    if regenerated is not None:
+        st.success(f"✨ Day {regenerated} has been updated!")
+
+    with st.expander("🔄 Not happy with a day? Regenerate just that day"):
+        # Start from the day being viewed in the day-by-day view
+        viewed = st.session_state.get('itinerary_day', 0)
+        index = st.selectbox("Day", range(len(days)), index=viewed if viewed < len(days) else 0,
+                             format_func=lambda i: day_heading(days[i]), key="regenerate_day_choice")
+        feedback = st.text_input("What should change? (optional)", key="regenerate_day_feedback",
+                                 placeholder="e.g. fewer museums, more street food")
+        if not st.button("🔄 Regenerate day", key="regenerate_day_submit"):
+            return
+
+        # The tab only loaded what it renders; the plan saved back needs every artifact
+        plan = _current_plan(ARTIFACT_FIELDS)
+        if plan is None:
+            return
+        session_id = current_session_id()
+        day_number = days[index].number
+        queue_notice = st.empty()
+        try:
+            with st.spinner(f"✍️ Rewriting Day {day_number}..."), \
+                    get_llm_admission().admit(session_id, st.context.ip_address, on_wait=lambda position: queue_notice.info(
+                        f"⏳ Lots of students are planning right now - you're #{position} in line..."
+                    )):
+                queue_notice.empty()
+                regenerate_day(plan, day_number, feedback)
+        except AdmissionRejected as e:
+            st.warning(f"🚦 {e}")
+            return
+        except Exception as e:
+            st.error(f"❌ Could not regenerate Day {day_number}: {e}")
+            return
+
+    save_plan(session_id, plan)
+    st.session_state.regenerated_day = day_number
+    # The packing list and exports are built from the itinerary too
+    st.rerun(scope="app")
+
+
+@st.fragment
+def render_itinerary_tab():
+    """Render the itinerary with single-day regeneration and its download options."""
+    plan = _current_plan(EXPORT_FIELDS)
+    if plan is None:
+        return
+
+    with count_elements("Itinerary"), span("tab.itinerary"):
+        render_itinerary_content(plan.itinerary)
+
+        render_day_regenerate_panel(plan)
+
+        render_export_panel(plan, 'itinerary')
+
+
+@st.fragment
+def render_budget_tab():
+    """Render the budget breakdown."""
+    plan = _current_plan(())
+    if plan is None:
+        return
+    inputs = plan.inputs
+
+    with count_elements("Budget"), span("tab.budget"):
+        display_budget_breakdown(
+            budget=inputs['budget'],
+            duration_days=inputs['duration_days'],
+            destination=inputs['destination'],
+            stay_preference=inputs['stay_preference'],
+            food_preference=inputs['food_preference'],
+            travel_mode=inputs['travel_mode'],
+            distance_km=plan.distance_km,
+            group_type=inputs['group_type']
+        )
+
+
+@st.fragment
+def render_packing_tab():
+    """Render the packing checklist with weather-based suggestions."""
+    plan = _current_plan(EXPORT_FIELDS)
+    if plan is None:
+        return
+    inputs = plan.inputs
+    weather_forecast = plan.weather_forecast
+
+    with count_elements("Packing"), span("tab.packing"):
+        packing_items = generate_packing_list(
+            itinerary_text=plan.itinerary,
+            destination=inputs['destination'],
+            duration_days=inputs['duration_days'],
+            interests=inputs['interests'],
+            weather_preference=inputs['weather_preference'],
+            forecasts=weather_forecast,
+            dest_coords=plan.dest_coords
+        )
+
+        # Add weather-based packing tips (never from sample weather)
+        if weather_forecast and weather_forecast[0].get('source') != 'sample':
+            weather_tips = get_weather_packing_tips(weather_forecast)
+            if weather_tips:
+                with st.expander("🌦️ Weather-based Packing Suggestions", expanded=True):
+                    st.markdown("\n".join(f"- {tip}" for tip in weather_tips))
+
+        display_packing_checklist(packing_items, inputs['duration_days'])
+        render_export_panel(plan, 'packing')
+
+
+@st.fragment
+def render_weather_tab():
+    """Render the weather forecast."""
+    plan = _current_plan(('weather_forecast',))
+    if plan is None:
+        return
+
+    with count_elements("Weather"), span("tab.weather"):
+        if plan.weather_forecast:
+            display_weather_forecast(plan.weather_forecast, plan.inputs['destination'])
+        else:
+            st.info("""🌤️ Weather data unavailable. This could be due to:
+- Destination name not recognized
+- Weather API limit reached
+- Network connectivity issue
+
+💡 **Try using major city names for better weather data.**""")
+
+
+@st.fragment
+def render_safety_tab():
+    """Render the safety dashboard."""
+    plan = _current_plan(EXPORT_FIELDS)
+    if plan is None:
+        return
+    inputs = plan.inputs
+
+    with count_elements("Safety"), span("tab.safety"):
+        display_safety_dashboard(
+            inputs['destination'], inputs['group_type'], inputs['special_conditions'], plan.dest_coords
+        )
+        render_export_panel(plan, 'safety')
+
+
+@st.fragment
+def render_route_tab():
+    """Render the route overview and map."""
+    plan = _current_plan(('map_html',))
+    if plan is None:
+        return
+    inputs = plan.inputs
+    start_coords, dest_coords = plan.start_coords, plan.dest_coords
+
+    with count_elements("Route"), span("tab.route"):
+        st.subheader("📍 Route Overview")
+
+        if plan.route_error:
+            st.warning(f"⚠️ Could not generate route map: {plan.route_error[:100]}... but itinerary will still be created.")
+        elif start_coords and dest_coords:
+            # Display route info in columns
+            info_col1, info_col2, info_col3 = st.columns(3)
+            with info_col1:
+                st.metric("📍 Distance", f"{plan.distance_km:.1f} km")
+            with info_col2:
+                st.metric("⏱️ Travel Time", f"{plan.approx_time:.1f} hours")
+            with info_col3:
+                st.metric("🚗 Travel Mode", inputs['travel_mode'])
+
+            # Interactive map rendered once per plan, static map as fallback
+            if plan.map_html:
+                display_map_in_streamlit(plan.map_html)
+                st.caption("🗺️ Interactive Map - You can zoom and pan for detailed view")
+            else:
+                st.warning("🔄 Using static map - interactive features unavailable")
+                static_fig = create_static_map(start_coords, dest_coords, inputs['starting_location'], inputs['destination'])
+                st.pyplot(static_fig)
+                st.caption("📍 Static Route Map")
+
+            # Additional map controls
+            with st.expander("🗺️ Map Controls"):
+                st.info("""
+                **Map Features:**
+                - Zoom in/out for detailed view
+                - Click on markers for location info
+                - Pan around to explore the route
+                - Blue line shows approximate route
+                """)
+        else:
+            st.warning("⚠️ Could not find coordinates for the locations. Check spelling and try using major city names.")
@@ -5,6 +5,7 @@ Contains reusable UI components and styling functions
 
 import streamlit as st
 from config.constants import APP_NAME, APP_ICON, CURRENCY_SYMBOL
+from utils.itinerary_parser import parse_itinerary, day_heading
 
 def apply_custom_styles():
     """Apply custom CSS styles to the Streamlit app."""
@@ -159,12 +160,59 @@ def render_welcome_section():
     st.markdown("---")
     st.info("💡 **Ready to plan?** Fill out the form above and click 'Generate Travel Plan'!")
 
-def render_itinerary_content(itinerary):
-    """Render the itinerary content with improved styling."""
+ITINERARY_PAGE_THRESHOLD = 5  # longer trips show one day at a time
+
+def _step_itinerary_day(key, step, count):
+    st.session_state[key] = min(max(st.session_state.get(key, 0) + step, 0), count - 1)
+
+def render_itinerary_content(itinerary, key="itinerary_day"):
+    """Render the itinerary content with improved styling.
+
+    Long trips render an overview of all days and only the selected day's
+    details, so a 30-day plan sends one day's Markdown per rerun instead of
+    the whole document.
+    """
+    parsed = parse_itinerary(itinerary)
+    days = parsed.days
+    if len(days) <= ITINERARY_PAGE_THRESHOLD:
+        st.markdown('<div class="itinerary-content">', unsafe_allow_html=True)
+        st.markdown(itinerary)
+        st.markdown('</div>', unsafe_allow_html=True)
+        return
+
+    if parsed.intro:
+        st.markdown(parsed.intro)
+
+    st.markdown("#### 🗓️ Trip at a Glance")
+    st.markdown("\n".join(
+        f"- **Day {day.number}**" + (f" - {day.title}" if day.title else "") for day in days
+    ))
+
+    # A stale index (e.g. from a longer previous plan) falls back to the first day
+    current = st.session_state.get(key, 0)
+    if not 0 <= current < len(days):
+        current = st.session_state[key] = 0
+
+    prev_col, select_col, next_col = st.columns([1, 6, 1])
+    with prev_col:
+        st.button("◀", key=f"{key}_prev", on_click=_step_itinerary_day, args=(key, -1, len(days)),
+                  disabled=current == 0, use_container_width=True)
+    with select_col:
+        index = st.selectbox("Day", range(len(days)), key=key, label_visibility="collapsed",
+                             format_func=lambda i: day_heading(days[i]))
+    with next_col:
+        st.button("▶", key=f"{key}_next", on_click=_step_itinerary_day, args=(key, 1, len(days)),
+                  disabled=current == len(days) - 1, use_container_width=True)
+
+    day = days[index]
     st.markdown('<div class="itinerary-content">', unsafe_allow_html=True)
-    st.markdown(itinerary)
+    st.markdown(f"### {day_heading(day)}\n\n{day.body}")
     st.markdown('</div>', unsafe_allow_html=True)
 
+    if parsed.closing:
+        with st.expander("💡 Tips & Notes"):
+            st.markdown(parsed.closing)
+
 def render_footer():
     """Render the app footer."""
     st.markdown("---")
@@ -2,6 +2,8 @@
 Constants and Configuration for AI Travel Planner
 """
 
+import os
+
 # Application metadata
 APP_NAME = "AI Travel Planner for Students"
 APP_ICON = "🎒"
@@ -31,5 +33,57 @@ DEFAULT_MAP_ZOOM = 10
 MAP_MARKER_COLOR_START = "blue"
 MAP_MARKER_COLOR_END = "red"
 
+# Data files (gazetteer, emergency contacts)
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+
+# Local runtime output (telemetry spans, logs)
+LOG_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "logs")
+
 # API settings
-WEATHER_FORECAST_DAYS = 7
\ No newline at end of file
+WEATHER_FORECAST_DAYS = 7
+OPEN_METEO_FORECAST_URL = os.getenv("OPEN_METEO_FORECAST_URL", "https://api.open-meteo.com/v1/forecast")
+MET_NORWAY_FORECAST_URL = os.getenv(
+    "MET_NORWAY_FORECAST_URL", "https://api.met.no/weatherapi/locationforecast/2.0/complete"
+)
+
+# Weather providers, tried in order (see utils/weather_providers.py)
+WEATHER_PROVIDERS = [
+    name.strip() for name in os.getenv("WEATHER_PROVIDERS", "open-meteo,met-norway").split(",") if name.strip()
+]
+WEATHER_PROVIDER_TIMEOUT = float(os.getenv("WEATHER_PROVIDER_TIMEOUT", "6"))  # seconds per request
+WEATHER_BREAKER_FAILURES = 3  # consecutive failures that open a provider's circuit
+WEATHER_BREAKER_RESET = 60  # seconds before an open circuit lets a trial request through
+# Show labeled sample weather when no provider can be reached (otherwise no forecast)
+WEATHER_SAMPLE_FALLBACK = os.getenv("WEATHER_SAMPLE_FALLBACK", "1").lower() in ("1", "true", "yes")
+
+# Admission control for itinerary generation (LLM calls)
+LLM_MAX_CONCURRENT = int(os.getenv("LLM_MAX_CONCURRENT", "8"))  # calls in flight per process
+LLM_MAX_QUEUE = int(os.getenv("LLM_MAX_QUEUE", "50"))  # waiting calls before new ones are shed
+LLM_QUEUE_TIMEOUT = 120  # seconds a call may wait for a slot
+LLM_SESSION_RATE_PER_MINUTE = float(os.getenv("LLM_SESSION_RATE_PER_MINUTE", "3"))
+LLM_SESSION_BURST = 2
+LLM_IP_RATE_PER_MINUTE = float(os.getenv("LLM_IP_RATE_PER_MINUTE", "30"))  # a campus may share one IP
+LLM_IP_BURST = 10
+
+# Per-session plan storage (see utils/session_store.py)
+SESSION_MAX_BYTES = int(os.getenv("SESSION_MAX_BYTES", str(128 * 1024)))  # compressed artifacts per session
+SESSION_IDLE_TTL = int(os.getenv("SESSION_IDLE_TTL", "1800"))  # seconds before an idle session's plan is dropped
+SESSION_SWEEP_INTERVAL = 60  # seconds between idle sweeps
+
+# LLM usage ledger (see utils/llm_usage.py) and the admin page that reads it
+LLM_USAGE_FILE = os.getenv("LLM_USAGE_FILE", os.path.join(LOG_DIR, "llm_usage.jsonl"))
+ADMIN_PASSWORD = os.getenv("TRAVEL_PLANNER_ADMIN_PASSWORD", "")  # admin pages are dev-mode only when unset
+
+# Reuse of itineraries across near-duplicate requests (see utils/semantic_cache.py)
+SEMANTIC_CACHE_ENABLED = os.getenv("SEMANTIC_CACHE_ENABLED", "1").lower() in ("1", "true", "yes")
+SEMANTIC_CACHE_SIZE = int(os.getenv("SEMANTIC_CACHE_SIZE", "1024"))  # itineraries kept per process
+SEMANTIC_CACHE_THRESHOLD = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.85"))  # free-text similarity to reuse
+SEMANTIC_CACHE_BUDGET_TOLERANCE = float(os.getenv("SEMANTIC_CACHE_BUDGET_TOLERANCE", "0.15"))  # relative difference
+
+# Record/replay of outbound HTTP (see utils/cassette.py)
+CASSETTE_MODE = os.getenv("CASSETTE_MODE", "off").lower()  # off, record or replay
+CASSETTE_PATH = os.getenv("CASSETTE_PATH", os.path.join(LOG_DIR, "cassette.jsonl.gz"))
+CASSETTE_LATENCY = os.getenv("CASSETTE_LATENCY", "original").lower()  # original or zero
+
+# Developer settings
+DEV_MODE = os.getenv("TRAVEL_PLANNER_DEV_MODE", "").lower() in ("1", "true", "yes")
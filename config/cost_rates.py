@@ -0,0 +1,52 @@
+"""
+Cost Rate Tables for the Budget Estimation Engine
+All amounts are per traveller in INR.
+"""
+
+# Cities grouped by price level; unknown destinations use DEFAULT_CITY_TIER
+CITY_TIERS = {
+    'mumbai': 'metro', 'delhi': 'metro', 'new delhi': 'metro', 'bangalore': 'metro',
+    'bengaluru': 'metro', 'chennai': 'metro', 'kolkata': 'metro', 'hyderabad': 'metro',
+    'pune': 'metro', 'gurgaon': 'metro', 'noida': 'metro',
+    'goa': 'tourist', 'manali': 'tourist', 'shimla': 'tourist', 'darjeeling': 'tourist',
+    'ooty': 'tourist', 'munnar': 'tourist', 'udaipur': 'tourist', 'jaipur': 'tourist',
+    'rishikesh': 'tourist', 'leh': 'tourist', 'ladakh': 'tourist', 'andaman': 'tourist',
+    'coorg': 'tourist', 'pondicherry': 'tourist', 'mussoorie': 'tourist', 'nainital': 'tourist',
+    'varanasi': 'heritage', 'agra': 'heritage', 'hampi': 'heritage', 'amritsar': 'heritage',
+    'jodhpur': 'heritage', 'jaisalmer': 'heritage', 'mysore': 'heritage', 'khajuraho': 'heritage',
+}
+DEFAULT_CITY_TIER = 'standard'
+
+# Stay per night by preference
+STAY_PER_NIGHT = {
+    'metro':    {'Hostel': 700, 'Budget Hotel': 1800, 'Airbnb': 2500, 'Luxury Hotel': 8000},
+    'tourist':  {'Hostel': 600, 'Budget Hotel': 1500, 'Airbnb': 2200, 'Luxury Hotel': 7000},
+    'heritage': {'Hostel': 450, 'Budget Hotel': 1100, 'Airbnb': 1600, 'Luxury Hotel': 5500},
+    'standard': {'Hostel': 400, 'Budget Hotel': 1000, 'Airbnb': 1400, 'Luxury Hotel': 4500},
+}
+
+# Food per day by preference
+FOOD_PER_DAY = {
+    'metro':    {'Veg': 500, 'Non-Veg': 700, 'Mix': 600, 'Vegan': 550},
+    'tourist':  {'Veg': 450, 'Non-Veg': 650, 'Mix': 550, 'Vegan': 550},
+    'heritage': {'Veg': 350, 'Non-Veg': 500, 'Mix': 425, 'Vegan': 400},
+    'standard': {'Veg': 300, 'Non-Veg': 450, 'Mix': 375, 'Vegan': 350},
+}
+
+# Intercity transport per km (one way) by mode, plus a fixed fare per leg
+TRANSPORT_PER_KM = {'Train': 1.2, 'Bus': 1.6, 'Flight': 4.5, 'Car': 3.5, 'Bike': 2.0}
+TRANSPORT_BASE_FARE = {'Train': 50, 'Bus': 50, 'Flight': 1500, 'Car': 0, 'Bike': 0}
+
+# Straight-line distance is shorter than the actual road/rail route
+ROUTE_DETOUR_FACTOR = {'Train': 1.3, 'Bus': 1.3, 'Flight': 1.0, 'Car': 1.3, 'Bike': 1.3}
+
+# Local transport and sightseeing per day
+LOCAL_TRANSPORT_PER_DAY = {'metro': 300, 'tourist': 400, 'heritage': 250, 'standard': 200}
+ACTIVITIES_PER_DAY = {'metro': 500, 'tourist': 700, 'heritage': 400, 'standard': 300}
+
+# Share of the subtotal kept aside for emergencies
+EMERGENCY_BUFFER_RATIO = 0.10
+
+# Travellers assumed per group type; the form does not ask for a head count
+GROUP_SIZES = {'Solo': 1, 'Couple': 2, 'Friends': 3, 'Family': 4}
+DEFAULT_GROUP_SIZE = 1
@@ -1,6 +1,13 @@
+import os
+
 # Free mapping services configuration
 OPENROUTE_SERVICE_API_KEY = "your_free_api_key"  # Get from openrouteservice.org
 MAPBOX_ACCESS_TOKEN = "your_free_token"  # Optional: from mapbox.com
 
 # Fallback services
-GEOCODE_SERVICE = "nominatim"  # Free, no API key needed
\ No newline at end of file
+GEOCODE_SERVICE = "nominatim"  # Free, no API key needed
+
+# Nominatim endpoint (override to point geocoding at a mirror or a local stub)
+NOMINATIM_DOMAIN = os.getenv("NOMINATIM_DOMAIN", "nominatim.openstreetmap.org")
+NOMINATIM_SCHEME = os.getenv("NOMINATIM_SCHEME", "https")
+NOMINATIM_MIN_INTERVAL = float(os.getenv("NOMINATIM_MIN_INTERVAL", "1.0"))  # seconds between requests
@@ -0,0 +1,52 @@
+"""
+Model Routing Policy
+Which model and output token budget an LLM request gets, and which faster
+model it steps down to while the latency SLO is breached. Applied by
+utils/model_router.py.
+"""
+
+import os
+
+# Used when no routing policy applies (e.g. the connection test)
+DEFAULT_MODEL = os.getenv("LLM_DEFAULT_MODEL", "gpt-4o-mini")
+
+# Request complexity = trip days + number of interests, plus this if there are special conditions
+SPECIAL_CONDITIONS_WEIGHT = 3
+
+# Tiers as (name, highest complexity served, model, output tokens per day, output token cap);
+# the last tier takes everything above. A trip has at most as many days as its complexity
+# (MAX_DURATION_DAYS in the last tier), so each cap is the budget of the longest trip the tier
+# serves: OUTPUT_TOKENS_BASE + days * tokens per day
+MODEL_TIERS = (
+    ('light', 6, os.getenv("LLM_LIGHT_MODEL", "gpt-4o-mini"), 700, 5000),
+    ('standard', 16, os.getenv("LLM_STANDARD_MODEL", "gpt-4o-mini"), 650, 11200),
+    ('complex', None, os.getenv("LLM_COMPLEX_MODEL", "gpt-4.1-mini"), 600, 18800),
+)
+OUTPUT_TOKENS_BASE = 800  # introduction and closing tips
+DAY_OUTPUT_TOKENS = 1200  # a single regenerated day
+
+# A response cut off by its output budget is retried once with this much more, up to the model's limit
+RETRY_OUTPUT_TOKENS_FACTOR = 1.5
+MODEL_MAX_OUTPUT_TOKENS = {
+    'gpt-4o': 16384,
+    'gpt-4o-mini': 16384,
+    'gpt-4.1': 32768,
+    'gpt-4.1-mini': 32768,
+    'gpt-4.1-nano': 32768
+}
+DEFAULT_MAX_OUTPUT_TOKENS = 16384  # models not listed above
+
+# Faster model to step down to while a model breaches the latency SLO
+FALLBACK_MODELS = {
+    'gpt-4.1': 'gpt-4.1-mini',
+    'gpt-4o': 'gpt-4o-mini',
+    'gpt-4.1-mini': 'gpt-4o-mini',
+    'gpt-4o-mini': 'gpt-4.1-nano'
+}
+
+# Latency SLO, checked per model on the p90 of recent successful calls. Generation speed is
+# normalized per 1000 output tokens so long trips are not mistaken for a slow model.
+LLM_FIRST_TOKEN_SLO_S = float(os.getenv("LLM_FIRST_TOKEN_SLO_S", "6"))
+LLM_SECONDS_PER_1K_TOKENS_SLO = float(os.getenv("LLM_SECONDS_PER_1K_TOKENS_SLO", "25"))
+LLM_LATENCY_WINDOW_S = 300  # older observations are forgotten, so a downgraded model is retried
+LLM_LATENCY_MIN_SAMPLES = 5  # fewer observations never trigger a downgrade
@@ -2,38 +2,133 @@
 """
 Handles OpenAI API configuration and setup.
 Works with local .env (optional) and Streamlit Cloud secrets.
+
+The client is created lazily on first use and cached as a process-wide
+resource, so importing this module never builds the HTTP stack and never
+fails when no API key is configured.
 """
 
-from openai import OpenAI
+import os
+import threading
+
+import httpx
+import streamlit as st
+from openai import AsyncOpenAI, OpenAI
 
-# Try fetching the API key
-try:
-    # If running on Streamlit Cloud
-    import streamlit as st
-    api_key = st.secrets.get("OPENAI_API_KEY")
-except ImportError:
-    api_key = None
+from config.model_routing import DEFAULT_MODEL
+from utils.cassette import cassette_transport
 
-# Fallback for local development using environment variable
-import os
-if not api_key:
-    api_key = os.getenv("OPENAI_API_KEY")
+# Connection pool for the shared client - one pool per server process
+HTTP_MAX_CONNECTIONS = 20
+HTTP_MAX_KEEPALIVE_CONNECTIONS = 10
+HTTP_KEEPALIVE_EXPIRY = 300  # seconds an idle connection is kept open
+HTTP_TIMEOUT = httpx.Timeout(60.0, connect=10.0)
+
+# The async API server multiplexes hundreds of requests over one pool
+ASYNC_HTTP_MAX_CONNECTIONS = 200
+ASYNC_HTTP_MAX_KEEPALIVE_CONNECTIONS = 50
+
+# USD per million tokens as (input, cached input, output), for cost estimates
+MODEL_PRICES = {
+    'gpt-4o-mini': (0.15, 0.075, 0.60),
+    'gpt-4o': (2.50, 1.25, 10.00),
+    'gpt-4.1': (2.00, 0.50, 8.00),
+    'gpt-4.1-mini': (0.40, 0.10, 1.60),
+    'gpt-4.1-nano': (0.10, 0.025, 0.40)
+}
+
+
+def get_api_key():
+    """Fetch the API key from Streamlit secrets, falling back to the environment."""
+    try:
+        # If running on Streamlit Cloud
+        api_key = st.secrets.get("OPENAI_API_KEY")
+    except Exception:
+        # No secrets file (local runs, scripts, tests)
+        api_key = None
+
+    # Fallback for local development using environment variable
+    return api_key or os.getenv("OPENAI_API_KEY")
+
+
+def build_http_client():
+    """Create the pooled keep-alive HTTP client used by the OpenAI SDK (recorded/replayed by the cassette)."""
+    transport = httpx.HTTPTransport(limits=httpx.Limits(
+        max_connections=HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=HTTP_KEEPALIVE_EXPIRY
+    ))
+    return httpx.Client(transport=cassette_transport(transport), timeout=HTTP_TIMEOUT)
+
+
+@st.cache_resource(show_spinner=False)
+def get_client():
+    """Return the process-wide OpenAI client, creating it on first use."""
+    api_key = get_api_key()
+
+    # Check if the API key exists
+    if not api_key:
+        raise ValueError(
+            "OpenAI API key not found. "
+            "Add it to Streamlit Secrets or as an environment variable locally."
+        )
+
+    return OpenAI(api_key=api_key, http_client=build_http_client())
+
+
+def build_async_http_client():
+    """Create the pooled keep-alive async HTTP client used by the API server."""
+    transport = httpx.AsyncHTTPTransport(limits=httpx.Limits(
+        max_connections=ASYNC_HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=ASYNC_HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=HTTP_KEEPALIVE_EXPIRY
+    ))
+    return httpx.AsyncClient(transport=cassette_transport(transport), timeout=HTTP_TIMEOUT)
+
+
+@st.cache_resource(show_spinner=False)
+def get_async_client():
+    """Return the process-wide AsyncOpenAI client (one event loop per process)."""
+    api_key = get_api_key()
+    if not api_key:
+        raise ValueError(
+            "OpenAI API key not found. "
+            "Add it to Streamlit Secrets or as an environment variable locally."
+        )
+
+    return AsyncOpenAI(api_key=api_key, http_client=build_async_http_client())
+
+
+@st.cache_resource(show_spinner=False)
+def warm_up_client():
+    """
+    Open the TLS connection to the OpenAI API in a background thread.
+
+    Cached as a resource, so it runs once per server process and the first
+    real itinerary request reuses an already established connection.
+    """
+    try:
+        client = get_client()
+    except ValueError:
+        # Nothing to warm up without a key; the request path reports the error
+        return None
+
+    def _warm_up():
+        try:
+            client.with_options(max_retries=0, timeout=10).models.list()
+        except Exception as e:
+            print(f"OpenAI warm-up failed: {e}")
 
-# Check if the API key exists
-if not api_key:
-    raise ValueError(
-        "OpenAI API key not found. "
-        "Add it to Streamlit Secrets or as an environment variable locally."
-    )
+    thread = threading.Thread(target=_warm_up, name="openai-warm-up", daemon=True)
+    thread.start()
+    return thread
 
-# Initialize OpenAI client
-client = OpenAI(api_key=api_key)
 
 # Simple test function
 def test_connection():
     try:
-        response = client.responses.create(
-            model="gpt-4.1-mini",
+        response = get_client().responses.create(
+            model=DEFAULT_MODEL,
             input="Test connection successful?"
         )
         print("OpenAI connection successful!")
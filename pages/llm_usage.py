@@ -0,0 +1,134 @@
+# pages/llm_usage.py
+"""
+Admin page: LLM token, cost and latency accounting from the usage ledger
+(utils/llm_usage.py), aggregated by destination, trip length and model.
+
+Open to everyone in dev mode; otherwise it asks for
+TRAVEL_PLANNER_ADMIN_PASSWORD and stays closed when that is unset.
+"""
+
+import hmac
+import time
+
+import pandas as pd
+import streamlit as st
+
+from config.constants import APP_NAME, ADMIN_PASSWORD, DEV_MODE
+from utils.llm_usage import load_usage
+
+st.set_page_config(page_title=f"LLM Usage - {APP_NAME}", page_icon="📊", layout="wide")
+st.title("📊 LLM Usage")
+
+if not DEV_MODE:
+    if not ADMIN_PASSWORD:
+        st.info("🔒 This page is only available in dev mode or with TRAVEL_PLANNER_ADMIN_PASSWORD set.")
+        st.stop()
+    password = st.text_input("Admin password", type="password")
+    if not hmac.compare_digest(password.encode('utf-8'), ADMIN_PASSWORD.encode('utf-8')):
+        if password:
+            st.error("❌ Wrong password")
+        st.stop()
+
+WINDOWS = {'Last 24 hours': 86400, 'Last 7 days': 7 * 86400, 'Last 30 days': 30 * 86400, 'All time': None}
+
+# Columns of each aggregation table, from the per-record columns
+AGGREGATIONS = {
+    'calls': ('miss', 'sum'),
+    'cache_hits': ('hit', 'sum'),
+    'avg_input_tokens': ('input_tokens_call', 'mean'),
+    'avg_output_tokens': ('output_tokens_call', 'mean'),
+    'avg_latency_s': ('latency_call', 'mean'),
+    'p95_latency_s': ('latency_call', lambda s: s.quantile(0.95)),
+    'total_cost_usd': ('cost_usd', 'sum')
+}
+
+
+def usage_frame(records):
+    """The ledger as a DataFrame with per-call columns (NaN for cache hits)."""
+    frame = pd.DataFrame.from_records(records)
+    frame['time'] = pd.to_datetime(frame['time'], unit='s')
+    frame['hit'] = frame['cache'] == 'hit'
+    frame['miss'] = ~frame['hit']
+    calls = frame['miss']
+    frame['input_tokens_call'] = frame['input_tokens'].where(calls)
+    frame['output_tokens_call'] = frame['output_tokens'].where(calls)
+    frame['latency_call'] = frame['latency_s'].where(calls)
+    frame['model'] = frame['model'].fillna('(cache)')
+    frame['destination'] = frame['destination'].fillna('(unknown)')
+    return frame
+
+
+def aggregate(frame, by):
+    """Per-group calls, hit rate, average tokens and latency, and cost."""
+    table = frame.groupby(by, dropna=False).agg(**AGGREGATIONS)
+    table.insert(2, 'hit_rate', table['cache_hits'] / (table['calls'] + table['cache_hits']))
+    return table.sort_values('total_cost_usd', ascending=False)
+
+
+TABLE_FORMATS = {
+    'hit_rate': st.column_config.ProgressColumn("hit rate", min_value=0, max_value=1, format="percent"),
+    'avg_input_tokens': st.column_config.NumberColumn(format="%.0f"),
+    'avg_output_tokens': st.column_config.NumberColumn(format="%.0f"),
+    'avg_latency_s': st.column_config.NumberColumn(format="%.2f"),
+    'p95_latency_s': st.column_config.NumberColumn(format="%.2f"),
+    'total_cost_usd': st.column_config.NumberColumn(format="$%.4f")
+}
+
+records = load_usage()
+if not records:
+    st.info("No LLM calls recorded yet - generate a plan first.")
+    st.stop()
+
+frame = usage_frame(records)
+
+filter_col, kind_col = st.columns(2)
+with filter_col:
+    window = WINDOWS[st.selectbox("Period", list(WINDOWS))]
+with kind_col:
+    kinds = st.multiselect("Kind", sorted(frame['kind'].dropna().unique()),
+                           default=sorted(frame['kind'].dropna().unique()))
+if window is not None:
+    frame = frame[frame['time'] >= pd.Timestamp(time.time() - window, unit='s')]
+frame = frame[frame['kind'].isin(kinds)]
+if frame.empty:
+    st.info("No LLM calls in this period.")
+    st.stop()
+
+calls = frame[frame['miss']]
+total_col, hit_col, tokens_col, cost_col, latency_col = st.columns(5)
+total_col.metric("LLM calls", f"{len(calls):,}")
+hit_col.metric("Cache hit rate", f"{frame['hit'].mean():.0%}")
+tokens_col.metric("Tokens (in / out)", f"{int(calls['input_tokens'].sum()):,} / {int(calls['output_tokens'].sum()):,}")
+cost_col.metric("Estimated cost", f"${calls['cost_usd'].sum():.4f}")
+latency_col.metric("Latency p50 / p95",
+                   f"{calls['latency_s'].median():.1f}s / {calls['latency_s'].quantile(0.95):.1f}s" if len(calls) else "-")
+
+errors = int((calls['status'] != 'ok').sum())
+if errors:
+    st.warning(f"⚠️ {errors} call(s) failed or were cancelled - their tokens are not counted.")
+
+by_duration_tab, by_destination_tab, by_model_tab, raw_tab = st.tabs([
+    "By trip length", "By destination", "By model", "Raw records"
+])
+
+with by_duration_tab:
+    table = aggregate(frame, 'duration_days').sort_index()
+    st.dataframe(table, column_config=TABLE_FORMATS, use_container_width=True)
+    # How tokens and latency grow with the number of days tells how much a per-day prompt saves
+    st.caption("Average output tokens and latency by trip length")
+    chart_col1, chart_col2 = st.columns(2)
+    with chart_col1:
+        st.bar_chart(table['avg_output_tokens'])
+    with chart_col2:
+        st.line_chart(table['avg_latency_s'])
+
+with by_destination_tab:
+    st.dataframe(aggregate(frame, 'destination'), column_config=TABLE_FORMATS, use_container_width=True)
+
+with by_model_tab:
+    st.dataframe(aggregate(frame, 'model'), column_config=TABLE_FORMATS, use_container_width=True)
+
+with raw_tab:
+    columns = ['time', 'kind', 'destination', 'duration_days', 'model', 'cache', 'status',
+               'input_tokens', 'output_tokens', 'cached_tokens', 'latency_s', 'first_token_s', 'cost_usd']
+    st.dataframe(frame.sort_values('time', ascending=False)[columns], hide_index=True, use_container_width=True)
@@ -0,0 +1,95 @@
+import json
+
+import pytest
+import tornado.testing
+
+import api_server
+from utils.admission import AdmissionController, QueueFull, RateLimited, TokenBucket
+
+
+def controller(max_concurrent=1, max_queue=10, session_rate=600, session_burst=10):
+    return AdmissionController(max_concurrent, max_queue, session_rate, session_burst, 600, 10, pool='test')
+
+
+def test_waiting_calls_are_granted_round_robin_across_clients():
+    admission = controller()
+    running = admission.enqueue('a')
+    a2, a3 = admission.enqueue('a'), admission.enqueue('a')
+    b1 = admission.enqueue('b')
+    assert running.granted.is_set()
+    assert [a2.position, b1.position, a3.position] == [1, 2, 3]
+
+    admission.release()
+    assert a2.granted.is_set() and not b1.granted.is_set()
+    admission.release()
+    # The other client goes next, not the rest of the first client's queue
+    assert b1.granted.is_set() and not a3.granted.is_set()
+    assert a3.position == 1
+
+
+def test_cancelled_ticket_leaves_the_queue():
+    admission = controller()
+    admission.enqueue('a')
+    waiting, behind = admission.enqueue('b'), admission.enqueue('c')
+    admission.cancel(waiting)
+    assert behind.position == 1
+    admission.release()
+    assert behind.granted.is_set() and not waiting.granted.is_set()
+
+
+def test_full_queue_sheds_new_calls():
+    admission = controller(max_queue=1)
+    admission.enqueue('a')
+    admission.enqueue('b')
+    with pytest.raises(QueueFull):
+        admission.enqueue('c')
+    admission.release()
+    admission.enqueue('c')
+
+
+def test_session_over_its_burst_is_rate_limited():
+    admission = controller(max_concurrent=5, session_rate=6, session_burst=2)
+    admission.enqueue('a')
+    admission.enqueue('a')
+    with pytest.raises(RateLimited) as error:
+        admission.enqueue('a')
+    assert error.value.retry_after == 10  # one token every 10 seconds
+    admission.enqueue('b')
+
+
+def test_token_bucket_refills_at_its_rate_up_to_capacity():
+    bucket = TokenBucket(rate=2, capacity=2)
+    now = bucket.updated
+    bucket.take(now)
+    bucket.take(now)
+    assert bucket.wait_time(now) == pytest.approx(0.5)
+    assert bucket.wait_time(now + 0.25) == pytest.approx(0.25)
+    assert bucket.wait_time(now + 0.5) == 0
+    bucket.wait_time(now + 60)
+    assert bucket.tokens == 2
+
+
+class AdmissionStatusTest(tornado.testing.AsyncHTTPTestCase):
+    TRIP = {'destination': 'Hampi', 'starting_location': 'Bengaluru', 'duration_days': 3}
+
+    def get_app(self):
+        return api_server.make_app()
+
+    def post_plan(self, admission):
+        original = api_server.get_llm_admission
+        api_server.get_llm_admission = lambda: admission
+        try:
+            return self.fetch('/plan', method='POST', body=json.dumps(self.TRIP))
+        finally:
+            api_server.get_llm_admission = original
+
+    def test_rate_limited_client_gets_429(self):
+        response = self.post_plan(controller(session_burst=0))
+        assert response.code == 429
+        assert int(response.headers['Retry-After']) >= 1
+        assert 'too quickly' in json.loads(response.body)['error']
+
+    def test_shed_load_gets_503(self):
+        response = self.post_plan(controller(max_queue=0))
+        assert response.code == 503
+        assert 'busy' in json.loads(response.body)['error']
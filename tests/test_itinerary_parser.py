@@ -0,0 +1,63 @@
+from utils.itinerary_parser import parse_itinerary, replace_day
+
+BUDGET_AFTER_DAYS = """# Goa Getaway
+
+Sun, sand and seafood.
+
+## Day 1: Arrival
+Check in at Baga.
+
+## Day 2: Old Goa
+Churches and spice farm.
+
+## Budget Breakdown
+**Day 1 cost:** ₹1500
+**Day 2 cost:** ₹1800
+"""
+
+
+def test_markdown_days_and_closing():
+    parsed = parse_itinerary(BUDGET_AFTER_DAYS)
+    assert parsed.intro == "# Goa Getaway\n\nSun, sand and seafood."
+    assert [(day.number, day.title) for day in parsed.days] == [(1, 'Arrival'), (2, 'Old Goa')]
+    assert parsed.days[1].body == "Churches and spice farm."
+    assert parsed.closing.startswith("## Budget Breakdown")
+    assert "**Day 2 cost:** ₹1800" in parsed.closing
+
+
+def test_bold_day_headings():
+    parsed = parse_itinerary("Intro\n\n**Day 1: Arrival**\nBeach.\n\n**Day 2:** Old Goa\nChurches.\n")
+    assert [(day.number, day.title) for day in parsed.days] == [(1, 'Arrival'), (2, 'Old Goa')]
+    assert parsed.days[0].body == "Beach."
+
+
+def test_bold_label_inside_a_day_is_not_a_heading():
+    parsed = parse_itinerary("**Day 1: Arrival**\n**Day 1 cost:** ₹1500\n\n**Day 2: Old Goa**\nChurches.\n")
+    assert [day.number for day in parsed.days] == [1, 2]
+    assert "**Day 1 cost:** ₹1500" in parsed.days[0].body
+
+
+def test_repeated_or_lower_day_numbers_stay_in_the_current_day():
+    parsed = parse_itinerary("## Day 1\nA\n\n## Day 2\nB\n\n## Day 2\nC\n\n## Day 1\nD\n\n## Day 3\nE\n")
+    assert [day.number for day in parsed.days] == [1, 2, 3]
+    assert "C" in parsed.days[1].body and "D" in parsed.days[1].body
+
+
+def test_nested_headings_stay_in_the_day():
+    parsed = parse_itinerary("## Day 1\n### Morning\nFort\n## Day 2\nMarket\n## Tips\nCarry water\n")
+    assert parsed.days[0].body == "### Morning\nFort"
+    assert parsed.days[1].body == "Market"
+    assert parsed.closing == "## Tips\nCarry water"
+
+
+def test_no_day_headings():
+    parsed = parse_itinerary("Just a paragraph.")
+    assert parsed == ("Just a paragraph.", (), '')
+
+
+def test_replace_day_keeps_closing_notes():
+    updated = replace_day(BUDGET_AFTER_DAYS, 2, "## Day 2: Fontainhas\nLatin quarter walk.")
+    parsed = parse_itinerary(updated)
+    assert [(day.number, day.title) for day in parsed.days] == [(1, 'Arrival'), (2, 'Fontainhas')]
+    assert parsed.days[1].body == "Latin quarter walk."
+    assert parsed.closing == parse_itinerary(BUDGET_AFTER_DAYS).closing
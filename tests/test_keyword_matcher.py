@@ -0,0 +1,25 @@
+from utils.keyword_matcher import KeywordMatcher
+
+
+def test_keywords_match_whole_words_only():
+    matcher = KeywordMatcher(['beach', 'art', 'rain'])
+    assert matcher.find("Beach day, then street art.") == {'beach', 'art'}
+    assert matcher.find("beaches, a party at the start, training") == set()
+
+
+def test_prefix_keywords_match_longer_words():
+    matcher = KeywordMatcher(['trek*'])
+    assert matcher.find("Trek, treks and trekking") == {'trek*'}
+    assert matcher.find("a mountain-trekker") == {'trek*'}
+    assert matcher.find("street kids") == set()
+
+
+def test_overlapping_keywords_are_all_found():
+    matcher = KeywordMatcher(['hot spring', 'spring', 'hot'])
+    assert matcher.find("a hot spring near town") == {'hot spring', 'spring', 'hot'}
+    assert matcher.find("springtime, hotel") == set()
+
+
+def test_match_positions_are_word_ends():
+    matcher = KeywordMatcher(['fort', 'palace'])
+    assert sorted(matcher.iter_matches("fort to palace")) == [('fort', 3), ('palace', 13)]
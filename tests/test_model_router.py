@@ -0,0 +1,45 @@
+import pytest
+
+from config.constants import MAX_DURATION_DAYS
+from config.model_routing import MODEL_TIERS, OUTPUT_TOKENS_BASE, DAY_OUTPUT_TOKENS
+from utils.model_router import request_complexity, route_request, retry_route, output_token_limit
+
+
+@pytest.mark.parametrize('inputs, tier', [
+    ({'duration_days': 6}, 'light'),
+    ({'duration_days': 7}, 'standard'),
+    ({'duration_days': 4, 'interests': 'beaches, food'}, 'light'),
+    ({'duration_days': 4, 'interests': 'beaches, food, forts'}, 'standard'),
+    ({'duration_days': 16}, 'standard'),
+    ({'duration_days': 14, 'special_conditions': 'wheelchair user'}, 'complex'),
+    ({'duration_days': 17}, 'complex'),
+])
+def test_tier_boundaries(inputs, tier):
+    assert route_request(inputs).tier == tier
+
+
+def test_complexity_ignores_empty_interests():
+    assert request_complexity({'duration_days': 3, 'interests': ' , food,, '}) == 4
+    assert request_complexity({'duration_days': 3, 'special_conditions': '  '}) == 3
+
+
+def test_longest_trip_of_each_tier_fits_its_cap():
+    for name, highest, _, tokens_per_day, cap in MODEL_TIERS:
+        days = min(highest or MAX_DURATION_DAYS, MAX_DURATION_DAYS)
+        route = route_request({'duration_days': days})
+        assert route.tier == name
+        assert route.max_output_tokens == OUTPUT_TOKENS_BASE + tokens_per_day * days <= cap
+
+
+def test_regenerated_day_gets_a_day_budget():
+    route = route_request({'duration_days': 20, 'interests': 'a, b, c'}, kind='day')
+    assert route.tier == 'light'
+    assert route.max_output_tokens == DAY_OUTPUT_TOKENS
+
+
+def test_truncated_response_is_retried_once_with_more_tokens():
+    route = route_request({'duration_days': 5})
+    retry = retry_route(route)
+    assert route.max_output_tokens < retry.max_output_tokens <= output_token_limit(route.model)
+    at_limit = route._replace(max_output_tokens=output_token_limit(route.model))
+    assert retry_route(at_limit) is None
@@ -0,0 +1,49 @@
+from utils.place_index import PlaceIndex
+
+BENGALURU = {'id': 'bengaluru'}
+MANGALORE = {'id': 'mangalore'}
+OOTY = {'id': 'ooty'}
+
+
+def index():
+    places = PlaceIndex()
+    places.add(BENGALURU, ['Bengaluru', 'Bangalore'])
+    places.add(MANGALORE, ['Mangalore', 'Mangaluru'])
+    places.add(OOTY, ['Ooty', 'Udhagamandalam'])
+    return places
+
+
+def test_exact_names_and_aliases():
+    places = index()
+    assert places.lookup('Bangalore, India') == (BENGALURU, 'bangalore', True)
+    assert places.lookup('trip to ooty') == (OOTY, 'ooty', True)
+
+
+def test_one_dropped_added_or_swapped_letter_is_accepted():
+    places = index()
+    assert places.lookup('Banglore') == (BENGALURU, 'bangalore', False)
+    assert places.lookup('Bangaalore') == (BENGALURU, 'bangalore', False)
+    assert places.lookup('Bnagalore') == (BENGALURU, 'bangalore', False)
+
+
+def test_changed_letter_is_not_a_match():
+    places = index()
+    assert places.lookup('Bangalure') == (None, None, False)
+    assert places.lookup('Mangalore') == (MANGALORE, 'mangalore', True)
+
+
+def test_typo_close_to_two_places_is_ambiguous():
+    places = PlaceIndex()
+    places.add({'id': 'rampur'}, ['Rampur'])
+    places.add({'id': 'raipur'}, ['Raipur'])
+    assert places.lookup('Ramipur') == (None, None, False)
+
+
+def test_short_names_need_an_exact_match():
+    assert index().lookup('Oty') == (None, None, False)
+
+
+def test_suggestion_is_separate_from_lookup():
+    places = index()
+    assert places.lookup('Bangalure')[0] is None
+    assert places.suggest('Bangalure')[0] is BENGALURU
@@ -0,0 +1,44 @@
+from utils.semantic_cache import SemanticCache
+
+TRIP = {
+    'destination': 'Goa', 'starting_location': 'Mumbai', 'duration_days': 4, 'budget': 8000,
+    'group_type': 'Friends', 'travel_mode': 'Train', 'stay_preference': 'Hostel', 'food_preference': 'Veg',
+    'interests': 'beaches, nightlife', 'travel_goal': 'relax', 'weather_preference': 'sunny',
+    'special_conditions': 'wheelchair user'
+}
+
+
+def cache_with(trip):
+    cache = SemanticCache(capacity=8)
+    cache.add(trip, 'cached itinerary')
+    return cache
+
+
+def test_near_duplicate_is_reused():
+    cache = cache_with(TRIP)
+    match = cache.lookup({**TRIP, 'destination': 'goa beach', 'budget': 8500,
+                          'special_conditions': 'Wheelchair user'})
+    assert match is not None and match.itinerary == 'cached itinerary'
+
+
+def test_aliases_resolve_to_the_same_place():
+    cache = cache_with({**TRIP, 'destination': 'Bangalore'})
+    assert cache.lookup({**TRIP, 'destination': 'Bengaluru'}) is not None
+
+
+def test_similarly_spelled_city_is_not_reused():
+    cache = cache_with({**TRIP, 'destination': 'Bangalore'})
+    assert cache.lookup({**TRIP, 'destination': 'Mangalore'}) is None
+    cache = cache_with({**TRIP, 'destination': 'Mumbai', 'starting_location': 'Pune'})
+    assert cache.lookup({**TRIP, 'destination': 'Navi Mumbai Airport', 'starting_location': 'Pune'}) is None
+
+
+def test_added_special_condition_is_not_reused():
+    cache = cache_with(TRIP)
+    assert cache.lookup({**TRIP, 'special_conditions': 'wheelchair user, diabetic'}) is None
+    assert cache.lookup({**TRIP, 'special_conditions': ''}) is None
+
+
+def test_budget_outside_tolerance_is_not_reused():
+    cache = cache_with(TRIP)
+    assert cache.lookup({**TRIP, 'budget': 12000}) is None
@@ -0,0 +1,89 @@
+import os
+import types
+from dataclasses import replace
+
+import pytest
+
+from utils import session_store
+from utils.trip_plan import TripPlan
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(session_store, 'time', types.SimpleNamespace(monotonic=clock.monotonic))
+    monkeypatch.setattr(session_store, '_last_sweep', clock.now)
+    yield clock
+    for session_id in list(session_store._sessions):
+        session_store.drop_plan(session_id)
+
+
+def make_plan(map_html='<html>map</html>'):
+    plan = TripPlan(inputs={'destination': 'Goa'}, inputs_hash='goa')
+    plan.complete('itinerary', itinerary='## Day 1: Beaches\nBaga and Calangute.', itinerary_match=None)
+    plan.complete('weather', weather_forecast=[{'date': 'Mon', 'temp_max': 31}], weather_notice=None)
+    plan.complete('route', start_coords=(19.0, 72.8), dest_coords=(15.5, 73.8), distance_km=410.0,
+                  approx_time=8.0, route_error=None)
+    plan.complete('map', map_html=map_html)
+    return plan
+
+
+def test_plan_round_trips_and_sessions_share_artifacts(clock):
+    plan = make_plan()
+    session_store.save_plan('a', plan)
+    session_store.save_plan('b', plan)
+    loaded = session_store.load_plan('a')
+    assert loaded.content_digest is not None
+    assert replace(loaded, content_digest=None) == plan
+    assert session_store.store_stats()['artifacts'] == 3
+
+    session_store.drop_plan('a')
+    assert session_store.store_stats()['artifacts'] == 3
+    session_store.drop_plan('b')
+    assert session_store.store_stats()['artifacts'] == 0
+
+
+def test_load_only_decompresses_the_requested_fields(clock):
+    session_store.save_plan('a', make_plan())
+    plan = session_store.load_plan('a', ('map_html',))
+    assert plan.map_html == '<html>map</html>'
+    assert plan.itinerary is None and plan.weather_forecast is None
+    assert plan.distance_km == 410.0
+
+
+def test_over_the_byte_cap_the_map_is_dropped_first(clock, monkeypatch):
+    monkeypatch.setattr(session_store, 'SESSION_MAX_BYTES', 2048)
+    session_store.save_plan('a', make_plan(map_html=os.urandom(4096).hex()))
+    plan = session_store.load_plan('a')
+    assert plan.map_html is None
+    assert plan.weather_forecast is not None
+    # The map stage is forgotten so a resubmission renders it again
+    assert 'map' not in plan.stage_keys and 'weather' in plan.stage_keys
+    assert session_store.store_stats()['max_session_bytes'] <= 2048
+
+
+def test_idle_sessions_are_evicted(clock):
+    session_store.save_plan('idle', make_plan())
+    session_store.save_plan('active', make_plan(map_html='<html>other</html>'))
+    clock.now += session_store.SESSION_IDLE_TTL - 1
+    session_store.load_plan('active')
+    clock.now += 2
+    session_store.evict_idle()
+    assert not session_store.has_plan('idle')
+    assert session_store.load_plan('active') is not None
+
+
+def test_eviction_runs_on_access_after_the_sweep_interval(clock):
+    session_store.save_plan('idle', make_plan())
+    clock.now += session_store.SESSION_IDLE_TTL + session_store.SESSION_SWEEP_INTERVAL
+    assert session_store.load_plan('other') is None
+    assert not session_store.has_plan('idle')
+    assert session_store.store_stats()['artifacts'] == 0
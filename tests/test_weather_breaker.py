@@ -0,0 +1,50 @@
+from utils.weather_providers import CircuitBreaker, CLOSED, OPEN, HALF_OPEN
+
+
+def opened_breaker():
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=60)
+    for _ in range(3):
+        breaker.record_failure()
+    return breaker
+
+
+def test_breaker_opens_after_consecutive_failures():
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=60)
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == CLOSED and breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == OPEN and not breaker.allow()
+
+
+def test_success_resets_the_failure_count():
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=60)
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == CLOSED
+
+
+def test_half_open_allows_a_single_trial():
+    breaker = opened_breaker()
+    breaker.opened_at -= 60
+    assert breaker.allow()
+    assert breaker.state == HALF_OPEN
+    assert not breaker.allow()  # the trial is still in flight
+
+
+def test_successful_trial_closes_the_breaker():
+    breaker = opened_breaker()
+    breaker.opened_at -= 60
+    breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CLOSED and breaker.allow()
+
+
+def test_failed_trial_opens_the_breaker_again():
+    breaker = opened_breaker()
+    breaker.opened_at -= 60
+    breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == OPEN and not breaker.allow()
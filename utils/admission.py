@@ -0,0 +1,300 @@
+"""
+Admission Control
+Guards itinerary generation so bursts of submissions queue up instead of
+hitting OpenAI's rate limits all at once.
+
+Every call first spends a token from its session's bucket and from its IP's
+bucket, then waits for one of LLM_MAX_CONCURRENT slots in a bounded fair
+queue: waiting calls are granted round-robin across sessions, so one busy
+client cannot starve the others. When the queue is full new calls are shed
+straight away with a clear message.
+"""
+
+import asyncio
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager, asynccontextmanager
+from functools import lru_cache
+
+from config.constants import (
+    LLM_MAX_CONCURRENT, LLM_MAX_QUEUE, LLM_QUEUE_TIMEOUT, LLM_SESSION_RATE_PER_MINUTE, LLM_SESSION_BURST,
+    LLM_IP_RATE_PER_MINUTE, LLM_IP_BURST
+)
+from utils.telemetry import Counter, Gauge, Histogram, register_metric, METRIC_PREFIX
+
+QUEUE_DEPTH = register_metric(Gauge(
+    f"{METRIC_PREFIX}_admission_queue_depth", "Calls waiting for an LLM slot", "pool"
+))
+IN_FLIGHT = register_metric(Gauge(
+    f"{METRIC_PREFIX}_admission_in_flight", "LLM calls currently admitted", "pool"
+))
+QUEUE_WAIT = register_metric(Histogram(
+    f"{METRIC_PREFIX}_admission_wait_seconds", "Time calls waited for an LLM slot", "pool"
+))
+REJECTED = register_metric(Counter(
+    f"{METRIC_PREFIX}_admission_rejected_total", "Calls turned away by admission control", "reason"
+))
+
+POLL_INTERVAL = 0.25  # seconds between queue position updates while waiting
+BUCKET_IDLE_TTL = 600  # full buckets idle this long are dropped
+
+
+class AdmissionRejected(Exception):
+    """A call was turned away; the message is meant for the user."""
+    reason = 'rejected'
+    retry_after = 30
+
+
+class RateLimited(AdmissionRejected):
+    reason = 'rate_limited'
+
+    def __init__(self, retry_after):
+        self.retry_after = max(1, round(retry_after))
+        super().__init__(
+            f"You're generating plans a little too quickly. Please wait about {self.retry_after} seconds and try again."
+        )
+
+
+class QueueFull(AdmissionRejected):
+    reason = 'queue_full'
+
+    def __init__(self):
+        super().__init__(
+            "The planner is very busy right now and the waiting line is full. Please try again in a minute."
+        )
+
+
+class QueueTimeout(AdmissionRejected):
+    reason = 'timeout'
+
+    def __init__(self):
+        super().__init__("The planner is very busy right now. Please try again in a few minutes.")
+
+
+class TokenBucket:
+    """Classic token bucket: `rate` tokens per second up to `capacity`."""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, now):
+        """Seconds until a token is available (0 if one is available now)."""
+        self._refill(now)
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+    def take(self, now):
+        self._refill(now)
+        self.tokens -= 1
+
+
+class Ticket:
+    """One call's place in the queue."""
+
+    def __init__(self, client_id):
+        self.client_id = client_id
+        self.enqueued_at = time.monotonic()
+        self.granted = threading.Event()
+        self.position = 0
+
+
+class AdmissionController:
+    """Per-client token buckets in front of a bounded, fair concurrency queue."""
+
+    def __init__(self, max_concurrent, max_queue, session_rate, session_burst, ip_rate, ip_burst, pool='llm'):
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.session_limits = (session_rate / 60.0, session_burst)
+        self.ip_limits = (ip_rate / 60.0, ip_burst)
+        self.pool = pool
+        self._buckets = {}
+        self._waiting = {}       # client id -> deque of tickets
+        self._rotation = deque()  # client ids with waiting tickets, in round-robin order
+        self._queued = 0
+        self._in_flight = 0
+        self._lock = threading.Lock()
+        self._publish()
+
+    # Rate limiting
+
+    def _bucket(self, key, limits):
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = TokenBucket(*limits)
+        return bucket
+
+    def _prune_buckets(self, now):
+        idle = [key for key, bucket in self._buckets.items()
+                if now - bucket.updated > BUCKET_IDLE_TTL and bucket.wait_time(now) == 0]
+        for key in idle:
+            del self._buckets[key]
+
+    def _charge(self, session_id, ip):
+        """Take a token from the session and IP buckets, or raise RateLimited without taking any."""
+        now = time.monotonic()
+        buckets = [self._bucket(('session', session_id), self.session_limits)]
+        if ip:
+            buckets.append(self._bucket(('ip', ip), self.ip_limits))
+        wait = max(bucket.wait_time(now) for bucket in buckets)
+        if wait > 0:
+            raise RateLimited(wait)
+        for bucket in buckets:
+            bucket.take(now)
+        if len(self._buckets) > 10_000:
+            self._prune_buckets(now)
+
+    # Fair queue
+
+    def _publish(self):
+        QUEUE_DEPTH.set(self.pool, self._queued)
+        IN_FLIGHT.set(self.pool, self._in_flight)
+
+    def _refresh_positions(self):
+        """Positions in the order tickets will be granted (round-robin over clients)."""
+        queues = [self._waiting[client] for client in self._rotation]
+        position = 1
+        for depth in range(max((len(q) for q in queues), default=0)):
+            for queue in queues:
+                if depth < len(queue):
+                    queue[depth].position = position
+                    position += 1
+
+    def _grant_next(self):
+        while self._in_flight < self.max_concurrent and self._rotation:
+            client = self._rotation.popleft()
+            queue = self._waiting[client]
+            ticket = queue.popleft()
+            if queue:
+                self._rotation.append(client)
+            else:
+                del self._waiting[client]
+            self._queued -= 1
+            self._in_flight += 1
+            ticket.position = 0
+            ticket.granted.set()
+        self._refresh_positions()
+
+    def enqueue(self, session_id, ip=None):
+        """Charge the rate limits and queue a call; raises RateLimited or QueueFull."""
+        with self._lock:
+            if self._queued >= self.max_queue:
+                REJECTED.inc(QueueFull.reason)
+                raise QueueFull()
+            try:
+                self._charge(session_id, ip)
+            except RateLimited:
+                REJECTED.inc(RateLimited.reason)
+                raise
+
+            ticket = Ticket(session_id)
+            if session_id not in self._waiting:
+                self._waiting[session_id] = deque()
+                self._rotation.append(session_id)
+            self._waiting[session_id].append(ticket)
+            self._queued += 1
+            self._grant_next()
+            self._publish()
+            return ticket
+
+    def cancel(self, ticket):
+        """Give up a ticket that was never granted."""
+        with self._lock:
+            if ticket.granted.is_set():
+                self._release_locked()
+                return
+            queue = self._waiting.get(ticket.client_id)
+            if queue and ticket in queue:
+                queue.remove(ticket)
+                self._queued -= 1
+                if not queue:
+                    del self._waiting[ticket.client_id]
+                    self._rotation.remove(ticket.client_id)
+                self._refresh_positions()
+            self._publish()
+
+    def _release_locked(self):
+        self._in_flight -= 1
+        self._grant_next()
+        self._publish()
+
+    def release(self):
+        """Free the slot of a finished call."""
+        with self._lock:
+            self._release_locked()
+
+    def _record_wait(self, ticket):
+        QUEUE_WAIT.observe(self.pool, time.monotonic() - ticket.enqueued_at)
+
+    @contextmanager
+    def admit(self, session_id, ip=None, on_wait=None, timeout=LLM_QUEUE_TIMEOUT, ticket=None):
+        """
+        Hold an LLM slot for the duration of the block (blocking, for script threads).
+
+        on_wait(position) is called whenever the call's 1-based queue position
+        changes while it waits. Pass a `ticket` from enqueue() to wait for a
+        call that was queued earlier.
+        """
+        ticket = ticket or self.enqueue(session_id, ip)
+        deadline = ticket.enqueued_at + timeout
+        last_position = None
+        try:
+            while not ticket.granted.wait(POLL_INTERVAL):
+                if time.monotonic() > deadline:
+                    REJECTED.inc(QueueTimeout.reason)
+                    raise QueueTimeout()
+                if on_wait and ticket.position != last_position:
+                    last_position = ticket.position
+                    on_wait(ticket.position)
+        except BaseException:
+            # Timed out, or the script run was stopped while waiting
+            self.cancel(ticket)
+            raise
+        self._record_wait(ticket)
+        try:
+            yield
+        finally:
+            self.release()
+
+    @asynccontextmanager
+    async def admit_async(self, session_id, ip=None, on_wait=None, timeout=LLM_QUEUE_TIMEOUT, ticket=None):
+        """Non-blocking admit for the API server; on_wait may be a coroutine function."""
+        ticket = ticket or self.enqueue(session_id, ip)
+        deadline = ticket.enqueued_at + timeout
+        last_position = None
+        try:
+            while not ticket.granted.is_set():
+                if time.monotonic() > deadline:
+                    REJECTED.inc(QueueTimeout.reason)
+                    raise QueueTimeout()
+                if on_wait and ticket.position != last_position:
+                    last_position = ticket.position
+                    result = on_wait(ticket.position)
+                    if asyncio.iscoroutine(result):
+                        await result
+                await asyncio.sleep(POLL_INTERVAL)
+        except BaseException:
+            # Timed out, or the request went away while waiting
+            self.cancel(ticket)
+            raise
+        self._record_wait(ticket)
+        try:
+            yield
+        finally:
+            self.release()
+
+
+@lru_cache(maxsize=1)
+def get_llm_admission():
+    """The process-wide admission controller for itinerary generation."""
+    return AdmissionController(
+        LLM_MAX_CONCURRENT, LLM_MAX_QUEUE,
+        LLM_SESSION_RATE_PER_MINUTE, LLM_SESSION_BURST,
+        LLM_IP_RATE_PER_MINUTE, LLM_IP_BURST
+    )
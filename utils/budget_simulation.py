@@ -0,0 +1,88 @@
+"""
+Monte Carlo Budget Risk Simulator
+Samples per-category cost variance around the cost model estimate to show
+how likely a trip is to exceed the entered budget.
+"""
+
+from functools import lru_cache
+
+import numpy as np
+
+from utils.budget_utils import calculate_budget_metrics
+
+# calculate_budget_metrics categories and their coefficient of variation
+SIMULATED_CATEGORIES = ('transport', 'accommodation', 'food', 'activities')
+CATEGORY_VARIATION = {
+    'transport': 0.25,      # fare changes, tatkal/surge pricing
+    'accommodation': 0.15,  # availability on arrival
+    'food': 0.20,
+    'activities': 0.35      # the most discretionary spend
+}
+
+# Cost model category -> simulated category
+ESTIMATE_CATEGORY_MAP = {
+    'Transportation': 'transport',
+    'Accommodation': 'accommodation',
+    'Food': 'food',
+    'Activities': 'activities'
+}
+
+DEFAULT_SAMPLES = 100_000
+HISTOGRAM_BINS = 60
+RANDOM_SEED = 2024
+
+
+@lru_cache(maxsize=256)
+def _simulate(base_costs, budget, n_samples, seed):
+    """Run the simulation for one (costs, budget) tuple; memoized."""
+    base = np.asarray(base_costs, dtype=np.float32)
+    sigmas = np.array([CATEGORY_VARIATION[c] for c in SIMULATED_CATEGORIES], dtype=np.float32)
+
+    # Lognormal multipliers with mean 1: right-skewed, never negative.
+    # float32 normals are about twice as fast as rng.lognormal's float64.
+    rng = np.random.default_rng(seed)
+    normals = rng.standard_normal((n_samples, len(sigmas)), dtype=np.float32)
+    multipliers = np.exp(normals * sigmas - sigmas ** 2 / 2)
+    totals = multipliers @ base
+
+    p50, p90, p99 = np.percentile(totals, [50, 90, 99])
+    counts, edges = np.histogram(totals, bins=HISTOGRAM_BINS)
+
+    return {
+        'p50': float(p50),
+        'p90': float(p90),
+        'p99': float(p99),
+        'mean': float(totals.mean()),
+        'prob_over_budget': float(np.count_nonzero(totals > budget) / n_samples),
+        'hist_counts': tuple(counts.tolist()),
+        'hist_edges': tuple(edges.tolist()),
+        'n_samples': n_samples
+    }
+
+
+def simulate_budget_risk(estimate, budget, duration_days, n_samples=DEFAULT_SAMPLES, seed=RANDOM_SEED):
+    """
+    Simulate the trip total across cost variance in a single vectorized pass.
+
+    Args:
+        estimate (dict): Category -> amount from utils.cost_model.estimate_trip_cost
+        budget (int): Entered trip budget in INR
+        duration_days (int): Number of days
+        n_samples (int): Number of simulated trips
+        seed (int): Random seed, fixed so reruns show the same result
+
+    Returns:
+        dict: P50/P90/P99 totals, probability of exceeding the budget,
+              histogram bins and calculate_budget_metrics for the estimate
+    """
+    costs = {category: 0 for category in SIMULATED_CATEGORIES}
+    for category, amount in estimate.items():
+        if category in ESTIMATE_CATEGORY_MAP:
+            costs[ESTIMATE_CATEGORY_MAP[category]] += amount
+
+    base_costs = tuple(float(costs[c]) for c in SIMULATED_CATEGORIES)
+    result = dict(_simulate(base_costs, float(budget), int(n_samples), seed))
+    result['metrics'] = calculate_budget_metrics(
+        costs['transport'], costs['accommodation'], costs['food'], costs['activities'], duration_days
+    )
+    return result
@@ -3,25 +3,39 @@ import plotly.express as px
 import pandas as pd
 import plotly.graph_objects as go
 
-def display_budget_breakdown():
+from utils.cost_model import estimate_trip_cost, group_size
+
+CATEGORY_COLORS = {
+    'Accommodation': '#FF6B6B',
+    'Transportation': '#4ECDC4',
+    'Food': '#45B7D1',
+    'Activities': '#96CEB4',
+    'Emergency': '#DDA0DD'
+}
+
+# Session key of the amounts edited under "Adjust Budget Categories"
+BUDGET_OVERRIDES_KEY = 'budget_overrides'
+
+def display_budget_breakdown(budget, duration_days, destination, stay_preference, food_preference,
+                             travel_mode, distance_km=None, group_type='Solo'):
+    """Display the estimated cost for the whole group against the user's total budget"""
     st.header("💰 Travel Budget Planner")
     
-    # Sample complete budget data - you can replace this with dynamic data
+    computed = estimate_trip_cost(
+        destination, duration_days, stay_preference, food_preference, travel_mode, distance_km, group_type
+    )
+    # Amounts edited below replace the estimate until the estimate itself changes
+    overrides = st.session_state.get(BUDGET_OVERRIDES_KEY)
+    edited = overrides is not None and overrides['estimate'] == computed
+    estimate = overrides['amounts'] if edited else computed
     budget_items = [
-        {"category": "Accommodation", "amount": 4000, "color": "#FF6B6B"},
-        {"category": "Transportation", "amount": 3000, "color": "#4ECDC4"},
-        {"category": "Food", "amount": 1500, "color": "#45B7D1"},
-        {"category": "Activities", "amount": 1000, "color": "#96CEB4"},
-        {"category": "Shopping", "amount": 800, "color": "#FFEAA7"},
-        {"category": "Emergency", "amount": 700, "color": "#DDA0DD"}
+        {"category": category, "amount": amount, "color": CATEGORY_COLORS[category]}
+        for category, amount in estimate.items()
     ]
     
     df = pd.DataFrame(budget_items)
-    total_budget = df['amount'].sum()
-    
-    # Fix: Use a more realistic estimated cost instead of hardcoded 580
-    # In a real app, this would come from actual calculations based on user inputs
-    estimated_cost = total_budget * 0.8  # 80% of total budget as estimated cost
+    total_budget = budget
+    estimated_cost = int(df['amount'].sum())
     remaining = total_budget - estimated_cost
     
     # Display key metrics
@@ -39,7 +53,8 @@ def display_budget_breakdown():
         st.metric(
             "Estimated Cost", 
             f"₹{estimated_cost:,.0f}",
-            delta=f"-₹{total_budget - estimated_cost:,.0f}"
+            delta=f"{estimated_cost / total_budget * 100:.0f}% of budget",
+            delta_color="off"
         )
     
     with col3:
@@ -55,6 +70,21 @@ def display_budget_breakdown():
         st.progress(min(usage_percentage / 100, 1.0))
         st.caption(f"Budget used: {usage_percentage:.1f}%")
     
+    travellers = group_size(group_type)
+    basis = "Total estimate for 1 traveller" if travellers == 1 else \
+        f"Total estimate for {travellers} travellers ({group_type}, assumed)"
+    if edited:
+        st.caption(f"{basis} - with your adjusted category amounts")
+    elif distance_km:
+        st.caption(f"{basis}: {duration_days} days, {stay_preference}, "
+                   f"{travel_mode} round trip of ~{distance_km:.0f} km each way")
+    else:
+        st.caption(f"{basis}: {duration_days} days, {stay_preference} - "
+                   "route distance unavailable, intercity fare not included")
+    
+    # Overspend risk from cost variance
+    display_budget_risk(estimate, total_budget, duration_days)
+    
     # Create two columns for chart and table
     chart_col, table_col = st.columns([2, 1])
     
@@ -66,14 +96,7 @@ def display_budget_breakdown():
             values='amount', 
             names='category',
             color='category',
-            color_discrete_map={
-                'Accommodation': '#FF6B6B',
-                'Transportation': '#4ECDC4', 
-                'Food': '#45B7D1',
-                'Activities': '#96CEB4',
-                'Shopping': '#FFEAA7',
-                'Emergency': '#DDA0DD'
-            },
+            color_discrete_map=CATEGORY_COLORS,
             hole=0.4,
             template='plotly_white'
         )
@@ -107,18 +130,21 @@ def display_budget_breakdown():
         
         # Calculate percentages
         df_display = df.copy()
-        df_display['percentage'] = (df_display['amount'] / total_budget * 100).round(1)
+        df_display['percentage'] = (df_display['amount'] / estimated_cost * 100).round(1) if estimated_cost else 0.0
         
-        # Display as a nice table with proper Streamlit components
-        for _, row in df_display.iterrows():
-            col1, col2, col3 = st.columns([2, 1, 1])
-            with col1:
-                st.write(f"**{row['category']}**")
-            with col2:
-                st.write(f"₹{row['amount']:,}")
-            with col3:
-                st.write(f"{row['percentage']}%")
-            st.progress(row['percentage'] / 100)
+        # One dataframe instead of a row of columns + progress bar per category
+        st.dataframe(
+            df_display[['category', 'amount', 'percentage']],
+            hide_index=True,
+            use_container_width=True,
+            column_config={
+                'category': st.column_config.TextColumn("Category"),
+                'amount': st.column_config.NumberColumn("Amount", format="₹%d"),
+                'percentage': st.column_config.ProgressColumn(
+                    "Share", format="%.1f%%", min_value=0, max_value=100
+                )
+            }
+        )
     
     # Budget Planning Tips
     st.subheader("💡 Budget Tips for Students")
@@ -153,21 +179,66 @@ def display_budget_breakdown():
     st.subheader("Customize Your Budget")
     
     with st.expander("Adjust Budget Categories"):
-        new_budget = {}
-        
-        for item in budget_items:
-            new_value = st.number_input(
-                f"{item['category']} (₹)",
-                min_value=0,
-                value=item['amount'],
-                key=f"budget_{item['category']}"
-            )
-            new_budget[item['category']] = new_value
-        
-        if st.button("Update Budget"):
-            # Update the budget data here
-            st.success("Budget updated successfully!")
-            st.rerun()
+        # Inputs are keyed per estimate, so a new plan starts from its own amounts
+        suffix = hash(tuple(computed.items()))
+        with st.form("budget_adjust_form", border=False):
+            for item in budget_items:
+                st.number_input(f"{item['category']} (₹)", min_value=0, value=item['amount'],
+                                key=f"budget_{item['category']}_{suffix}")
+            update_col, reset_col = st.columns(2)
+            # Callbacks run before the tab's rerun, which then shows the adjusted amounts
+            update_col.form_submit_button("Update Budget", on_click=_apply_budget_edits,
+                                          args=(computed, suffix))
+            reset_col.form_submit_button("Reset to Estimate", on_click=_reset_budget_edits, args=(suffix,),
+                                         disabled=not edited)
+
+def _apply_budget_edits(estimate, suffix):
+    amounts = {category: int(st.session_state[f"budget_{category}_{suffix}"]) for category in estimate}
+    st.session_state[BUDGET_OVERRIDES_KEY] = {'estimate': estimate, 'amounts': amounts}
+
+def _reset_budget_edits(suffix):
+    st.session_state.pop(BUDGET_OVERRIDES_KEY, None)
+    for category in CATEGORY_COLORS:
+        st.session_state.pop(f"budget_{category}_{suffix}", None)
+
+def display_budget_risk(estimate, budget, duration_days):
+    """Display the simulated trip total distribution as a single histogram"""
+    from utils.budget_simulation import simulate_budget_risk
+    
+    risk = simulate_budget_risk(estimate, budget, duration_days)
+    
+    st.subheader("🎲 Overspend Risk")
+    edges = risk['hist_edges']
+    centers = [(edges[i] + edges[i + 1]) / 2 for i in range(len(edges) - 1)]
+    bar_colors = ['#e53e3e' if center > budget else '#4ECDC4' for center in centers]
+    
+    fig_risk = go.Figure(go.Bar(
+        x=centers,
+        y=risk['hist_counts'],
+        marker_color=bar_colors,
+        width=edges[1] - edges[0],
+        hovertemplate="Total: ₹%{x:,.0f}<br>Simulated trips: %{y:,}<extra></extra>"
+    ))
+    fig_risk.add_vline(x=budget, line_dash="dash", line_color="#ed8936",
+                       annotation_text=f"Budget ₹{budget:,}", annotation_position="top")
+    fig_risk.add_vline(x=risk['p90'], line_dash="dot", line_color="#a0aec0",
+                       annotation_text="P90", annotation_position="bottom right")
+    fig_risk.update_layout(
+        height=300,
+        xaxis_title="Simulated trip total (₹)",
+        yaxis_title="Trips",
+        bargap=0,
+        showlegend=False,
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        margin=dict(t=30, b=30, l=30, r=30)
+    )
+    st.plotly_chart(fig_risk, use_container_width=True, config={'displayModeBar': False})
+    st.caption(
+        f"**{risk['prob_over_budget'] * 100:.0f}%** chance of exceeding ₹{budget:,} • "
+        f"P50 ₹{risk['p50']:,.0f} • P90 ₹{risk['p90']:,.0f} • P99 ₹{risk['p99']:,.0f} "
+        f"({risk['n_samples']:,} simulated trips, emergency buffer excluded)"
+    )
 
 def calculate_budget_metrics(transport_cost, accommodation_cost, food_cost, activities_cost, duration_days):
     """
@@ -187,4 +258,4 @@ def calculate_budget_metrics(transport_cost, accommodation_cost, food_cost, acti
 
 # For testing the module directly
 if __name__ == "__main__":
-    display_budget_breakdown()
\ No newline at end of file
+    display_budget_breakdown(8000, 4, "Goa", "Hostel", "Mix", "Train", distance_km=440)
\ No newline at end of file
@@ -0,0 +1,386 @@
+"""
+Cassette
+Record/replay layer for outbound HTTP - geocoding, weather and the OpenAI
+API. In record mode every request and its response are appended to a
+gzip-compressed JSONL cassette; in replay mode responses are served from it
+without touching the network, with their original timing or none at all.
+That makes profiling runs reproducible and lets the app run offline.
+
+All outbound I/O goes through one of three seams here:
+    cassette_transport()   wraps the httpx transports (OpenAI clients, and
+                           geocoding and weather in the API server)
+    http_session()         the requests session used for weather downloads
+    geopy_adapter_factory  the geopy adapter used for Nominatim lookups
+
+Interactions are matched by method, URL (query parameters sorted) and a
+hash of the request body; headers, including the API key, are never stored.
+Identical requests replay in recorded order, the last one repeating. A
+request with no recording fails like a connection error, so the app's usual
+fallbacks (climatology, sample weather, error notices) apply.
+
+Configuration (environment):
+    CASSETTE_MODE     - off (default), record or replay
+    CASSETTE_PATH     - cassette file (default logs/cassette.jsonl.gz)
+    CASSETTE_LATENCY  - original (default) to replay recorded timing, or zero
+"""
+
+import asyncio
+import base64
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from functools import lru_cache
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+import httpx
+import requests
+from geopy.adapters import RequestsAdapter
+from requests.adapters import BaseAdapter, HTTPAdapter
+
+from config.constants import CASSETTE_MODE, CASSETTE_PATH, CASSETTE_LATENCY
+from utils.telemetry import record_event
+
+# Response headers worth keeping; the rest (dates, cookies, rate-limit counters) are dropped
+KEPT_HEADERS = ('content-type', 'content-encoding')
+
+
+def interaction_key(method, url, body):
+    """Match key of a request: method, normalized URL and body hash."""
+    parts = urlsplit(str(url))
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    digest = hashlib.sha256(body or b'').hexdigest()[:16]
+    return f"{method.upper()} {urlunsplit((parts.scheme, parts.netloc, parts.path, query, ''))} {digest}"
+
+
+def _encode_body(data):
+    try:
+        return {'body': data.decode('utf-8')}
+    except UnicodeDecodeError:
+        return {'body_b64': base64.b64encode(data).decode('ascii')}
+
+
+def _decode_chunk(chunk):
+    return base64.b64decode(chunk['body_b64']) if 'body_b64' in chunk else chunk['body'].encode('utf-8')
+
+
+class Cassette:
+    """Recorded interactions in one file, appended to while recording and queued per key for replay."""
+
+    def __init__(self, path, mode, latency='original'):
+        if mode not in ('record', 'replay'):
+            raise ValueError(f"Unknown cassette mode '{mode}' (expected record or replay)")
+        self.path = path
+        self.mode = mode
+        self.zero_latency = latency == 'zero'
+        self._lock = threading.Lock()
+        self._queues = defaultdict(deque)
+        if mode == 'replay':
+            for entry in self._read():
+                self._queues[entry['key']].append(entry)
+            print(f"Replaying {sum(map(len, self._queues.values()))} recorded interactions from {path}")
+
+    def _read(self):
+        if not os.path.exists(self.path):
+            return []
+        entries = []
+        # A cassette is a series of gzip members, one per interaction; a torn last member is skipped
+        try:
+            with gzip.open(self.path, 'rt', encoding='utf-8') as f:
+                for line in f:
+                    entries.append(json.loads(line))
+        except (EOFError, OSError, ValueError) as e:
+            print(f"Cassette {self.path} ends with an incomplete entry: {e}")
+        return entries
+
+    @property
+    def replaying(self):
+        return self.mode == 'replay'
+
+    def append(self, key, status, headers, chunks, elapsed_s):
+        """Record one interaction; `chunks` are (offset_s, bytes) as they arrived."""
+        entry = {
+            'key': key,
+            'status': status,
+            'headers': {name: value for name, value in headers.items() if name.lower() in KEPT_HEADERS},
+            'elapsed_s': round(elapsed_s, 4),
+            'chunks': [{'at': round(offset, 4), **_encode_body(data)} for offset, data in chunks]
+        }
+        line = (json.dumps(entry, ensure_ascii=False) + "\n").encode('utf-8')
+        with self._lock:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            with open(self.path, 'ab') as f:
+                f.write(gzip.compress(line))
+
+    def lookup(self, key):
+        """The next recorded interaction for a key (the last one repeats), or None."""
+        with self._lock:
+            queue = self._queues.get(key)
+            if not queue:
+                return None
+            return queue.popleft() if len(queue) > 1 else queue[0]
+
+    def miss(self, key):
+        record_event('cassette_miss', key=key)
+        return f"cassette {self.path} has no recording for {key}"
+
+    def delays(self, entry):
+        """(seconds to wait, chunk bytes) for each recorded chunk."""
+        previous = 0.0
+        for chunk in entry['chunks']:
+            wait = 0.0 if self.zero_latency else max(0.0, chunk['at'] - previous)
+            previous = chunk['at']
+            yield wait, _decode_chunk(chunk)
+
+    def tail_delay(self, entry):
+        """Time between the last chunk and the end of the response."""
+        if self.zero_latency:
+            return 0.0
+        last = entry['chunks'][-1]['at'] if entry['chunks'] else 0.0
+        return max(0.0, entry['elapsed_s'] - last)
+
+
+@lru_cache(maxsize=1)
+def get_cassette():
+    """The process-wide cassette, or None when CASSETTE_MODE is off."""
+    if CASSETTE_MODE in ('', 'off'):
+        return None
+    return Cassette(CASSETTE_PATH, CASSETTE_MODE, CASSETTE_LATENCY)
+
+
+def is_replaying():
+    cassette = get_cassette()
+    return cassette is not None and cassette.replaying
+
+
+def _prepare_recording(headers):
+    # Plain bodies keep the cassette readable and replayable by every client
+    headers['Accept-Encoding'] = 'identity'
+
+
+# httpx
+
+class _RecordingStream(httpx.SyncByteStream):
+    def __init__(self, cassette, key, response, started):
+        self.cassette, self.key, self.response, self.started = cassette, key, response, started
+        self.stream = response.stream
+        self.chunks = []
+
+    def __iter__(self):
+        for data in self.stream:
+            self.chunks.append((time.perf_counter() - self.started, data))
+            yield data
+
+    def close(self):
+        if self.response is None:
+            return
+        response, self.response = self.response, None
+        self.stream.close()
+        self.cassette.append(self.key, response.status_code, response.headers, self.chunks,
+                             time.perf_counter() - self.started)
+
+
+class _AsyncRecordingStream(httpx.AsyncByteStream):
+    def __init__(self, cassette, key, response, started):
+        self.cassette, self.key, self.response, self.started = cassette, key, response, started
+        self.stream = response.stream
+        self.chunks = []
+
+    async def __aiter__(self):
+        async for data in self.stream:
+            self.chunks.append((time.perf_counter() - self.started, data))
+            yield data
+
+    async def aclose(self):
+        if self.response is None:
+            return
+        response, self.response = self.response, None
+        await self.stream.aclose()
+        self.cassette.append(self.key, response.status_code, response.headers, self.chunks,
+                             time.perf_counter() - self.started)
+
+
+class _ReplayStream(httpx.SyncByteStream):
+    def __init__(self, cassette, entry):
+        self.cassette, self.entry = cassette, entry
+
+    def __iter__(self):
+        for wait, data in self.cassette.delays(self.entry):
+            if wait:
+                time.sleep(wait)
+            yield data
+        tail = self.cassette.tail_delay(self.entry)
+        if tail:
+            time.sleep(tail)
+
+
+class _AsyncReplayStream(httpx.AsyncByteStream):
+    def __init__(self, cassette, entry):
+        self.cassette, self.entry = cassette, entry
+
+    async def __aiter__(self):
+        for wait, data in self.cassette.delays(self.entry):
+            if wait:
+                await asyncio.sleep(wait)
+            yield data
+        tail = self.cassette.tail_delay(self.entry)
+        if tail:
+            await asyncio.sleep(tail)
+
+
+class CassetteTransport(httpx.BaseTransport):
+    """httpx transport that records through, or replays instead of, the wrapped transport."""
+
+    def __init__(self, transport, cassette):
+        self.transport = transport
+        self.cassette = cassette
+
+    def handle_request(self, request):
+        key = interaction_key(request.method, request.url, request.read())
+        if self.cassette.replaying:
+            entry = self.cassette.lookup(key)
+            if entry is None:
+                raise httpx.ConnectError(self.cassette.miss(key), request=request)
+            return httpx.Response(entry['status'], headers=entry['headers'],
+                                  stream=_ReplayStream(self.cassette, entry), request=request)
+
+        _prepare_recording(request.headers)
+        started = time.perf_counter()
+        response = self.transport.handle_request(request)
+        response.stream = _RecordingStream(self.cassette, key, response, started)
+        return response
+
+    def close(self):
+        self.transport.close()
+
+
+class AsyncCassetteTransport(httpx.AsyncBaseTransport):
+    """Async CassetteTransport."""
+
+    def __init__(self, transport, cassette):
+        self.transport = transport
+        self.cassette = cassette
+
+    async def handle_async_request(self, request):
+        key = interaction_key(request.method, request.url, await request.aread())
+        if self.cassette.replaying:
+            entry = self.cassette.lookup(key)
+            if entry is None:
+                raise httpx.ConnectError(self.cassette.miss(key), request=request)
+            return httpx.Response(entry['status'], headers=entry['headers'],
+                                  stream=_AsyncReplayStream(self.cassette, entry), request=request)
+
+        _prepare_recording(request.headers)
+        started = time.perf_counter()
+        response = await self.transport.handle_async_request(request)
+        response.stream = _AsyncRecordingStream(self.cassette, key, response, started)
+        return response
+
+    async def aclose(self):
+        await self.transport.aclose()
+
+
+def cassette_transport(transport):
+    """Wrap an httpx transport (sync or async) in the cassette when one is active."""
+    cassette = get_cassette()
+    if cassette is None:
+        return transport
+    if isinstance(transport, httpx.AsyncBaseTransport):
+        return AsyncCassetteTransport(transport, cassette)
+    return CassetteTransport(transport, cassette)
+
+
+# requests
+
+class CassetteAdapter(BaseAdapter):
+    """requests adapter that records through, or replays instead of, the wrapped adapter."""
+
+    def __init__(self, adapter, cassette):
+        super().__init__()
+        self.adapter = adapter
+        self.cassette = cassette
+
+    def send(self, request, **kwargs):
+        body = request.body.encode('utf-8') if isinstance(request.body, str) else request.body
+        key = interaction_key(request.method, request.url, body)
+        if self.cassette.replaying:
+            entry = self.cassette.lookup(key)
+            if entry is None:
+                raise requests.ConnectionError(self.cassette.miss(key), request=request)
+            content = b''
+            for wait, data in self.cassette.delays(entry):
+                if wait:
+                    time.sleep(wait)
+                content += data
+            tail = self.cassette.tail_delay(entry)
+            if tail:
+                time.sleep(tail)
+            response = requests.Response()
+            response.status_code = entry['status']
+            response.headers.update(entry['headers'])
+            response._content = content
+            response.url = request.url
+            response.request = request
+            response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+            return response
+
+        _prepare_recording(request.headers)
+        started = time.perf_counter()
+        response = self.adapter.send(request, **kwargs)
+        content = response.content
+        elapsed = time.perf_counter() - started
+        # requests has already decoded the body
+        headers = {name: value for name, value in response.headers.items() if name.lower() != 'content-encoding'}
+        self.cassette.append(key, response.status_code, headers, [(elapsed, content)], elapsed)
+        return response
+
+    def close(self):
+        self.adapter.close()
+
+
+def _mount_cassette(session, cassette):
+    for prefix in ('https://', 'http://'):
+        session.mount(prefix, CassetteAdapter(session.get_adapter(prefix), cassette))
+
+
+HTTP_POOL_SIZE = 32  # connections kept per host, shared by every thread
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def http_session():
+    """The process-wide requests session, with connection reuse and the cassette mounted when active.
+
+    Shared by every thread - each Streamlit rerun runs on a new one, so a
+    per-thread session would never reuse a connection. Its urllib3 pools are
+    thread-safe.
+    """
+    global _session
+    session = _session
+    if session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                for prefix in ('http://', 'https://'):
+                    session.mount(prefix, HTTPAdapter(pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE))
+                cassette = get_cassette()
+                if cassette is not None:
+                    _mount_cassette(session, cassette)
+                _session = session
+            session = _session
+    return session
+
+
+class _CassetteGeopyAdapter(RequestsAdapter):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        _mount_cassette(self.session, get_cassette())
+
+
+def geopy_adapter_factory():
+    """adapter_factory for geopy geocoders: the cassette adapter when active, else geopy's default."""
+    return _CassetteGeopyAdapter if get_cassette() is not None else None
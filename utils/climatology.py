@@ -0,0 +1,164 @@
+"""
+Climatology Store
+Daily climate normals for India, used for trip days beyond the live forecast
+window (and for whole trips when no weather provider answers).
+
+data/climatology_india.npy is a uint8 array (lat cell, lon cell, day of a
+leap year, field) built by build_climatology.py; it is memory-mapped once
+per process, so a lookup is one array index and touches a few bytes of the
+file. Days from a store built from real normals are labeled as typical
+conditions, not a forecast. The shipped file is an approximate seed dataset -
+its metadata says so - and its days carry their own SEED_SOURCE label;
+climatology_forecasts() leaves them out so they never reach the weather tab,
+packing lists or tips.
+"""
+
+import json
+import math
+import os
+from datetime import date, timedelta
+from functools import lru_cache
+
+import numpy as np
+
+from config.constants import DATA_DIR, MAX_DURATION_DAYS
+
+CLIMATOLOGY_FILE = os.path.join(DATA_DIR, 'climatology_india.npy')
+CLIMATOLOGY_META_FILE = os.path.join(DATA_DIR, 'climatology_india.json')
+SUPPORTED_SCHEMA_VERSION = 1
+
+# Stored fields as (name, scale, offset): value = (stored + offset) * scale
+FIELDS = (
+    ('temp_max', 0.5, -80),
+    ('temp_min', 0.5, -80),
+    ('rain_chance', 1, 0),
+    ('humidity', 1, 0),
+    ('wind_speed', 0.5, 0)
+)
+
+HOURLY_SAMPLE_HOURS = (6, 9, 12, 15, 18, 21, 0, 3)  # the weather tab's hourly columns
+
+# Forecast 'source' of days from real normals and from the approximate seed dataset
+CLIMATOLOGY_SOURCE = 'climatology'
+SEED_SOURCE = 'climatology_seed'
+
+
+def day_index(day):
+    """Index of a calendar day in the leap-year axis, so 1 March is the same cell every year."""
+    return date(2000, day.month, day.day).timetuple().tm_yday - 1
+
+
+def _clear_sky_uv(lat, day):
+    """Rough noon UV index from the sun's elevation."""
+    declination = 23.44 * math.sin(2 * math.pi * (day.timetuple().tm_yday - 81) / 365)
+    elevation = max(0.0, 90 - abs(lat - declination))
+    return 12.5 * math.sin(math.radians(elevation)) ** 2.5
+
+
+def _description(rain_chance):
+    if rain_chance >= 60:
+        return 'Rainy Season'
+    if rain_chance >= 35:
+        return 'Showers Likely'
+    if rain_chance >= 15:
+        return 'Partly Cloudy'
+    return 'Mostly Dry'
+
+
+def _icon(rain_chance):
+    return '10d' if rain_chance >= 35 else '02d' if rain_chance >= 15 else '01d'
+
+
+class ClimatologyStore:
+    """Memory-mapped normals with O(1) lookups by coordinates and date."""
+
+    def __init__(self, meta, values):
+        version = meta.get('version')
+        if version != SUPPORTED_SCHEMA_VERSION:
+            raise ValueError(
+                f"Unsupported climatology schema version {version} (expected {SUPPORTED_SCHEMA_VERSION})"
+            )
+        grid = meta['grid']
+        expected = (grid['lat_count'], grid['lon_count'], grid['days'], len(FIELDS))
+        if values.shape != expected:
+            raise ValueError(f"Climatology array shape {values.shape} does not match its metadata {expected}")
+
+        self.source = meta['source']
+        self.approximate = meta.get('approximate', True)
+        self.description = meta.get('description', '')
+        self.lat_start, self.lon_start, self.step = grid['lat_start'], grid['lon_start'], grid['step']
+        self.values = values
+        self._scale = np.array([scale for _, scale, _ in FIELDS])
+        self._offset = np.array([offset for _, _, offset in FIELDS])
+
+    def cell(self, lat, lon):
+        """Grid indices of the nearest cell, or None outside the grid."""
+        i = round((lat - self.lat_start) / self.step)
+        j = round((lon - self.lon_start) / self.step)
+        if 0 <= i < self.values.shape[0] and 0 <= j < self.values.shape[1]:
+            return i, j
+        return None
+
+    def normals(self, lat, lon, day):
+        """Decoded normals for one day as a dict of FIELDS, or None outside the grid."""
+        cell = self.cell(lat, lon)
+        if cell is None:
+            return None
+        decoded = (self.values[cell[0], cell[1], day_index(day)] + self._offset) * self._scale
+        return dict(zip((name for name, _, _ in FIELDS), decoded.tolist()))
+
+    def daily_forecasts(self, lat, lon, start_date, count):
+        """Typical conditions for `count` days from `start_date`, in the forecast dict shape."""
+        forecasts = []
+        for offset in range(count):
+            day = start_date + timedelta(days=offset)
+            normals = self.normals(lat, lon, day)
+            if normals is None:
+                return []
+            temp_max, temp_min = round(normals['temp_max']), round(normals['temp_min'])
+            rain_chance = round(normals['rain_chance'])
+            # Diurnal curve for the hourly columns: coolest near dawn, warmest mid-afternoon
+            hourly_temps = [
+                round(temp_min + (temp_max - temp_min) * (1 - math.cos(2 * math.pi * ((hour - 5) % 24) / 24)) / 2)
+                for hour in HOURLY_SAMPLE_HOURS
+            ]
+            forecasts.append({
+                'date': day.strftime('%a, %d %b'),
+                'day_name': day.strftime('%A'),
+                'temp_max': temp_max,
+                'temp_min': temp_min,
+                'temp_avg': round((temp_max + temp_min) / 2),
+                'description': _description(rain_chance),
+                'icon': _icon(rain_chance),
+                'rain_chance': rain_chance,
+                'uv_index': round(_clear_sky_uv(lat, day) * (1 - 0.5 * rain_chance / 100), 1),
+                'wind_speed': round(normals['wind_speed'], 1),
+                'hourly_temps': hourly_temps,
+                'hourly_rain': [rain_chance] * len(HOURLY_SAMPLE_HOURS),
+                'humidity_avg': round(normals['humidity']),
+                'source': SEED_SOURCE if self.approximate else CLIMATOLOGY_SOURCE
+            })
+        return forecasts
+
+
+@lru_cache(maxsize=1)
+def get_climatology_store(path=CLIMATOLOGY_FILE, meta_path=CLIMATOLOGY_META_FILE):
+    """Memory-map the climatology store once per process (None if it has not been built)."""
+    if not os.path.exists(path):
+        print(f"Climatology store not found at {path} - run build_climatology.py --seed")
+        return None
+    with open(meta_path, encoding='utf-8') as f:
+        meta = json.load(f)
+    return ClimatologyStore(meta, np.load(path, mmap_mode='r'))
+
+
+def climatology_forecasts(coords, start_date, count):
+    """Typical-conditions days for coordinates (at most MAX_DURATION_DAYS).
+
+    [] when there is no store, no grid cell, or only the approximate seed
+    dataset - its numbers are not fit to show or pack for.
+    """
+    store = get_climatology_store()
+    if store is None or store.approximate or not coords or count <= 0:
+        return []
+    return store.daily_forecasts(coords[0], coords[1], start_date, min(count, MAX_DURATION_DAYS))
@@ -0,0 +1,55 @@
+"""
+Emergency Contacts Store
+Loads data/emergency_contacts.json once per process into a PlaceIndex keyed
+by normalized city name and alias.
+
+To add a city or district, append an entry to "places" in the data file
+and bump "updated"; bump "version" only when the schema changes.
+"""
+
+import json
+import os
+from functools import lru_cache
+
+from config.constants import DATA_DIR
+from utils.place_index import PlaceIndex
+
+CONTACTS_FILE = os.path.join(DATA_DIR, 'emergency_contacts.json')
+SUPPORTED_SCHEMA_VERSION = 1
+
+
+class ContactsStore:
+    """National numbers plus an index of local contacts per place."""
+
+    def __init__(self, data):
+        version = data.get('version')
+        if version != SUPPORTED_SCHEMA_VERSION:
+            raise ValueError(
+                f"Unsupported emergency contacts schema version {version} "
+                f"(expected {SUPPORTED_SCHEMA_VERSION})"
+            )
+
+        self.version = version
+        self.updated = data.get('updated')
+        self.national = data['national']
+        self.fallback_local = data['fallback_local']
+        self.index = PlaceIndex()
+        for place in data['places']:
+            self.index.add(place, [place['id'], place['name']] + place.get('aliases', []))
+
+    def find_place(self, destination):
+        """Return (place, exact) for a free-text destination, or (None, False)."""
+        place, _, exact = self.index.lookup(destination)
+        return place, exact
+
+    def suggest_place(self, destination):
+        """Name of the closest listed place for a "did you mean" hint, or None."""
+        place, _ = self.index.suggest(destination)
+        return place['name'] if place else None
+
+
+@lru_cache(maxsize=1)
+def get_contacts_store(path=CONTACTS_FILE):
+    """Load and index the contacts data file once per process."""
+    with open(path, encoding='utf-8') as f:
+        return ContactsStore(json.load(f))
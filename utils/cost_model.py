@@ -0,0 +1,118 @@
+"""
+Budget Estimation Engine
+Computes a per-category trip cost from the form inputs and route distance
+using the per-traveller rate tables in config/cost_rates.py, scaled to the
+group's assumed size.
+"""
+
+from functools import lru_cache
+
+from config.cost_rates import (
+    CITY_TIERS, DEFAULT_CITY_TIER, STAY_PER_NIGHT, FOOD_PER_DAY,
+    TRANSPORT_PER_KM, TRANSPORT_BASE_FARE, ROUTE_DETOUR_FACTOR,
+    LOCAL_TRANSPORT_PER_DAY, ACTIVITIES_PER_DAY, EMERGENCY_BUFFER_RATIO, GROUP_SIZES, DEFAULT_GROUP_SIZE
+)
+
+BUDGET_CATEGORIES = ('Accommodation', 'Transportation', 'Food', 'Activities', 'Emergency')
+
+# Used when the form sends a value the rate tables do not know
+DEFAULT_STAY = 'Budget Hotel'
+DEFAULT_FOOD = 'Mix'
+DEFAULT_MODE = 'Train'
+
+
+def _build_rate_table():
+    """Flatten the rate tables into a single (tier, kind, option) -> rate lookup."""
+    table = {}
+    for tier, rates in STAY_PER_NIGHT.items():
+        for option, rate in rates.items():
+            table[(tier, 'stay', option)] = rate
+    for tier, rates in FOOD_PER_DAY.items():
+        for option, rate in rates.items():
+            table[(tier, 'food', option)] = rate
+    for tier, rate in LOCAL_TRANSPORT_PER_DAY.items():
+        table[(tier, 'local', None)] = rate
+    for tier, rate in ACTIVITIES_PER_DAY.items():
+        table[(tier, 'activities', None)] = rate
+    for mode, rate in TRANSPORT_PER_KM.items():
+        # Effective per-km rate over the actual route, detour included
+        table[(None, 'per_km', mode)] = rate * ROUTE_DETOUR_FACTOR.get(mode, 1.0)
+        table[(None, 'base_fare', mode)] = TRANSPORT_BASE_FARE.get(mode, 0)
+    return table
+
+
+RATE_TABLE = _build_rate_table()
+
+
+def get_city_tier(destination):
+    """Return the price tier for a destination, e.g. 'Manali, Himachal' -> 'tourist'."""
+    dest_lower = (destination or '').strip().lower()
+    if dest_lower in CITY_TIERS:
+        return CITY_TIERS[dest_lower]
+
+    # Try each comma-separated part, then each word
+    parts = [part.strip() for part in dest_lower.split(',')]
+    for candidate in parts + dest_lower.replace(',', ' ').split():
+        if candidate in CITY_TIERS:
+            return CITY_TIERS[candidate]
+    return DEFAULT_CITY_TIER
+
+
+@lru_cache(maxsize=4096)
+def _estimate_for_tier(tier, duration_days, stay_preference, food_preference, travel_mode, distance_km):
+    """Compute the breakdown for one input tuple; memoized."""
+    if (tier, 'stay', stay_preference) not in RATE_TABLE:
+        stay_preference = DEFAULT_STAY
+    if (tier, 'food', food_preference) not in RATE_TABLE:
+        food_preference = DEFAULT_FOOD
+    if (None, 'per_km', travel_mode) not in RATE_TABLE:
+        travel_mode = DEFAULT_MODE
+
+    nights = max(duration_days - 1, 0)
+    accommodation = RATE_TABLE[(tier, 'stay', stay_preference)] * nights
+    food = RATE_TABLE[(tier, 'food', food_preference)] * duration_days
+    activities = RATE_TABLE[(tier, 'activities', None)] * duration_days
+
+    # Round trip between start and destination plus local travel
+    transportation = RATE_TABLE[(tier, 'local', None)] * duration_days
+    if distance_km:
+        one_way = RATE_TABLE[(None, 'base_fare', travel_mode)] + RATE_TABLE[(None, 'per_km', travel_mode)] * distance_km
+        transportation += 2 * one_way
+
+    subtotal = accommodation + transportation + food + activities
+    emergency = subtotal * EMERGENCY_BUFFER_RATIO
+
+    amounts = (accommodation, transportation, food, activities, emergency)
+    return tuple((category, int(round(amount))) for category, amount in zip(BUDGET_CATEGORIES, amounts))
+
+
+def group_size(group_type):
+    """Travellers assumed for a group type, e.g. 'Family' -> 4."""
+    return GROUP_SIZES.get(group_type, DEFAULT_GROUP_SIZE)
+
+
+def estimate_trip_cost(destination, duration_days, stay_preference, food_preference, travel_mode, distance_km=None,
+                       group_type='Solo'):
+    """
+    Estimate the whole group's trip cost by category.
+
+    Args:
+        destination (str): Travel destination
+        duration_days (int): Number of days
+        stay_preference (str): Hostel / Budget Hotel / Airbnb / Luxury Hotel
+        food_preference (str): Veg / Non-Veg / Mix / Vegan
+        travel_mode (str): Train / Bus / Flight / Car / Bike
+        distance_km (float): Straight-line route distance, None if unknown
+        group_type (str): Solo / Couple / Friends / Family, see group_size
+
+    Returns:
+        dict: Category name -> amount in INR, in BUDGET_CATEGORIES order
+    """
+    # Whole kilometres keep the memo key stable across geocoder jitter
+    distance = int(round(distance_km)) if distance_km else 0
+    breakdown = _estimate_for_tier(
+        get_city_tier(destination), int(duration_days),
+        stay_preference, food_preference, travel_mode, distance
+    )
+    travellers = group_size(group_type)
+    return {category: amount * travellers for category, amount in breakdown}
@@ -0,0 +1,168 @@
+"""
+Destination Profiles
+Tags a destination as coastal / hill / metro with its altitude, monsoon and
+snow months, from data/gazetteer.json and (optionally) its coordinates.
+
+Profiles are memoized per normalized destination, so the packing and safety
+modules share one classification instead of each re-scanning the string.
+"""
+
+import json
+import os
+from functools import lru_cache
+from typing import NamedTuple, Optional
+
+from config.constants import DATA_DIR
+from utils.place_index import PlaceIndex, normalize_place_name
+
+GAZETTEER_FILE = os.path.join(DATA_DIR, 'gazetteer.json')
+
+HILL_ALTITUDE_M = 1000
+HIGH_ALTITUDE_M = 2500
+SNOW_ALTITUDE_M = 2000
+NEARBY_RADIUS_KM = 30
+FUZZY_RADIUS_KM = 100  # a misspelled name is trusted only this close to the geocoded point
+
+# Fallback when a destination is neither in the gazetteer nor near a known place
+DESTINATION_KEYWORDS = {
+    'coastal': {'beach', 'beaches', 'coast', 'coastal', 'island', 'islands', 'sea'},
+    'hill': {'hill', 'hills', 'mountain', 'mountains', 'valley', 'himalaya', 'himalayas'},
+    'metro': {'metro'}
+}
+
+
+class DestinationProfile(NamedTuple):
+    """Attributes of a destination used by packing and safety advice."""
+    name: str
+    coastal: bool
+    hill: bool
+    metro: bool
+    altitude_m: Optional[int]
+    monsoon_months: tuple
+    snow_months: tuple
+    source: str  # 'gazetteer', 'nearby' or 'keywords'
+
+    @property
+    def high_altitude(self):
+        return bool(self.altitude_m and self.altitude_m >= HIGH_ALTITUDE_M)
+
+    @property
+    def tags(self):
+        """Set of tag names, e.g. {'hill', 'high_altitude'}."""
+        flags = {'coastal': self.coastal, 'hill': self.hill, 'metro': self.metro,
+                 'high_altitude': self.high_altitude}
+        return frozenset(tag for tag, on in flags.items() if on)
+
+
+def monsoon_months_for(lat, lon, altitude_m=None):
+    """Months of main monsoon rainfall for a location in India."""
+    if altitude_m and altitude_m >= HIGH_ALTITUDE_M and lat >= 32:
+        return ()  # Trans-Himalayan rain shadow (Ladakh, Spiti)
+    if lon >= 92 and lat < 15:
+        return (5, 6, 7, 8, 9, 10, 11)  # Andaman and Nicobar
+    if lon >= 78.5 and lat < 15:
+        return (10, 11, 12)  # Tamil Nadu coast: northeast monsoon
+    if lat < 13 and lon < 77.5:
+        return (6, 7, 8, 9, 10)  # Kerala and the southern Western Ghats
+    if lon >= 88.5 and lat >= 22:
+        return (5, 6, 7, 8, 9)  # Northeast
+    return (6, 7, 8, 9)
+
+
+def snow_months_for(lat, altitude_m):
+    """Months with likely snow for a location, empty when snow is unlikely."""
+    if not altitude_m or lat < 27:
+        return ()
+    if altitude_m >= 3000:
+        return (11, 12, 1, 2, 3)
+    if altitude_m >= SNOW_ALTITUDE_M:
+        return (12, 1, 2)
+    return ()
+
+
+@lru_cache(maxsize=1)
+def get_gazetteer(path=GAZETTEER_FILE):
+    """Load the gazetteer once per process into (PlaceIndex, places)."""
+    with open(path, encoding='utf-8') as f:
+        places = json.load(f)['places']
+
+    index = PlaceIndex()
+    for place in places:
+        index.add(place, [place['id'], place['name']] + place.get('aliases', []))
+    return index, places
+
+
+def _profile_from_place(place, source):
+    """Build a profile from a gazetteer entry."""
+    altitude = place.get('elevation_m')
+    return DestinationProfile(
+        name=place['name'],
+        coastal=place.get('coastal', False),
+        hill=place.get('hill', False) or bool(altitude and altitude >= HILL_ALTITUDE_M),
+        metro=place.get('metro', False),
+        altitude_m=altitude,
+        monsoon_months=monsoon_months_for(place['lat'], place['lon'], altitude),
+        snow_months=snow_months_for(place['lat'], altitude),
+        source=source
+    )
+
+
+def _nearest_place(coords, places):
+    """Closest gazetteer place within NEARBY_RADIUS_KM of coords, or None."""
+    from utils.map_utils import calculate_distance
+
+    best, best_km = None, NEARBY_RADIUS_KM
+    for place in places:
+        distance = calculate_distance(coords, (place['lat'], place['lon']))
+        if distance <= best_km:
+            best, best_km = place, distance
+    return best
+
+
+@lru_cache(maxsize=1024)
+def _build_profile(normalized, coords):
+    """Classify one normalized destination (plus rounded coordinates); memoized."""
+    index, places = get_gazetteer()
+
+    place, _, _ = index.lookup(normalized)
+    if place:
+        return _profile_from_place(place, 'gazetteer')
+
+    # Coordinates beat a similar-looking name: 'Mangalore' is spelled like Bangalore but is on the coast
+    if coords:
+        from utils.map_utils import calculate_distance
+
+        nearby = _nearest_place(coords, places)
+        if nearby:
+            return _profile_from_place(nearby, 'nearby')._replace(name=normalized.title())
+
+        similar, _ = index.suggest(normalized)
+        if similar and calculate_distance(coords, (similar['lat'], similar['lon'])) <= FUZZY_RADIUS_KM:
+            return _profile_from_place(similar, 'gazetteer')
+
+    words = set(normalized.split())
+    return DestinationProfile(
+        name=normalized.title(),
+        coastal=bool(words & DESTINATION_KEYWORDS['coastal']),
+        hill=bool(words & DESTINATION_KEYWORDS['hill']),
+        metro=bool(words & DESTINATION_KEYWORDS['metro']),
+        altitude_m=None,
+        monsoon_months=monsoon_months_for(*coords) if coords else monsoon_months_for(20.0, 78.0),
+        snow_months=(),
+        source='keywords'
+    )
+
+
+def get_destination_profile(destination, coords=None):
+    """
+    Get the profile for a destination.
+
+    Args:
+        destination (str): Destination as typed by the user
+        coords (tuple): Optional (lat, lon), used for places not in the gazetteer
+
+    Returns:
+        DestinationProfile: Memoized per normalized destination and coordinates
+    """
+    key_coords = (round(coords[0], 2), round(coords[1], 2)) if coords else None
+    return _build_profile(normalize_place_name(destination), key_coords)
@@ -0,0 +1,63 @@
+"""
+Dev-mode Element Counter
+Counts the Streamlit deltas (elements and layout blocks) each section sends
+over the websocket, so batched rendering can be checked at a glance.
+Enable with TRAVEL_PLANNER_DEV_MODE=1.
+"""
+
+import threading
+from contextlib import contextmanager
+
+import streamlit as st
+import streamlit.delta_generator as delta_generator
+
+from config.constants import DEV_MODE
+
+# Active counters for the script thread that is currently rendering
+_local = threading.local()
+_hook_lock = threading.Lock()
+
+
+def _install_hook():
+    """Wrap Streamlit's delta enqueue once per process so active sections are counted."""
+    with _hook_lock:
+        if getattr(delta_generator, '_travel_planner_counting', False):
+            return
+        original_enqueue = delta_generator._enqueue_message
+
+        def counting_enqueue(msg):
+            for counter in getattr(_local, 'stack', ()):
+                counter[1] += 1
+            return original_enqueue(msg)
+
+        delta_generator._enqueue_message = counting_enqueue
+        delta_generator._travel_planner_counting = True
+
+
+@contextmanager
+def count_elements(section):
+    """Count the deltas rendered inside this block under `section` (dev mode only)."""
+    if not DEV_MODE:
+        yield
+        return
+
+    _install_hook()
+    if not hasattr(_local, 'stack'):
+        _local.stack = []
+    counter = [section, 0]
+    _local.stack.append(counter)
+    try:
+        yield
+    finally:
+        _local.stack.remove(counter)
+        st.session_state.setdefault('element_counts', {})[section] = counter[1]
+
+
+def render_element_counts():
+    """Show the per-section element counts in the sidebar (dev mode only)."""
+    counts = st.session_state.get('element_counts')
+    if not DEV_MODE or not counts:
+        return
+
+    rows = "\n".join(f"| {section} | {count} |" for section, count in counts.items())
+    st.sidebar.markdown(f"**🔧 Elements per tab**\n\n| Tab | Elements |\n|---|---|\n{rows}")
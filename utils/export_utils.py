@@ -0,0 +1,272 @@
+"""
+Trip Exports
+One export bundle per plan - itinerary, route, forecast, packing list and
+safety information - rendered as text, Markdown, an iCalendar file with one
+event per trip day, or a PDF.
+
+Exports are built only when a user asks for one and cached by the hash of
+the plan's contents the session store records when it saves a plan, so every
+download button, tab and rerun for the same plan shares one build.
+"""
+
+import hashlib
+import io
+import json
+import re
+import textwrap
+import threading
+from collections import OrderedDict, namedtuple
+from datetime import date, datetime, timedelta, timezone
+
+from utils.planner import summarize_plan
+from utils.itinerary_parser import parse_itinerary
+from utils.packing_rules import PACKING_CATEGORIES
+from utils.trip_plan import hash_inputs
+from utils.telemetry import span
+
+EXPORT_CACHE_SIZE = 64   # built exports kept per process
+
+# Pictographs, dingbats, flags, keycaps and the joiners/selectors that glue them together
+_EMOJI_RE = re.compile(
+    "[\U0001F000-\U0001FAFF\U00002600-\U000027BF\U00002B00-\U00002BFF\U0001F1E6-\U0001F1FF"
+    "\u2190-\u21FF\u2300-\u23FF\u20E3\uFE0E\uFE0F\u200D]+[ \t]?"
+)
+
+ExportFormat = namedtuple('ExportFormat', 'label extension mime render')
+
+
+def strip_emoji(text):
+    """Remove emoji (and the space that follows each one) from text."""
+    return _EMOJI_RE.sub('', text or '')
+
+
+def _plain(text):
+    """Emoji-free text without Markdown emphasis, for formats that show it literally."""
+    return strip_emoji(text).replace('**', '').replace('__', '')
+
+
+def plan_digest(plan):
+    """Hash of everything an export is built from - recorded by the session store, computed for other plans."""
+    if plan.content_digest:
+        return plan.content_digest
+    payload = json.dumps({
+        'inputs': plan.inputs,
+        'itinerary': plan.itinerary,
+        'weather_forecast': plan.weather_forecast,
+        'route': [plan.start_coords, plan.dest_coords, plan.distance_km, plan.approx_time]
+    }, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+
+
+# Bundle sections as (heading, lines) - shared by the text, Markdown and PDF formats
+
+def _route_lines(summary):
+    inputs, route = summary['inputs'], summary['route']
+    lines = [f"From {inputs['starting_location']} to {inputs['destination']} by {inputs['travel_mode']}"]
+    if route['distance_km'] is not None:
+        lines.append(f"Distance: {route['distance_km']:.1f} km")
+    if route['approx_time_hours'] is not None:
+        lines.append(f"Travel time: about {route['approx_time_hours']:.1f} hours")
+    return lines
+
+
+def _forecast_lines(summary):
+    forecasts = summary['weather_forecast'] or []
+    lines = [f"{f['date']}: {f['description']}, {f['temp_min']}-{f['temp_max']}°C, "
+             f"{f['rain_chance']}% chance of rain" for f in forecasts]
+    if summary['weather_notice']:
+        lines.append(f"Note: {summary['weather_notice']}")
+    return lines or ["Forecast unavailable"]
+
+
+def _packing_lines(summary, bullet):
+    lines = []
+    for category, title in PACKING_CATEGORIES.items():
+        names = [item['name'] for item in summary['packing_list'] if item['category'] == category]
+        if names:
+            lines.append(title.replace('**', '').strip())
+            lines.extend(f"{bullet}{name}" for name in names)
+    return lines
+
+
+def _safety_lines(summary, bullet):
+    safety = summary['safety']
+    contacts = safety['contacts']
+    lines = ["Emergency numbers:"]
+    lines += [f"{bullet}{service}: {number}" for service, number in contacts['national'].items()]
+    lines += [f"{bullet}{service}: {contact}" for service, contact in contacts['local'].items()]
+    lines.append("Safety tips:")
+    lines += [f"{bullet}{tip}" for tip in safety['tips']]
+    lines.append("Advisories:")
+    lines += [f"{bullet}{advisory}" for advisory in safety['advisories']]
+    return lines
+
+
+def _sections(summary, bullet='- '):
+    return [
+        ("Itinerary", (summary['itinerary'] or '').splitlines()),
+        ("Route", _route_lines(summary)),
+        ("Weather forecast", _forecast_lines(summary)),
+        ("Packing list", _packing_lines(summary, bullet)),
+        ("Safety", _safety_lines(summary, bullet))
+    ]
+
+
+def _title(summary):
+    inputs = summary['inputs']
+    return f"{inputs['destination']} trip plan - {inputs['duration_days']} days, {inputs['group_type']}"
+
+
+# Renderers: summary dict -> bytes
+
+def render_text(summary):
+    parts = [_title(summary), "=" * len(_title(summary))]
+    for heading, lines in _sections(summary):
+        parts += ["", heading.upper(), "-" * len(heading)] + lines
+    return _plain("\n".join(parts) + "\n").encode('utf-8')
+
+
+def render_markdown(summary):
+    parts = [f"# {_title(summary)}"]
+    for heading, lines in _sections(summary):
+        if heading == "Itinerary":
+            # Demote the itinerary's own headings below the section heading
+            lines = [f"#{line}" if line.startswith('#') else line for line in lines]
+        else:
+            lines = [f"**{line}**" if not line.startswith('- ') and line.endswith(':') else line for line in lines]
+        parts += ["", f"## {heading}", ""] + lines
+    return ("\n".join(parts) + "\n").encode('utf-8')
+
+
+def _ics_escape(text):
+    return text.replace('\\', '\\\\').replace(';', '\\;').replace(',', '\\,').replace('\n', '\\n')
+
+
+def _ics_fold(line):
+    """Fold a content line at 75 octets (RFC 5545 3.1)."""
+    encoded = line.encode('utf-8')
+    if len(encoded) <= 75:
+        return line
+    chunks, current = [], b''
+    for char in line:
+        piece = char.encode('utf-8')
+        if len(current) + len(piece) > (75 if not chunks else 74):
+            chunks.append(current.decode('utf-8'))
+            current = b''
+        current += piece
+    chunks.append(current.decode('utf-8'))
+    return "\r\n ".join(chunks)
+
+
+def render_ics(summary, start_date=None):
+    """One all-day event per itinerary day, starting `start_date` (default today - the form has no date)."""
+    inputs = summary['inputs']
+    start_date = start_date or date.today()
+    uid_base = hash_inputs(inputs)
+    forecasts = summary['weather_forecast'] or []
+    days = list(parse_itinerary(summary['itinerary']).days)
+    if not days:
+        days = [(1, f"Trip to {inputs['destination']}", summary['itinerary'] or '')]
+
+    stamp = datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+    lines = ["BEGIN:VCALENDAR", "VERSION:2.0", "PRODID:-//AI Travel Planner//Trip Export//EN", "CALSCALE:GREGORIAN"]
+    for number, title, body in days:
+        day = start_date + timedelta(days=number - 1)
+        description = _plain(body)
+        if 0 < number <= len(forecasts):
+            f = forecasts[number - 1]
+            description += f"\n\nWeather: {f['description']}, {f['temp_min']}-{f['temp_max']}°C"
+        summary_line = f"Day {number}: {_plain(title)}" if title else f"Day {number}"
+        lines += [
+            "BEGIN:VEVENT",
+            f"UID:{uid_base}-day{number}@travel-planner",
+            f"DTSTAMP:{stamp}",
+            f"DTSTART;VALUE=DATE:{day.strftime('%Y%m%d')}",
+            f"DTEND;VALUE=DATE:{(day + timedelta(days=1)).strftime('%Y%m%d')}",
+            f"SUMMARY:{_ics_escape(summary_line + ' - ' + inputs['destination'])}",
+            f"LOCATION:{_ics_escape(inputs['destination'])}",
+            f"DESCRIPTION:{_ics_escape(description)}",
+            "END:VEVENT"
+        ]
+    lines.append("END:VCALENDAR")
+    return ("\r\n".join(_ics_fold(line) for line in lines) + "\r\n").encode('utf-8')
+
+
+PDF_LINES_PER_PAGE = 64
+PDF_LINE_WIDTH = 92
+
+
+def render_pdf(summary):
+    """A plain A4 text document drawn with matplotlib's PDF backend."""
+    from matplotlib.backends.backend_pdf import PdfPages
+    from matplotlib.figure import Figure
+
+    lines = [_title(summary), ""]
+    for heading, section in _sections(summary, bullet='  - '):
+        lines += [heading.upper(), ""]
+        for line in section:
+            line = _plain(line).replace('₹', 'Rs. ').lstrip('#').strip() if line.strip() else ''
+            lines += textwrap.wrap(line, PDF_LINE_WIDTH, subsequent_indent='    ') or ['']
+        lines.append("")
+
+    buffer = io.BytesIO()
+    with PdfPages(buffer, metadata={'Title': _title(summary), 'Creator': 'AI Travel Planner'}) as pdf:
+        for start in range(0, len(lines), PDF_LINES_PER_PAGE):
+            figure = Figure(figsize=(8.27, 11.69))
+            page = lines[start:start + PDF_LINES_PER_PAGE]
+            for row, line in enumerate(page):
+                figure.text(0.07, 0.95 - row * 0.0140, line, family='monospace', fontsize=8.5,
+                            weight='bold' if line.isupper() and line.strip() else 'normal')
+            pdf.savefig(figure)
+    return buffer.getvalue()
+
+
+EXPORT_FORMATS = {
+    'txt': ExportFormat("Text (.txt)", 'txt', 'text/plain', render_text),
+    'md': ExportFormat("Markdown (.md)", 'md', 'text/markdown', render_markdown),
+    'ics': ExportFormat("Calendar (.ics)", 'ics', 'text/calendar', render_ics),
+    'pdf': ExportFormat("PDF (.pdf)", 'pdf', 'application/pdf', render_pdf)
+}
+
+_exports = OrderedDict()  # (plan digest, format) -> bytes
+_building = {}            # (plan digest, format) -> lock held while it is built
+_exports_lock = threading.Lock()
+
+
+def _build(plan, fmt):
+    with span('export_build', format=fmt):
+        return EXPORT_FORMATS[fmt].render(summarize_plan(plan))
+
+
+def cached_export(plan, fmt):
+    """The export's bytes if it has already been built, else None (never starts a build)."""
+    key = (plan_digest(plan), fmt)
+    with _exports_lock:
+        data = _exports.get(key)
+        if data is not None:
+            _exports.move_to_end(key)
+        return data
+
+
+def get_export(plan, fmt):
+    """The export's bytes, built on the calling thread if nobody has built it yet."""
+    key = (plan_digest(plan), fmt)
+    with _exports_lock:
+        build_lock = _building.setdefault(key, threading.Lock())
+    # Sessions asking for the same export at once wait for the first build instead of repeating it
+    with build_lock:
+        data = cached_export(plan, fmt)
+        if data is None:
+            data = _build(plan, fmt)
+            with _exports_lock:
+                _exports[key] = data
+                while len(_exports) > EXPORT_CACHE_SIZE:
+                    _exports.popitem(last=False)
+    with _exports_lock:
+        _building.pop(key, None)
+    return data
+
+
+def export_file_name(plan, fmt):
+    destination = re.sub(r'[^A-Za-z0-9]+', '_', plan.inputs['destination']).strip('_') or 'trip'
+    return f"{destination}_trip_plan.{EXPORT_FORMATS[fmt].extension}"
@@ -0,0 +1,109 @@
+"""
+Itinerary Parser
+Splits a generated itinerary into its introduction, one section per "Day N"
+heading (Markdown "## Day 3: ..." or a bold "**Day 3 - ...**" line) and the
+closing notes after the last day, such as budget and safety tips.
+
+Parsing is cached per itinerary text, so reruns and the day-by-day view, the
+exports and single-day regeneration all share one split.
+"""
+
+import re
+from collections import namedtuple
+from functools import lru_cache
+
+DaySection = namedtuple('DaySection', 'number title body')
+ParsedItinerary = namedtuple('ParsedItinerary', 'intro days closing')
+
+_DAY_LINE_RE = re.compile(r'^[ \t]*(#{0,6})[ \t]*\**[ \t]*Day[ \t]+(\d+)\b[ \t]*[:.\-–—]?[ \t]*(.*?)[ \t#*]*$',
+                          re.IGNORECASE | re.MULTILINE)
+# A bold day heading is bold as a whole ("**Day 3: Old Goa**") or up to its
+# number ("**Day 3:** Old Goa"), never "**Day 3 cost:** ₹1500"
+_BOLD_DAY_RE = re.compile(r'\*\*[ \t]*Day[ \t]+\d+[ \t]*(?:[:.\-–—][ \t]*)?(?:\*\*.*|[^*]*\*\*)$', re.IGNORECASE)
+_HEADING_RE = re.compile(r'^[ \t]*(#{1,6})[ \t]+\S', re.MULTILINE)
+
+
+def _is_day_heading(match):
+    return bool(match.group(1)) or bool(_BOLD_DAY_RE.match(match.group(0).strip()))
+
+
+def _day_title(match):
+    return match.group(3).strip(' \t*').lstrip(':.-–— \t').strip()
+
+
+def _day_matches(itinerary):
+    """Day heading matches and the end of the last day (where the closing notes start).
+
+    Days run in increasing order; a repeated or lower day number is part of
+    the current day. The first heading at or above the days' level that is
+    not a day (e.g. "## Budget Tips" after "## Day 5") ends the days, and
+    nothing after it counts as one. Bold day lines rank like second-level
+    headings.
+    """
+    headings = {heading.start(): len(heading.group(1)) for heading in _HEADING_RE.finditer(itinerary)}
+    candidates = {match.start(): match for match in _DAY_LINE_RE.finditer(itinerary) if _is_day_heading(match)}
+
+    matches = []
+    day_level = None
+    for position in sorted(headings.keys() | candidates.keys()):
+        match = candidates.get(position)
+        if match is None:
+            if matches and headings[position] <= day_level:
+                return matches, position
+        elif not matches:
+            matches.append(match)
+            day_level = len(match.group(1)) or 2
+        elif int(match.group(2)) > int(matches[-1].group(2)):
+            matches.append(match)
+    return matches, len(itinerary)
+
+
+@lru_cache(maxsize=256)
+def parse_itinerary(itinerary):
+    """Split an itinerary into a ParsedItinerary; `days` is empty if it has no day headings."""
+    itinerary = itinerary or ''
+    matches, end = _day_matches(itinerary)
+    if not matches:
+        return ParsedItinerary(itinerary.strip(), (), '')
+
+    days = []
+    for index, match in enumerate(matches):
+        section_end = matches[index + 1].start() if index + 1 < len(matches) else end
+        title = _day_title(match)
+        days.append(DaySection(int(match.group(2)), title, itinerary[match.end():section_end].strip()))
+    return ParsedItinerary(itinerary[:matches[0].start()].strip(), tuple(days), itinerary[end:].strip())
+
+
+def replace_day(itinerary, number, section):
+    """Splice a regenerated day into an itinerary in place of day `number`.
+
+    `section` is the new day's Markdown, with or without its own "Day N"
+    heading; the spliced heading keeps the original's style (and its title
+    when the new section has none). Raises KeyError
+    if the itinerary has no day `number`.
+    """
+    matches, end = _day_matches(itinerary)
+    for index, match in enumerate(matches):
+        if int(match.group(2)) == number:
+            break
+    else:
+        raise KeyError(f"itinerary has no Day {number}")
+
+    new = parse_itinerary(section)
+    if new.days:
+        title, body = new.days[0].title, new.days[0].body
+    else:
+        title, body = '', new.intro
+    title = title or _day_title(match)
+    heading = day_heading(DaySection(number, title, body))
+    level = match.group(1)
+    heading = f"{level} {heading}" if level else f"**{heading}**"
+
+    section_end = matches[index + 1].start() if index + 1 < len(matches) else end
+    trailing = "\n\n" if section_end < len(itinerary) else "\n"
+    return f"{itinerary[:match.start()]}{heading}\n\n{body}{trailing}{itinerary[section_end:]}"
+
+
+def day_heading(day):
+    """Display heading of a day section, e.g. "Day 3: Old Goa"."""
+    return f"Day {day.number}: {day.title}" if day.title else f"Day {day.number}"
@@ -0,0 +1,90 @@
+"""
+Keyword Matcher
+A small Aho-Corasick automaton that finds every keyword from a fixed set in
+a single pass over the text, however many keywords there are.
+
+Keywords match whole words; a trailing '*' turns a keyword into a prefix
+match ('trek*' matches 'trek', 'treks' and 'trekking').
+"""
+
+from collections import deque
+
+
+class KeywordMatcher:
+    """Multi-keyword matcher compiled once and reused for every scan."""
+
+    def __init__(self, keywords):
+        # Trie as parallel lists: transitions, failure links, matched keyword ids
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [[]]
+        self._keywords = []
+        self._prefix = []
+
+        for keyword in keywords:
+            self._add(keyword)
+        self._build_failure_links()
+
+    def _add(self, keyword):
+        """Insert one keyword into the trie."""
+        keyword = keyword.lower()
+        prefix = keyword.endswith('*')
+        word = keyword.rstrip('*')
+        if not word:
+            return
+
+        state = 0
+        for char in word:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+                self._goto[state][char] = next_state
+            state = next_state
+
+        self._out[state].append(len(self._keywords))
+        self._keywords.append(keyword)
+        self._prefix.append(prefix)
+
+    def _build_failure_links(self):
+        """Breadth-first pass linking each state to its longest proper suffix state."""
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                candidate = self._goto[fail].get(char, 0)
+                self._fail[next_state] = candidate if candidate != next_state else 0
+                self._out[next_state] = self._out[next_state] + self._out[self._fail[next_state]]
+
+    def iter_matches(self, text):
+        """Yield (keyword, end_index) for every whole-word or prefix match in text."""
+        text = text.lower()
+        length = len(text)
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+
+        for index, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if not out[state]:
+                continue
+
+            for keyword_id in out[state]:
+                keyword = self._keywords[keyword_id]
+                start = index - len(keyword.rstrip('*')) + 1
+                if start > 0 and text[start - 1].isalnum():
+                    continue
+                if not self._prefix[keyword_id] and index + 1 < length and text[index + 1].isalnum():
+                    continue
+                yield keyword, index
+
+    def find(self, text):
+        """Return the set of keywords found in text."""
+        return {keyword for keyword, _ in self.iter_matches(text)}
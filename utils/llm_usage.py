@@ -0,0 +1,138 @@
+"""
+LLM Usage Ledger
+One record per itinerary generation - model, input/output tokens, latency,
+estimated cost and cache status - appended to a local JSONL file. The file
+is append-only; the admin page (pages/llm_usage.py) reads it back and
+aggregates by destination, trip length and model.
+
+A generation served from a cache (a resubmission whose itinerary inputs did
+not change) is recorded too, with cache "hit" and no tokens, so hit rates
+can be read off the same ledger.
+
+Configuration (environment):
+    LLM_USAGE_FILE  - JSONL output path (default logs/llm_usage.jsonl, empty disables)
+"""
+
+import json
+import os
+import re
+import threading
+import time
+
+from config.constants import LLM_USAGE_FILE
+from config.openai_config import MODEL_PRICES
+from utils.telemetry import Counter, register_metric, METRIC_PREFIX
+
+LLM_TOKENS = register_metric(Counter(
+    f"{METRIC_PREFIX}_llm_tokens_total", "LLM tokens used, by direction", "direction"
+))
+LLM_GENERATIONS = register_metric(Counter(
+    f"{METRIC_PREFIX}_llm_generations_total", "Itinerary generations, by cache status", "cache"
+))
+
+_SNAPSHOT_SUFFIX_RE = re.compile(r'-\d{4}-\d{2}-\d{2}$')
+
+
+def estimate_cost(model, input_tokens, output_tokens, cached_tokens=0):
+    """Estimated cost of a call in USD, or None for a model without a price."""
+    # Responses report dated snapshots, e.g. "gpt-4o-mini-2024-07-18"
+    prices = MODEL_PRICES.get(_SNAPSHOT_SUFFIX_RE.sub('', model or ''))
+    if prices is None:
+        return None
+    input_price, cached_price, output_price = prices
+    uncached = max(0, input_tokens - cached_tokens)
+    return round((uncached * input_price + cached_tokens * cached_price + output_tokens * output_price) / 1e6, 6)
+
+
+class UsageLedger:
+    """Append-only JSONL file of usage records."""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = None
+
+    def append(self, record):
+        if not self.path:
+            return
+        line = json.dumps(record, ensure_ascii=False, default=str) + "\n"
+        with self._lock:
+            try:
+                if self._file is None:
+                    os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+                    self._file = open(self.path, 'a', encoding='utf-8', buffering=1)
+                self._file.write(line)
+            except OSError as e:
+                print(f"LLM usage export failed: {e}")
+                self.path = None
+
+    def read(self):
+        """All records in the file, skipping a partly written last line."""
+        if not self.path or not os.path.exists(self.path):
+            return []
+        records = []
+        with open(self.path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    continue
+        return records
+
+
+_ledger = UsageLedger(LLM_USAGE_FILE)
+
+
+def _labels(labels):
+    """The trip fields a record is aggregated by."""
+    labels = labels or {}
+    return {
+        'kind': labels.get('kind', 'itinerary'),
+        'destination': str(labels.get('destination') or '').strip().title() or None,
+        'duration_days': labels.get('duration_days')
+    }
+
+
+def record_llm_call(model, latency_s, input_tokens=0, output_tokens=0, cached_tokens=0,
+                    first_token_s=None, status='ok', labels=None):
+    """Record one LLM call (cache "miss")."""
+    LLM_TOKENS.inc('input', input_tokens)
+    LLM_TOKENS.inc('output', output_tokens)
+    LLM_GENERATIONS.inc('miss')
+    _ledger.append({
+        'time': time.time(),
+        **_labels(labels),
+        'model': model,
+        'cache': 'miss',
+        'status': status,
+        'input_tokens': input_tokens,
+        'output_tokens': output_tokens,
+        'cached_tokens': cached_tokens,
+        'latency_s': round(latency_s, 3),
+        'first_token_s': round(first_token_s, 3) if first_token_s is not None else None,
+        'cost_usd': estimate_cost(model, input_tokens, output_tokens, cached_tokens)
+    })
+
+
+def record_cache_hit(cache, labels=None):
+    """Record a generation that was served without an LLM call, from the named cache."""
+    LLM_GENERATIONS.inc('hit')
+    _ledger.append({
+        'time': time.time(),
+        **_labels(labels),
+        'model': None,
+        'cache': 'hit',
+        'cache_source': cache,
+        'status': 'ok',
+        'input_tokens': 0,
+        'output_tokens': 0,
+        'cached_tokens': 0,
+        'latency_s': 0.0,
+        'first_token_s': None,
+        'cost_usd': 0.0
+    })
+
+
+def load_usage():
+    """Every usage record so far, oldest first."""
+    return _ledger.read()
@@ -0,0 +1,148 @@
+"""
+LLM Utilities
+Itinerary generation through the OpenAI Responses API. Responses are
+streamed so the time to first token can be measured separately from the
+time to the complete itinerary; the async variant hands the chunks on to
+callers that stream them further.
+
+Every call's token usage and latency is recorded in the usage ledger
+(utils/llm_usage.py), labeled with the trip fields passed as `labels`, and
+fed to the model router's latency SLO window (utils/model_router.py). A
+response cut off by its output token budget is recorded as 'truncated' and
+raises ItineraryTruncated instead of returning a partial itinerary.
+"""
+
+import time
+
+from config.model_routing import DEFAULT_MODEL
+from config.openai_config import get_client, get_async_client
+from utils.llm_usage import record_llm_call
+from utils.model_router import observe_latency
+from utils.telemetry import span, observe_duration
+
+
+class ItineraryTruncated(RuntimeError):
+    """The response ran out of output tokens before the itinerary was complete."""
+
+    def __init__(self, max_output_tokens):
+        super().__init__(f"The itinerary was cut off at the {max_output_tokens}-token output limit")
+        self.max_output_tokens = max_output_tokens
+
+
+class _CallUsage:
+    """Usage of one streamed call, filled in from its events and recorded when it ends."""
+
+    def __init__(self, model, labels):
+        self.requested_model = self.model = model
+        self.labels = labels
+        self.started = time.perf_counter()
+        self.first_token_at = None
+        self.input_tokens = self.output_tokens = self.cached_tokens = 0
+
+    def on_delta(self):
+        if self.first_token_at is None:
+            self.first_token_at = time.perf_counter()
+            observe_duration('llm_first_token', self.first_token_at - self.started, model=self.model)
+
+    def on_completed(self, response):
+        self.model = getattr(response, 'model', None) or self.model
+        usage = getattr(response, 'usage', None)
+        if usage is not None:
+            self.input_tokens = usage.input_tokens or 0
+            self.output_tokens = usage.output_tokens or 0
+            details = getattr(usage, 'input_tokens_details', None)
+            self.cached_tokens = getattr(details, 'cached_tokens', 0) or 0
+
+    def finish(self, attributes, status):
+        first_token_s = self.first_token_at - self.started if self.first_token_at is not None else None
+        if first_token_s is not None:
+            attributes['first_token_s'] = round(first_token_s, 3)
+        attributes['input_tokens'] = self.input_tokens
+        attributes['output_tokens'] = self.output_tokens
+        latency_s = time.perf_counter() - self.started
+        record_llm_call(self.model, latency_s, self.input_tokens, self.output_tokens,
+                        self.cached_tokens, first_token_s, status, self.labels)
+        if status == 'ok':
+            observe_latency(self.requested_model, latency_s, first_token_s, self.output_tokens)
+
+
+def _request_options(model, max_output_tokens):
+    options = {'model': model}
+    if max_output_tokens:
+        options['max_output_tokens'] = max_output_tokens
+    return options
+
+
+def generate_itinerary(prompt, model=DEFAULT_MODEL, labels=None, max_output_tokens=None):
+    """Generate an itinerary for a prompt and return its text (ItineraryTruncated if it was cut off)."""
+    with span('llm_call', model=model) as attributes:
+        usage = _CallUsage(model, labels)
+        status = 'error'
+        try:
+            stream = get_client().responses.create(
+                input=prompt, stream=True, **_request_options(model, max_output_tokens)
+            )
+
+            chunks = []
+            truncated = False
+            for event in stream:
+                if event.type == 'response.output_text.delta':
+                    usage.on_delta()
+                    chunks.append(event.delta)
+                elif event.type in ('response.completed', 'response.incomplete'):
+                    # "incomplete" when the output token budget ran out
+                    usage.on_completed(event.response)
+                    truncated = attributes['truncated'] = event.type == 'response.incomplete'
+                elif event.type in ('response.failed', 'error'):
+                    raise RuntimeError(f"Itinerary generation failed: {getattr(event, 'message', event.type)}")
+            if truncated:
+                status = 'truncated'
+                raise ItineraryTruncated(max_output_tokens)
+            status = 'ok'
+        finally:
+            usage.finish(attributes, status)
+
+        itinerary = ''.join(chunks)
+        attributes['output_chars'] = len(itinerary)
+        return itinerary
+
+
+async def stream_itinerary_async(prompt, model=DEFAULT_MODEL, labels=None, max_output_tokens=None):
+    """Yield itinerary text chunks as they arrive, without blocking the event loop.
+
+    Raises ItineraryTruncated after the last chunk if the output budget ran
+    out, so callers must not keep what they streamed.
+    """
+    with span('llm_call', model=model) as attributes:
+        usage = _CallUsage(model, labels)
+        status = 'error'
+        output_chars = 0
+        try:
+            stream = await get_async_client().responses.create(
+                input=prompt, stream=True, **_request_options(model, max_output_tokens)
+            )
+
+            truncated = False
+            async for event in stream:
+                if event.type == 'response.output_text.delta':
+                    usage.on_delta()
+                    output_chars += len(event.delta)
+                    yield event.delta
+                elif event.type in ('response.completed', 'response.incomplete'):
+                    # "incomplete" when the output token budget ran out
+                    usage.on_completed(event.response)
+                    truncated = attributes['truncated'] = event.type == 'response.incomplete'
+                elif event.type in ('response.failed', 'error'):
+                    raise RuntimeError(f"Itinerary generation failed: {getattr(event, 'message', event.type)}")
+            if truncated:
+                status = 'truncated'
+                raise ItineraryTruncated(max_output_tokens)
+            status = 'ok'
+        except GeneratorExit:
+            # The consumer stopped early (e.g. the client disconnected)
+            status = 'cancelled'
+            raise
+        finally:
+            usage.finish(attributes, status)
+
+        attributes['output_chars'] = output_chars
@@ -1,21 +1,95 @@
 import folium
 from geopy.geocoders import Nominatim
+import asyncio
 import math
+import threading
+import time
 import streamlit.components.v1 as components
 import matplotlib.pyplot as plt
 import matplotlib.patches as patches
 
+from config.map_config import NOMINATIM_DOMAIN, NOMINATIM_SCHEME, NOMINATIM_MIN_INTERVAL
+from utils.cassette import geopy_adapter_factory, is_replaying
+from utils.telemetry import span, record_event
+
+NOMINATIM_USER_AGENT = "travel_planner_app"
+
+# Successful lookups are shared by every session, batch worker and API request
+GEOCODE_CACHE_SIZE = 2048
+_geocode_cache = {}
+_geocode_lock = threading.Lock()
+_last_geocode_at = 0.0
+
+def _reserve_geocode_slot():
+    """Claim the next Nominatim request slot; returns how long to wait for it (usage policy: 1/s)"""
+    global _last_geocode_at
+    with _geocode_lock:
+        wait = _last_geocode_at + NOMINATIM_MIN_INTERVAL - time.monotonic()
+        _last_geocode_at = time.monotonic() + max(0.0, wait)
+    return wait
+
+def _remember_coordinates(key, coords):
+    with _geocode_lock:
+        if len(_geocode_cache) >= GEOCODE_CACHE_SIZE:
+            _geocode_cache.pop(next(iter(_geocode_cache)))
+        _geocode_cache[key] = coords
+
 def get_coordinates(location_name):
     """Get latitude/longitude for a location using free geocoding"""
-    try:
-        geolocator = Nominatim(user_agent="travel_planner_app")
-        location = geolocator.geocode(location_name + ", India")
-        if location:
-            return (location.latitude, location.longitude)
-        return None
-    except Exception as e:
-        print(f"Geocoding error: {e}")
-        return None
+    key = location_name.strip().lower()
+    cached = _geocode_cache.get(key)
+    if cached:
+        return cached
+
+    with span('geocode', location=location_name) as attributes:
+        try:
+            # Replayed lookups never reach Nominatim, so its rate limit does not apply
+            wait = 0 if is_replaying() else _reserve_geocode_slot()
+            if wait > 0:
+                time.sleep(wait)
+            geolocator = Nominatim(user_agent=NOMINATIM_USER_AGENT, domain=NOMINATIM_DOMAIN, scheme=NOMINATIM_SCHEME,
+                                   adapter_factory=geopy_adapter_factory())
+            location = geolocator.geocode(location_name + ", India")
+            attributes['found'] = bool(location)
+            if location:
+                coords = (location.latitude, location.longitude)
+                _remember_coordinates(key, coords)
+                return coords
+            return None
+        except Exception as e:
+            print(f"Geocoding error: {e}")
+            record_event('geocode_error', location=location_name, error=str(e)[:200])
+            return None
+
+async def get_coordinates_async(location_name, http_client):
+    """Non-blocking get_coordinates over an httpx.AsyncClient, sharing its cache and rate limit"""
+    key = location_name.strip().lower()
+    cached = _geocode_cache.get(key)
+    if cached:
+        return cached
+
+    with span('geocode', location=location_name) as attributes:
+        try:
+            wait = 0 if is_replaying() else _reserve_geocode_slot()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            response = await http_client.get(
+                f"{NOMINATIM_SCHEME}://{NOMINATIM_DOMAIN}/search",
+                params={'q': location_name + ", India", 'format': 'json', 'limit': 1},
+                headers={'User-Agent': NOMINATIM_USER_AGENT}
+            )
+            response.raise_for_status()
+            results = response.json()
+            attributes['found'] = bool(results)
+            if results:
+                coords = (float(results[0]['lat']), float(results[0]['lon']))
+                _remember_coordinates(key, coords)
+                return coords
+            return None
+        except Exception as e:
+            print(f"Geocoding error: {e}")
+            record_event('geocode_error', location=location_name, error=str(e)[:200])
+            return None
 
 def calculate_distance(coord1, coord2):
     """Calculate straight-line distance between two coordinates in km"""
@@ -30,6 +104,19 @@ def calculate_distance(coord1, coord2):
     c = 2 * math.atan2(math.sqrt(a), math.sqrt(1-a))
     return R * c
 
+# Average door-to-door speeds in km/h
+TRAVEL_SPEEDS_KMH = {
+    'Train': 50,
+    'Bus': 40,
+    'Flight': 500,
+    'Car': 60,
+    'Bike': 30
+}
+
+def estimate_travel_time(distance_km, travel_mode):
+    """Estimate travel time in hours for a distance and travel mode"""
+    return distance_km / TRAVEL_SPEEDS_KMH.get(travel_mode, TRAVEL_SPEEDS_KMH['Bike'])
+
 def create_folium_map(start_coords, end_coords, start_name, end_name):
     """Create an interactive Folium map with route"""
     # Calculate center point for map
@@ -72,14 +159,17 @@ def create_folium_map(start_coords, end_coords, start_name, end_name):
     
     return m
 
-def display_map_in_streamlit(folium_map):
-    """Display Folium map in Streamlit - FIXED VERSION"""
-    # Save map to temporary HTML file and read it back
-    folium_map.save('temp_map.html')
-    with open('temp_map.html', 'r', encoding='utf-8') as f:
-        map_html = f.read()
+def render_map_html(folium_map):
+    """Render a Folium map to a standalone HTML string (no temp file, safe across sessions)"""
+    return folium_map.get_root().render()
+
+def display_map_in_streamlit(folium_map_or_html):
+    """Display a Folium map, or its pre-rendered HTML, in Streamlit"""
+    if isinstance(folium_map_or_html, str):
+        map_html = folium_map_or_html
+    else:
+        map_html = render_map_html(folium_map_or_html)
     
-    # Use a simpler approach that actually works
     components.html(map_html, height=500, scrolling=True)
 
 def create_static_map(start_coords, end_coords, start_name, end_name):
@@ -0,0 +1,142 @@
+"""
+Model Router
+Picks the model and output token budget for each LLM request from the
+policy in config/model_routing.py: the request's complexity selects a tier,
+and a model whose recent latency breaches the SLO is swapped for its faster
+fallback until its observations age out of the window. A response cut off by
+its output budget gets one retry with a larger one (retry_route).
+
+Latency is observed per requested model from every successful call
+(utils/llm_utils.py), so all sessions of a process share one view.
+"""
+
+import threading
+import time
+from collections import defaultdict, deque, namedtuple
+
+from config.model_routing import (
+    SPECIAL_CONDITIONS_WEIGHT, MODEL_TIERS, OUTPUT_TOKENS_BASE, DAY_OUTPUT_TOKENS, FALLBACK_MODELS,
+    RETRY_OUTPUT_TOKENS_FACTOR, MODEL_MAX_OUTPUT_TOKENS, DEFAULT_MAX_OUTPUT_TOKENS, LLM_FIRST_TOKEN_SLO_S, LLM_SECONDS_PER_1K_TOKENS_SLO, LLM_LATENCY_WINDOW_S, LLM_LATENCY_MIN_SAMPLES
+)
+from utils.telemetry import Counter, Gauge, register_metric, record_event, METRIC_PREFIX
+
+Route = namedtuple('Route', 'tier model max_output_tokens complexity downgraded_from')
+
+ROUTES = register_metric(Counter(
+    f"{METRIC_PREFIX}_llm_routes_total", "LLM requests by routing tier and model", "route"
+))
+FIRST_TOKEN_P90 = register_metric(Gauge(
+    f"{METRIC_PREFIX}_llm_first_token_p90_seconds", "p90 time to first token over the SLO window", "model"
+))
+SECONDS_PER_1K_P90 = register_metric(Gauge(
+    f"{METRIC_PREFIX}_llm_seconds_per_1k_tokens_p90", "p90 generation time per 1000 output tokens", "model"
+))
+
+
+def _p90(values):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(0.9 * len(ordered)))]
+
+
+class LatencyTracker:
+    """Sliding window of (time, first token s, s per 1k output tokens) per model."""
+
+    def __init__(self, window_s=LLM_LATENCY_WINDOW_S, min_samples=LLM_LATENCY_MIN_SAMPLES):
+        self.window_s = window_s
+        self.min_samples = min_samples
+        self._samples = defaultdict(deque)
+        self._lock = threading.Lock()
+
+    def observe(self, model, latency_s, first_token_s, output_tokens):
+        if first_token_s is None or output_tokens <= 0:
+            return
+        per_1k = max(0.0, latency_s - first_token_s) * 1000 / output_tokens
+        with self._lock:
+            self._samples[model].append((time.monotonic(), first_token_s, per_1k))
+            self._expire(model)
+
+    def _expire(self, model):
+        samples = self._samples[model]
+        cutoff = time.monotonic() - self.window_s
+        while samples and samples[0][0] < cutoff:
+            samples.popleft()
+
+    def p90(self, model):
+        """(first token s, s per 1k tokens) p90s, or None with too few recent samples."""
+        with self._lock:
+            self._expire(model)
+            samples = list(self._samples[model])
+        if len(samples) < self.min_samples:
+            return None
+        first_token, per_1k = _p90(s[1] for s in samples), _p90(s[2] for s in samples)
+        FIRST_TOKEN_P90.set(model, round(first_token, 3))
+        SECONDS_PER_1K_P90.set(model, round(per_1k, 3))
+        return first_token, per_1k
+
+    def breaching(self, model):
+        latency = self.p90(model)
+        return latency is not None and (
+            latency[0] > LLM_FIRST_TOKEN_SLO_S or latency[1] > LLM_SECONDS_PER_1K_TOKENS_SLO
+        )
+
+
+_tracker = LatencyTracker()
+
+
+def observe_latency(model, latency_s, first_token_s, output_tokens):
+    """Feed a successful call's latency into the SLO window."""
+    _tracker.observe(model, latency_s, first_token_s, output_tokens)
+
+
+def request_complexity(inputs):
+    """Trip days plus interests, weighted up for special conditions."""
+    interests = [item for item in str(inputs.get('interests') or '').split(',') if item.strip()]
+    conditions = SPECIAL_CONDITIONS_WEIGHT if str(inputs.get('special_conditions') or '').strip() else 0
+    return int(inputs.get('duration_days') or 1) + len(interests) + conditions
+
+
+def output_token_limit(model):
+    """Most output tokens the model can produce in one response."""
+    return MODEL_MAX_OUTPUT_TOKENS.get(model, DEFAULT_MAX_OUTPUT_TOKENS)
+
+
+def _tier(complexity):
+    for tier in MODEL_TIERS:
+        if tier[1] is None or complexity <= tier[1]:
+            return tier
+    return MODEL_TIERS[-1]
+
+
+def route_request(inputs, kind='itinerary'):
+    """The Route for a request: the complexity tier's model and budget, stepped down while over the SLO.
+
+    kind 'day' is a single regenerated day, routed as a one-day trip.
+    """
+    complexity = request_complexity({**inputs, 'duration_days': 1} if kind == 'day' else inputs)
+    name, _, model, tokens_per_day, token_cap = _tier(complexity)
+    if kind == 'day':
+        max_output_tokens = DAY_OUTPUT_TOKENS
+    else:
+        max_output_tokens = min(token_cap, OUTPUT_TOKENS_BASE + tokens_per_day * int(inputs.get('duration_days') or 1))
+
+    chosen = model
+    seen = {chosen}
+    while _tracker.breaching(chosen) and FALLBACK_MODELS.get(chosen) not in (None, *seen):
+        chosen = FALLBACK_MODELS[chosen]
+        seen.add(chosen)
+    downgraded_from = model if chosen != model else None
+    if downgraded_from:
+        record_event('llm_model_downgrade', tier=name, requested=model, model=chosen)
+
+    ROUTES.inc(f"{name}:{chosen}")
+    return Route(name, chosen, min(max_output_tokens, output_token_limit(chosen)), complexity, downgraded_from)
+
+
+def retry_route(route):
+    """The route to retry a truncated response on - a larger output budget - or None if the model has no more."""
+    limit = output_token_limit(route.model)
+    if route.max_output_tokens >= limit:
+        return None
+    max_output_tokens = min(limit, int(route.max_output_tokens * RETRY_OUTPUT_TOKENS_FACTOR))
+    record_event('llm_truncated_retry', tier=route.tier, model=route.model, max_output_tokens=max_output_tokens)
+    return route._replace(max_output_tokens=max_output_tokens)
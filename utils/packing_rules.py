@@ -0,0 +1,190 @@
+"""
+Packing Rules
+Declarative rules that map trip signals to packing items. The keywords of
+every rule are compiled once into a single KeywordMatcher, so the itinerary,
+interests, weather preference, destination and forecast are scanned in one
+pass per packing list.
+
+Rule fields:
+    keywords  - words that trigger the rule ('*' suffix = prefix match);
+                a rule without keywords always applies
+    sources   - which inputs the keywords are looked for in (default: all)
+    profile   - destination profile tag the rule needs ('coastal', 'hill', ...)
+    min_days / max_days - optional trip length bounds
+    items     - (icon, name, category) tuples; '{days}' is filled in
+"""
+
+from functools import lru_cache
+
+from utils.keyword_matcher import KeywordMatcher
+
+# Category -> checklist section title, in display order
+PACKING_CATEGORIES = {
+    'essentials': '🧳 **Essential Documents & Electronics**',
+    'clothing': '👕 **Clothing & Personal Items**',
+    'activity': '🎯 **Activity-Specific Gear**',
+    'weather': '🌦️ **Weather & Miscellaneous**'
+}
+
+SOURCES = ('itinerary', 'interests', 'weather', 'destination', 'forecast')
+
+PACKING_RULES = [
+    # Base essentials (always included)
+    {'items': [
+        ('✅', "Government ID (Aadhar, Driver's License)", 'essentials'),
+        ('✅', 'Phone + Charger + Power Bank', 'essentials'),
+        ('✅', 'Cash + ATM Cards', 'essentials'),
+        ('✅', 'Basic Medicines (headache, stomach, motion sickness)', 'essentials'),
+        ('✅', 'Sanitizer & Masks', 'essentials'),
+        ('✅', 'Reusable Water Bottle', 'essentials')
+    ]},
+
+    # Duration-based items
+    {'max_days': 3, 'items': [
+        ('👕', '{days} sets of clothes', 'clothing'),
+        ('🎒', 'Small Backpack', 'essentials')
+    ]},
+    {'min_days': 4, 'items': [
+        ('👕', '{days} sets of clothes + 1 extra', 'clothing'),
+        ('🧳', 'Travel Luggage', 'essentials'),
+        ('🧼', 'Quick-dry towel', 'clothing'),
+        ('🧴', 'Travel-sized toiletries', 'clothing')
+    ]},
+
+    # Weather preference and forecast
+    {'keywords': ('cold', 'snow*', 'winter', 'freezing', 'chilly'),
+     'sources': ('weather', 'forecast', 'itinerary'),
+     'items': [
+        ('🧥', 'Warm Jacket/Sweater', 'clothing'),
+        ('🧣', 'Scarf/Shawl', 'clothing'),
+        ('🧤', 'Gloves (if very cold)', 'clothing'),
+        ('🔥', 'Thermal wear (for hill stations)', 'clothing')
+    ]},
+    {'keywords': ('warm', 'hot', 'sunny', 'humid', 'summer'),
+     'sources': ('weather', 'forecast'),
+     'items': [
+        ('👕', 'Light Cotton Clothes', 'clothing'),
+        ('🕶️', 'Sunglasses', 'weather'),
+        ('🧴', 'Sunscreen Lotion', 'weather'),
+        ('🎩', 'Cap/Hat', 'weather')
+    ]},
+    {'keywords': ('moderate', 'mild', 'pleasant'),
+     'sources': ('weather',),
+     'items': [
+        ('👚', 'Layered Clothing', 'clothing'),
+        ('🧥', 'Light Jacket', 'clothing'),
+        ('🌂', 'Umbrella (just in case)', 'weather')
+    ]},
+    {'keywords': ('rain*', 'drizzle', 'showers', 'thunderstorm', 'monsoon'),
+     'sources': ('forecast', 'weather', 'itinerary'),
+     'items': [
+        ('🌂', 'Compact Umbrella', 'weather'),
+        ('🧥', 'Light Raincoat', 'clothing'),
+        ('🛍️', 'Waterproof Bag Cover', 'weather')
+    ]},
+
+    # Interests and itinerary activities
+    {'keywords': ('beach*', 'swim*', 'snorkel*', 'scuba', 'surf*', 'island*'),
+     'sources': ('interests', 'itinerary', 'destination'),
+     'items': [
+        ('🩳', 'Swimwear', 'activity'),
+        ('🩴', 'Flip Flops', 'activity'),
+        ('🏖️', 'Beach Towel', 'activity'),
+        ('📱', 'Waterproof Phone Case', 'activity')
+    ]},
+    {'keywords': ('adventure', 'trek*', 'hik*', 'camping', 'rafting', 'paraglid*', 'climb*'),
+     'sources': ('interests', 'itinerary'),
+     'items': [
+        ('🥾', 'Sports Shoes/Hiking Boots', 'activity'),
+        ('🎒', 'Daypack', 'activity'),
+        ('💧', 'Hydration Pack/Water Bottle', 'activity'),
+        ('🧭', 'Power Bank (extra)', 'activity')
+    ]},
+    {'keywords': ('photograph*', 'camera', 'sunrise', 'sunset'),
+     'sources': ('interests', 'itinerary'),
+     'items': [
+        ('📷', 'Camera + Extra Memory Cards', 'activity'),
+        ('🔋', 'Camera Batteries + Charger', 'activity'),
+        ('🎒', 'Camera Bag', 'activity')
+    ]},
+    {'keywords': ('food*', 'street food', 'cuisine', 'food walk'),
+     'sources': ('interests', 'itinerary'),
+     'items': [
+        ('🍴', 'Hand Sanitizer (extra)', 'activity'),
+        ('📱', 'Food Review Apps installed', 'activity')
+    ]},
+    {'keywords': ('temple*', 'gurudwara', 'mosque', 'church', 'monaster*', 'dargah'),
+     'sources': ('itinerary', 'interests'),
+     'items': [
+        ('🧦', 'Socks for temple visits', 'clothing'),
+        ('🧕', 'Modest clothing / head cover', 'clothing')
+    ]},
+
+    # Destination-specific items (India focus), from the destination profile
+    {'profile': 'coastal', 'items': [
+        ('🌊', 'Beach Bag', 'weather'),
+        ('🏊‍♂️', 'Goggles', 'activity')
+    ]},
+    {'profile': 'hill', 'items': [
+        ('🧥', 'Warm Layers', 'clothing'),
+        ('🥾', 'Sturdy Shoes', 'clothing')
+    ]},
+    {'profile': 'high_altitude', 'items': [
+        ('💊', 'Altitude sickness medicine (consult a doctor)', 'essentials'),
+        ('🧴', 'Lip balm & moisturiser', 'weather')
+    ]},
+    {'profile': 'metro', 'items': [
+        ('👞', 'Comfortable Walking Shoes', 'clothing'),
+        ('📱', 'Local Transport Apps', 'essentials')
+    ]}
+]
+
+
+class PackingEngine:
+    """Rules table compiled into one keyword matcher plus a keyword -> rules index."""
+
+    def __init__(self, rules):
+        self.rules = rules
+        self.keyword_rules = {}
+        for rule_id, rule in enumerate(rules):
+            for keyword in rule.get('keywords', ()):
+                self.keyword_rules.setdefault(keyword.lower(), []).append(rule_id)
+        self.matcher = KeywordMatcher(self.keyword_rules)
+
+    def matched_rules(self, texts, duration_days, profile_tags=frozenset()):
+        """Return the ids of rules triggered by texts (source -> text) and profile tags, in table order."""
+        # Concatenate the sources once and remember where each one ends
+        segments, boundaries, offset = [], [], 0
+        for source in SOURCES:
+            text = texts.get(source) or ''
+            segments.append(text)
+            offset += len(text) + 1
+            boundaries.append((offset, source))
+        combined = '\n'.join(segments)
+
+        triggered = set()
+        segment = 0
+        for keyword, end in self.matcher.iter_matches(combined):
+            while end >= boundaries[segment][0]:
+                segment += 1
+            source = boundaries[segment][1]
+            for rule_id in self.keyword_rules[keyword]:
+                if source in self.rules[rule_id].get('sources', SOURCES):
+                    triggered.add(rule_id)
+
+        matched = []
+        for rule_id, rule in enumerate(self.rules):
+            if duration_days < rule.get('min_days', 0) or duration_days > rule.get('max_days', duration_days):
+                continue
+            if 'profile' in rule:
+                if rule['profile'] in profile_tags:
+                    matched.append(rule_id)
+            elif 'keywords' not in rule or rule_id in triggered:
+                matched.append(rule_id)
+        return matched
+
+
+@lru_cache(maxsize=1)
+def get_packing_engine():
+    """Compile PACKING_RULES once per process."""
+    return PackingEngine(PACKING_RULES)
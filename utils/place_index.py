@@ -0,0 +1,161 @@
+"""
+Place Index
+In-memory lookup of places by normalized name and alias. A lookup also
+accepts a single dropped, extra or swapped letter ('Banglore' -> Bengaluru)
+but never a changed one, since many different places differ by one letter
+(Mangalore, Bangalore). Looser trigram matches are only offered as a "did
+you mean" suggestion.
+
+Exact lookups are dict hits; typo and fuzzy lookups only score the names
+that share a trigram with the query, so lookup cost stays flat as the index
+grows to thousands of places.
+"""
+
+import re
+
+MAX_WINDOW_WORDS = 3
+DEFAULT_FUZZY_THRESHOLD = 0.55  # for suggestions only
+MIN_TYPO_LENGTH = 6  # shorter names are too close to each other to accept typos
+
+# Words that never identify a place on their own
+STOP_WORDS = {'india', 'the', 'trip', 'to', 'and', 'city', 'district', 'near', 'in'}
+
+
+def normalize_place_name(name):
+    """Lowercase, strip punctuation and collapse whitespace: ' New-Delhi, India ' -> 'new delhi india'."""
+    return re.sub(r'[^a-z0-9]+', ' ', (name or '').lower()).strip()
+
+
+def _trigrams(text):
+    """Padded character trigrams of a normalized name."""
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _one_typo(typed, name):
+    """True when typed is name with one letter dropped, added, or two neighbours swapped."""
+    if len(typed) == len(name):
+        diffs = [i for i, (a, b) in enumerate(zip(typed, name)) if a != b]
+        return (len(diffs) == 2 and diffs[1] == diffs[0] + 1
+                and typed[diffs[0]] == name[diffs[1]] and typed[diffs[1]] == name[diffs[0]])
+    shorter, longer = sorted((typed, name), key=len)
+    if len(longer) - len(shorter) != 1:
+        return False
+    i = 0
+    while i < len(shorter) and shorter[i] == longer[i]:
+        i += 1
+    return shorter[i:] == longer[i + 1:]
+
+
+class PlaceIndex:
+    """Maps normalized names and aliases to place records."""
+
+    def __init__(self, fuzzy_threshold=DEFAULT_FUZZY_THRESHOLD):
+        self.fuzzy_threshold = fuzzy_threshold
+        self._names = {}      # normalized name/alias -> record
+        self._trigrams = {}   # trigram -> set of normalized names
+        self._name_grams = {}  # normalized name -> its trigram set
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def add(self, record, names):
+        """Index a record under each of its names and aliases."""
+        self._size += 1
+        for name in names:
+            key = normalize_place_name(name)
+            if not key or key in self._names:
+                continue
+            self._names[key] = record
+            grams = _trigrams(key)
+            self._name_grams[key] = grams
+            for gram in grams:
+                self._trigrams.setdefault(gram, set()).add(key)
+
+    def get(self, name):
+        """Exact lookup by name or alias."""
+        return self._names.get(normalize_place_name(name))
+
+    def _windows(self, normalized):
+        """Word windows of the query, longest first: 'old manali town' -> 'old manali town', 'old manali', ..."""
+        words = [word for word in normalized.split() if word not in STOP_WORDS]
+        for size in range(min(MAX_WINDOW_WORDS, len(words)), 0, -1):
+            for start in range(len(words) - size + 1):
+                yield ' '.join(words[start:start + size])
+
+    def _candidates(self, text):
+        """Number of shared trigrams per indexed name, for names sharing at least one."""
+        shared = {}
+        for gram in _trigrams(text):
+            for name in self._trigrams.get(gram, ()):
+                shared[name] = shared.get(name, 0) + 1
+        return shared
+
+    def _fuzzy(self, text):
+        """Best (score, name) by trigram Dice similarity among names sharing a trigram."""
+        grams = _trigrams(text)
+        best = (0.0, None)
+        for name, count in self._candidates(text).items():
+            score = 2 * count / (len(grams) + len(self._name_grams[name]))
+            if score > best[0]:
+                best = (score, name)
+        return best
+
+    def _typo(self, text):
+        """The indexed name one dropped, added or swapped letter away from text, or None."""
+        if len(text) < MIN_TYPO_LENGTH:
+            return None
+        matches = [name for name in self._candidates(text)
+                   if abs(len(name) - len(text)) <= 1 and _one_typo(text, name)]
+        # Two places one letter away are ambiguous
+        return matches[0] if len({id(self._names[name]) for name in matches}) == 1 else None
+
+    def lookup(self, query):
+        """
+        Find the place a free-text destination refers to, by name or alias.
+
+        Returns:
+            tuple: (record, matched_name, exact) - exact is False for a
+            one-letter typo - or (None, None, False)
+        """
+        normalized = normalize_place_name(query)
+        if not normalized:
+            return None, None, False
+
+        if normalized in self._names:
+            return self._names[normalized], normalized, True
+
+        windows = list(self._windows(normalized))
+        for window in windows:
+            if window in self._names:
+                return self._names[window], window, True
+
+        for window in windows:
+            name = self._typo(window)
+            if name:
+                return self._names[name], name, False
+        return None, None, False
+
+    def suggest(self, query):
+        """
+        Closest place by trigram similarity, for a "did you mean" hint.
+
+        It may well be a different place ('Mangalore' suggests Bengaluru),
+        so never use it in place of a lookup.
+
+        Returns:
+            tuple: (record, matched_name) or (None, None)
+        """
+        best = (0.0, None)
+        for window in self._windows(normalize_place_name(query)):
+            # Very short fragments match too many names to be useful
+            if len(window) < 4:
+                continue
+            candidate = self._fuzzy(window)
+            if candidate[0] > best[0]:
+                best = candidate
+
+        if best[1] and best[0] >= self.fuzzy_threshold:
+            return self._names[best[1]], best[1]
+        return None, None
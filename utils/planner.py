@@ -0,0 +1,239 @@
+"""
+Planner
+The plan pipeline without any Streamlit calls, shared by the app, the batch
+CLI and the async API server. Each stage fills in its TripPlan outputs; the
+process-wide caches behind it (geocoding, forecast payloads, packing engine,
+destination profiles, contacts, itineraries of similar trips) are shared by
+every caller.
+"""
+
+import asyncio
+
+from config.constants import MIN_DURATION_DAYS, MAX_DURATION_DAYS, MIN_BUDGET
+from utils.prompt_builder import build_travel_prompt, build_day_prompt
+from utils.itinerary_parser import replace_day
+from utils.llm_utils import generate_itinerary, ItineraryTruncated
+from utils.model_router import route_request, retry_route
+from utils.llm_usage import record_cache_hit
+from utils.semantic_cache import lookup_itinerary, remember_itinerary
+from utils.weather_utils import fetch_weather_forecast, fetch_weather_forecast_async
+from utils.map_utils import get_coordinates, get_coordinates_async, calculate_distance, estimate_travel_time, create_folium_map, render_map_html
+from utils.packing_utils import generate_packing_list
+from utils.safety_utils import get_safety_info, get_safety_tips, get_travel_advisories
+from utils.trip_plan import TripPlan, PLAN_FIELDS, PLAN_DEFAULTS
+from utils.telemetry import span
+
+
+def normalize_inputs(raw):
+    """Complete trip inputs with the form defaults and check them against the form's limits.
+
+    Raises ValueError for a missing destination or starting location, or a
+    trip length or budget the form would not accept.
+    """
+    inputs = dict(PLAN_DEFAULTS)
+    inputs.update({name: raw[name] for name in PLAN_FIELDS if raw.get(name) is not None})
+    missing = [name for name in ('destination', 'starting_location') if not str(inputs.get(name) or '').strip()]
+    if missing:
+        raise ValueError(f"missing required fields: {', '.join(missing)}")
+    try:
+        inputs['duration_days'] = int(inputs['duration_days'])
+        inputs['budget'] = int(inputs['budget'])
+    except (TypeError, ValueError):
+        raise ValueError("duration_days and budget must be integers")
+    if not MIN_DURATION_DAYS <= inputs['duration_days'] <= MAX_DURATION_DAYS:
+        raise ValueError(f"duration_days must be between {MIN_DURATION_DAYS} and {MAX_DURATION_DAYS}")
+    if inputs['budget'] < MIN_BUDGET:
+        raise ValueError(f"budget must be at least {MIN_BUDGET}")
+    return inputs
+
+
+def usage_labels(inputs, kind='itinerary'):
+    """Trip fields an LLM call is recorded under in the usage ledger."""
+    return {'kind': kind, 'destination': inputs['destination'], 'duration_days': inputs['duration_days']}
+
+
+def reuse_cached_itinerary(plan):
+    """Complete the itinerary stage from the semantic cache; True if a near-duplicate request had one."""
+    match = lookup_itinerary(plan.inputs)
+    if match is None:
+        return False
+    record_cache_hit('semantic', usage_labels(plan.inputs))
+    plan.complete('itinerary', itinerary=match.itinerary, itinerary_match={
+        'similarity': match.similarity,
+        'destination': match.inputs['destination'],
+        'budget': match.inputs['budget']
+    })
+    return True
+
+
+def generate_routed(prompt, route, labels):
+    """generate_itinerary on a route, retried once with a larger output budget if the response was cut off."""
+    try:
+        return generate_itinerary(prompt, model=route.model, labels=labels, max_output_tokens=route.max_output_tokens)
+    except ItineraryTruncated:
+        retry = retry_route(route)
+        if retry is None:
+            raise
+        return generate_itinerary(prompt, model=retry.model, labels=labels, max_output_tokens=retry.max_output_tokens)
+
+
+def run_itinerary_stage(plan, reuse=True):
+    """Generate the itinerary, unless `reuse` and the semantic cache already has one for a similar trip."""
+    if reuse and reuse_cached_itinerary(plan):
+        return
+    with span('prompt_build'):
+        prompt = build_travel_prompt(**plan.inputs)
+    itinerary = generate_routed(prompt, route_request(plan.inputs), usage_labels(plan.inputs))
+    plan.complete('itinerary', itinerary=itinerary, itinerary_match=None)
+    remember_itinerary(plan.inputs, itinerary)
+
+
+def regenerate_day(plan, day_number, feedback=''):
+    """Rewrite one day of the plan's itinerary and splice it in place.
+
+    The prompt carries only the trip summary and the neighbouring days, so
+    the call costs about one day's tokens instead of the whole trip's. The
+    itinerary stage stays fresh - its inputs did not change.
+    """
+    with span('regenerate_day', day=day_number, days=plan.inputs['duration_days']):
+        with span('prompt_build'):
+            prompt = build_day_prompt(plan.inputs, plan.itinerary, day_number, feedback)
+        section = generate_routed(prompt, route_request(plan.inputs, kind='day'), usage_labels(plan.inputs, 'day'))
+        if not section.strip():
+            raise RuntimeError(f"Day {day_number} regeneration returned an empty response")
+        plan.complete('itinerary', itinerary=replace_day(plan.itinerary, day_number, section))
+
+
+def run_weather_stage(plan):
+    forecasts, notice = fetch_weather_forecast(plan.inputs['destination'], plan.inputs['duration_days'])
+    plan.complete('weather', weather_forecast=forecasts, weather_notice=notice)
+
+
+def run_route_stage(plan):
+    """Resolve the route once - the budget estimate and the map both need it."""
+    inputs = plan.inputs
+    start_coords = dest_coords = None
+    distance_km = approx_time = None
+    route_error = None
+    try:
+        start_coords = get_coordinates(inputs['starting_location'])
+        dest_coords = get_coordinates(inputs['destination'])
+        if start_coords and dest_coords:
+            distance_km = calculate_distance(start_coords, dest_coords)
+            approx_time = estimate_travel_time(distance_km, inputs['travel_mode'])
+    except Exception as e:
+        route_error = str(e)
+    plan.complete('route', start_coords=start_coords, dest_coords=dest_coords,
+                  distance_km=distance_km, approx_time=approx_time, route_error=route_error)
+
+
+async def run_weather_stage_async(plan, http_client, coords=None):
+    forecasts, notice = await fetch_weather_forecast_async(
+        plan.inputs['destination'], plan.inputs['duration_days'], http_client, coords
+    )
+    plan.complete('weather', weather_forecast=forecasts, weather_notice=notice)
+
+
+async def run_route_stage_async(plan, http_client):
+    """Non-blocking run_route_stage; both ends are geocoded concurrently."""
+    inputs = plan.inputs
+    start_coords = dest_coords = None
+    distance_km = approx_time = None
+    route_error = None
+    try:
+        start_coords, dest_coords = await asyncio.gather(
+            get_coordinates_async(inputs['starting_location'], http_client),
+            get_coordinates_async(inputs['destination'], http_client)
+        )
+        if start_coords and dest_coords:
+            distance_km = calculate_distance(start_coords, dest_coords)
+            approx_time = estimate_travel_time(distance_km, inputs['travel_mode'])
+    except Exception as e:
+        route_error = str(e)
+    plan.complete('route', start_coords=start_coords, dest_coords=dest_coords,
+                  distance_km=distance_km, approx_time=approx_time, route_error=route_error)
+
+
+def run_map_stage(plan):
+    """Render the interactive map once; the route tab shows the cached HTML."""
+    map_html = None
+    if plan.start_coords and plan.dest_coords:
+        try:
+            with span('map_render'):
+                folium_map = create_folium_map(plan.start_coords, plan.dest_coords,
+                                               plan.inputs['starting_location'], plan.inputs['destination'])
+                map_html = render_map_html(folium_map)
+        except Exception as map_error:
+            print(f"Interactive map unavailable: {map_error}")
+    plan.complete('map', map_html=map_html)
+
+
+STAGE_RUNNERS = {
+    'itinerary': run_itinerary_stage,
+    'weather': run_weather_stage,
+    'route': run_route_stage,
+    'map': run_map_stage
+}
+
+
+def run_stage(plan, stage):
+    """Compute one pipeline stage of a plan."""
+    STAGE_RUNNERS[stage](plan)
+
+
+def build_plan(inputs, previous=None, skip=()):
+    """Build a TripPlan, reusing unchanged stages of `previous` and leaving out `skip`."""
+    plan = TripPlan.for_inputs(inputs, previous)
+    for stage in plan.pending_stages():
+        if stage not in skip:
+            run_stage(plan, stage)
+    return plan
+
+
+def route_summary(plan):
+    """The route stage outputs as a JSON-friendly dict."""
+    return {
+        'start_coords': plan.start_coords,
+        'dest_coords': plan.dest_coords,
+        'distance_km': round(plan.distance_km, 1) if plan.distance_km is not None else None,
+        'approx_time_hours': round(plan.approx_time, 1) if plan.approx_time is not None else None,
+        'error': plan.route_error
+    }
+
+
+def safety_summary(destination, group_type, special_conditions, dest_coords=None):
+    """Emergency contacts, tips and advisories for a destination."""
+    return {
+        'contacts': get_safety_info(destination),
+        'tips': get_safety_tips(destination, group_type, special_conditions, dest_coords),
+        'advisories': get_travel_advisories(destination, dest_coords)
+    }
+
+
+def summarize_plan(plan):
+    """A computed plan (map left out) as a JSON-serializable dict with packing and safety."""
+    inputs = plan.inputs
+    return {
+        'inputs': inputs,
+        'itinerary': plan.itinerary,
+        'itinerary_match': plan.itinerary_match,
+        'weather_forecast': plan.weather_forecast,
+        'weather_notice': plan.weather_notice,
+        'route': route_summary(plan),
+        'packing_list': generate_packing_list(
+            plan.itinerary, inputs['destination'], inputs['duration_days'], inputs['interests'],
+            inputs['weather_preference'], plan.weather_forecast, plan.dest_coords
+        ),
+        'safety': safety_summary(inputs['destination'], inputs['group_type'],
+                                 inputs['special_conditions'], plan.dest_coords)
+    }
+
+
+def plan_trip(raw_inputs):
+    """Plan one trip end to end for batch use: itinerary, forecast, route, packing and safety.
+
+    Returns a JSON-serializable dict. The interactive map is not rendered.
+    """
+    inputs = normalize_inputs(raw_inputs)
+    with span('batch_trip', destination=inputs['destination']):
+        return summarize_plan(build_plan(inputs, skip=('map',)))
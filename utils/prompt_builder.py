@@ -2,9 +2,13 @@
 """
 This module builds a structured prompt for the AI Travel Planner.
 It takes user inputs and formats them into a detailed prompt
-suitable for OpenAI API to generate a personalized itinerary.
+suitable for OpenAI API to generate a personalized itinerary, or to
+rewrite a single day of one.
 """
 
+from utils.itinerary_parser import parse_itinerary, day_heading
+
+
 def build_travel_prompt(
     destination: str,
     duration_days: int,
@@ -67,3 +71,65 @@ Format it clearly with headings for each day.
 """
 
     return prompt
+
+
+def build_day_prompt(inputs: dict, itinerary: str, day_number: int, feedback: str = "") -> str:
+    """
+    Build a prompt that rewrites a single day of an existing itinerary.
+
+    Only the trip summary, the one-line titles of all days and the full text
+    of the neighbouring days are sent, so the request and the response stay
+    about one day long however long the trip is.
+
+    Args:
+        inputs (dict): The plan's form inputs (see utils/trip_plan.py)
+        itinerary (str): The current itinerary
+        day_number (int): Day to rewrite
+        feedback (str): What the traveller wants changed, if anything
+
+    Returns:
+        str: Formatted prompt for AI
+
+    Raises:
+        KeyError: If the itinerary has no such day
+    """
+    days = {day.number: day for day in parse_itinerary(itinerary).days}
+    if day_number not in days:
+        raise KeyError(f"itinerary has no Day {day_number}")
+
+    outline = "\n".join(f"- {day_heading(day)}" for day in days.values())
+    neighbours = "\n\n".join(
+        f"### {day_heading(days[number])}\n{days[number].body}"
+        for number in (day_number - 1, day_number + 1) if number in days
+    )
+    daily_budget = inputs['budget'] // max(1, inputs['duration_days'])
+
+    prompt = f"""
+You are an expert travel planner. Rewrite Day {day_number} of an existing student-friendly itinerary.
+
+- Destination: {inputs['destination']}
+- Duration: {inputs['duration_days']} days
+- Total budget: ₹{inputs['budget']} (about ₹{daily_budget} per day)
+- Group type: {inputs['group_type']}
+- Travel mode: {inputs['travel_mode']}
+- Stay preference: {inputs['stay_preference']}
+- Food preference: {inputs['food_preference']}
+- Interests: {inputs['interests']}
+- Special conditions: {inputs['special_conditions']}
+
+All days of the trip:
+{outline}
+
+Neighbouring days (keep them consistent - don't repeat their places):
+{neighbours or "None"}
+
+Current Day {day_number} (to replace):
+{days[day_number].body}
+
+Traveller feedback: {feedback.strip() or "Suggest a different plan for this day."}
+
+Reply with only the new day, starting with a "## Day {day_number}: <title>" heading, in the same
+format as the current day: activities, estimated costs and one hidden gem or local experience.
+"""
+
+    return prompt
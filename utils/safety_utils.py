@@ -1,107 +1,30 @@
 import streamlit as st
 import requests
 
+from utils.contacts_store import get_contacts_store
+from utils.destination_profile import get_destination_profile
+
 def get_safety_info(destination):
     """Get emergency contacts and safety information for destination"""
     
-    # Indian emergency contacts database
-    emergency_contacts = {
-        'general': {
-            'National Emergency': '112',
-            'Police': '100',
-            'Fire': '101',
-            'Ambulance': '102',
-            'Women Helpline': '1091',
-            'Tourist Helpline': '1363'
-        },
-        'cities': {
-            'mumbai': {
-                'Local Police': '022-22621855',
-                'Tourist Police': '022-22027706',
-                'Major Hospital': 'KEM Hospital - 022-24107500',
-                'Railway Police': '022-23752125'
-            },
-            'delhi': {
-                'Local Police': '011-23233333',
-                'Tourist Police': '011-23490234',
-                'Major Hospital': 'AIIMS - 011-26588500',
-                'Railway Police': '011-23230110'
-            },
-            'goa': {
-                'Local Police': '0832-2428400',
-                'Tourist Police': '0832-2428114',
-                'Major Hospital': 'GMC - 0832-2458700',
-                'Beach Safety': '1077'
-            },
-            'bangalore': {
-                'Local Police': '080-22942222',
-                'Tourist Police': '080-22212121',
-                'Major Hospital': 'Victoria Hospital - 080-26701111',
-                'Cyber Crime': '080-22942550'
-            },
-            'chennai': {
-                'Local Police': '044-23452345',
-                'Tourist Police': '044-28593992',
-                'Major Hospital': 'GH Chennai - 044-25305000',
-                'Coastal Security': '044-23455800'
-            },
-            'kolkata': {
-                'Local Police': '033-22145486',
-                'Tourist Police': '033-22488250',
-                'Major Hospital': 'SSKM Hospital - 033-22041101',
-                'Tourist Security': '033-22255436'
-            },
-            'hyderabad': {
-                'Local Police': '040-27852008',
-                'Tourist Police': '040-23244444',
-                'Major Hospital': 'Osmania Hospital - 040-24600121',
-                'Tourist Assistance': '040-23450444'
-            },
-            'pune': {
-                'Local Police': '020-26126296',
-                'Tourist Police': '020-26122880',
-                'Major Hospital': 'Sassoon Hospital - 020-26127300',
-                'Highway Patrol': '020-26101100'
-            },
-            'jaipur': {
-                'Local Police': '0141-2744450',
-                'Tourist Police': '0141-2379460',
-                'Major Hospital': 'SMS Hospital - 0141-2560291',
-                'Heritage Site Security': '0141-2618864'
-            },
-            'manali': {
-                'Local Police': '01902-252112',
-                'Tourist Police': '01902-252339',
-                'Major Hospital': 'Regional Hospital - 01902-252237',
-                'Mountain Rescue': '01902-252100'
-            }
-        }
-    }
-    
-    # Find city-specific contacts
-    destination_lower = destination.lower()
-    city_contacts = {}
-    
-    for city in emergency_contacts['cities']:
-        if city in destination_lower:
-            city_contacts = emergency_contacts['cities'][city]
-            break
+    # Indexed contacts database, loaded once per process
+    store = get_contacts_store()
+    place, exact = store.find_place(destination)
     
     # If no specific city found, use general contacts
-    if not city_contacts:
-        city_contacts = {
-            'Local Police': 'Check with hotel/hostel',
-            'Nearest Hospital': 'Ask locals for directions',
-            'Tourist Assistance': 'Contact hotel manager'
-        }
+    city_contacts = place['contacts'] if place else store.fallback_local
     
     return {
-        'national': emergency_contacts['general'],
+        'national': store.national,
         'local': city_contacts,
-        'destination': destination.title()
+        'destination': destination.title(),
+        # Set when the destination matched with a typo
+        'matched_place': place['name'] if place and not exact else None,
+        # A possibly different place, never used for the contacts above
+        'suggested_place': store.suggest_place(destination) if not place else None
     }
 
-def get_safety_tips(destination, group_type, special_conditions):
+def get_safety_tips(destination, group_type, special_conditions, dest_coords=None):
     """Generate safety tips based on destination and traveler profile"""
     
     tips = []
@@ -119,23 +42,26 @@ def get_safety_tips(destination, group_type, special_conditions):
     tips.extend(general_tips)
     
     # Destination-specific tips
-    dest_lower = destination.lower()
+    profile = get_destination_profile(destination, dest_coords)
     
-    if any(city in dest_lower for city in ['goa', 'beach', 'coastal']):
+    if profile.coastal:
         tips.extend([
             "🏖️ **Beach safety** - Don't swim alone, watch for currents",
             "☀️ **Sun protection** - Use high SPF, avoid midday sun",
             "🌊 **Water activities** - Use licensed operators only"
         ])
     
-    if any(city in dest_lower for city in ['manali', 'shimla', 'darjeeling', 'hill']):
+    if profile.hill:
         tips.extend([
             "⛰️ **Mountain safety** - Acclimatize to altitude, stay hydrated",
             "🚗 **Road safety** - Mountain roads can be dangerous at night",
             "🧥 **Weather prep** - Mountain weather changes rapidly"
         ])
     
-    if any(city in dest_lower for city in ['delhi', 'mumbai', 'kolkata', 'metro']):
+    if profile.high_altitude:
+        tips.append("🫁 **High altitude** - Ascend gradually, rest on day one, watch for headache or breathlessness")
+    
+    if profile.metro:
         tips.extend([
             "🚇 **Public transport** - Keep bags closed in crowded areas",
             "🚖 **Taxi safety** - Use app-based taxis, share ride details",
@@ -167,25 +93,24 @@ def get_safety_tips(destination, group_type, special_conditions):
     
     return tips
 
-def get_travel_advisories(destination):
+def get_travel_advisories(destination, dest_coords=None):
     """Get basic travel advisories for destination"""
     
     advisories = []
-    dest_lower = destination.lower()
+    profile = get_destination_profile(destination, dest_coords)
     
     # Seasonal advisories
     import datetime
     current_month = datetime.datetime.now().month
     
-    if current_month in [6, 7, 8, 9]:  # Monsoon season
+    if current_month in profile.monsoon_months:  # Monsoon season at the destination
         advisories.append("🌧️ **Monsoon Alert** - Possible heavy rains, check weather updates")
     
-    if current_month in [12, 1, 2]:  # Winter
-        if any(city in dest_lower for city in ['manali', 'shimla', 'ladakh']):
-            advisories.append("❄️ **Winter Travel** - Roads may be closed due to snow")
+    if current_month in profile.snow_months:  # Snow season
+        advisories.append("❄️ **Winter Travel** - Roads may be closed due to snow")
     
     # Festival advisories
-    if any(city in dest_lower for city in ['delhi', 'mumbai', 'kolkata']):
+    if profile.metro:
         advisories.append("🎉 **Festival Season** - Book transport early, expect crowds")
     
     # General advisories
@@ -197,33 +122,36 @@ def get_travel_advisories(destination):
     
     return advisories
 
-def display_safety_dashboard(destination, group_type, special_conditions):
+def display_safety_dashboard(destination, group_type, special_conditions, dest_coords=None):
     """Display complete safety dashboard in Streamlit"""
     
     st.subheader("🛡️ Safety & Emergency Dashboard")
     
     # Get all safety information
     safety_info = get_safety_info(destination)
-    safety_tips = get_safety_tips(destination, group_type, special_conditions)
-    advisories = get_travel_advisories(destination)
+    safety_tips = get_safety_tips(destination, group_type, special_conditions, dest_coords)
+    advisories = get_travel_advisories(destination, dest_coords)
     
     # Create tabs for organized display
     contacts_tab, tips_tab, advisories_tab = st.tabs(["📞 Emergency Contacts", "💡 Safety Tips", "⚠️ Travel Advisories"])
     
     with contacts_tab:
         st.subheader(f"🚨 Emergency Contacts - {safety_info['destination']}")
+        if safety_info['matched_place']:
+            st.caption(f"Showing local contacts for **{safety_info['matched_place']}**")
+        elif safety_info['suggested_place']:
+            st.info(f"No local contacts listed for {safety_info['destination']} - showing general guidance. "
+                    f"Did you mean **{safety_info['suggested_place']}**?")
         
         col1, col2 = st.columns(2)
         
         with col1:
-            st.write("**National Emergency Numbers**")
-            for service, number in safety_info['national'].items():
-                st.write(f"• **{service}**: `{number}`")
+            national_lines = "\n".join(f"- **{service}**: `{number}`" for service, number in safety_info['national'].items())
+            st.markdown(f"**National Emergency Numbers**\n\n{national_lines}")
         
         with col2:
-            st.write("**Local Contacts**")
-            for service, contact in safety_info['local'].items():
-                st.write(f"• **{service}**: `{contact}`")
+            local_lines = "\n".join(f"- **{service}**: `{contact}`" for service, contact in safety_info['local'].items())
+            st.markdown(f"**Local Contacts**\n\n{local_lines}")
         
         # Quick action buttons
         st.write("**Quick Actions**")
@@ -241,26 +169,17 @@ def display_safety_dashboard(destination, group_type, special_conditions):
     with tips_tab:
         st.subheader("💡 Personalized Safety Tips")
         
-        for i, tip in enumerate(safety_tips, 1):
-            st.write(f"{i}. {tip}")
-        
-        # Download safety tips
-        tips_text = "\n".join([tip.replace('**', '') for tip in safety_tips])
-        st.download_button(
-            label="📥 Download Safety Tips",
-            data=tips_text,
-            file_name="safety_tips.txt",
-            mime="text/plain"
-        )
+        st.markdown("\n".join(f"{i}. {tip}" for i, tip in enumerate(safety_tips, 1)))
     
     with advisories_tab:
         st.subheader("⚠️ Travel Advisories")
         
-        for advisory in advisories:
-            st.info(advisory)
+        st.info("\n\n".join(advisories))
         
         # Additional resources
-        st.write("**Additional Resources**")
-        st.write("• [Ministry of Tourism](https://tourism.gov.in) - Official travel guidelines")
-        st.write("• [State Tourism Websites](https://tourism.gov.in/states) - Local information")
-        st.write("• [Indian Railways Security](https://indianrailways.gov.in) - Train travel safety")
\ No newline at end of file
+        st.markdown("""
+**Additional Resources**
+- [Ministry of Tourism](https://tourism.gov.in) - Official travel guidelines
+- [State Tourism Websites](https://tourism.gov.in/states) - Local information
+- [Indian Railways Security](https://indianrailways.gov.in) - Train travel safety
+""")
\ No newline at end of file
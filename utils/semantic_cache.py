@@ -0,0 +1,207 @@
+"""
+Semantic Cache
+Process-wide cache of generated itineraries that also answers near-duplicate
+requests: "Goa, 4 days, ₹8000, Friends" and "goa beach, 4 days, ₹8500,
+friends" share one plan.
+
+Only rows that share a request's places, needs and structured fields count:
+destination and starting location (resolved through the gazetteer's names
+and aliases), special conditions, trip length, group, travel mode, stay and
+food must be equal and the budget within SEMANTIC_CACHE_BUDGET_TOLERANCE.
+Spelling similarity cannot tell places apart (Bangalore, Mangalore) and a
+special condition is never optional, so neither is left to the similarity.
+
+The remaining free-text fields (interests, goal and weather) are embedded
+locally as hashed bags of words and character trigrams - no external
+service - into one unit-length row of a preallocated numpy matrix, so a dot
+product is the weighted mean of the per-field cosine similarities. A lookup
+is a single matrix-vector product, well under a millisecond for a full
+cache; the best eligible row is reused if its similarity reaches
+SEMANTIC_CACHE_THRESHOLD.
+"""
+
+import re
+import threading
+import time
+import zlib
+from collections import namedtuple
+
+import numpy as np
+
+from config.constants import (
+    SEMANTIC_CACHE_ENABLED, SEMANTIC_CACHE_SIZE, SEMANTIC_CACHE_THRESHOLD, SEMANTIC_CACHE_BUDGET_TOLERANCE
+)
+from utils.destination_profile import get_gazetteer
+from utils.place_index import normalize_place_name
+from utils.telemetry import Counter, Gauge, Histogram, register_metric, METRIC_PREFIX
+
+# Free-text fields and their weight; the similarity of two requests is the
+# weighted mean of their per-field cosine similarities
+TEXT_FIELDS = {
+    'interests': 2.0,
+    'travel_goal': 0.5,
+    'weather_preference': 0.5
+}
+FIELD_DIM = 256  # hashed buckets per field
+EMBEDDING_DIM = FIELD_DIM * len(TEXT_FIELDS)
+_TOTAL_WEIGHT = sum(TEXT_FIELDS.values())
+
+# Fields a reused plan must share exactly (places and conditions after normalization)
+EXACT_FIELDS = ('destination', 'starting_location', 'special_conditions', 'duration_days', 'group_type',
+                'travel_mode', 'stay_preference', 'food_preference')
+
+# Filler words that say nothing about the trip
+STOP_WORDS = frozenset(('a', 'an', 'and', 'the', 'to', 'of', 'in', 'for', 'with', 'trip', 'travel', 'tour',
+                        'days', 'day', 'india', 'visit', 'rs', 'inr'))
+_WORD_RE = re.compile(r"[^\W\d_]+")
+
+CacheMatch = namedtuple('CacheMatch', 'itinerary inputs similarity')
+
+LOOKUPS = register_metric(Counter(
+    f"{METRIC_PREFIX}_semantic_cache_lookups_total", "Semantic cache lookups by result", "result"
+))
+LOOKUP_DURATION = register_metric(Histogram(
+    f"{METRIC_PREFIX}_semantic_cache_lookup_seconds", "Semantic cache lookup time", "cache",
+    buckets=(0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01)
+))
+ENTRIES = register_metric(Gauge(
+    f"{METRIC_PREFIX}_semantic_cache_entries", "Itineraries in the semantic cache", "cache"
+))
+
+
+def _features(text):
+    """Words and padded character trigrams of a text."""
+    words = [word for word in _WORD_RE.findall(text.lower()) if word not in STOP_WORDS]
+    features = list(words)
+    for word in words:
+        padded = f" {word} "
+        features.extend(padded[i:i + 3] for i in range(len(padded) - 2))
+    return features
+
+
+def embed(inputs):
+    """Unit vector of a request's free-text fields, one hashed n-gram block per field."""
+    vector = np.zeros(EMBEDDING_DIM, dtype=np.float32)
+    for index, (field, weight) in enumerate(TEXT_FIELDS.items()):
+        # An empty field matches only another empty field
+        features = _features(str(inputs.get(field) or '')) or ['<empty>']
+        block = np.zeros(FIELD_DIM, dtype=np.float32)
+        for feature in features:
+            digest = zlib.crc32(feature.encode('utf-8'))
+            # The top bit picks a sign, so hash collisions cancel out on average
+            block[digest % FIELD_DIM] += 1.0 if digest & 0x80000000 else -1.0
+        # Unit blocks scaled by sqrt(weight / total) keep the whole vector unit length
+        scale = np.sqrt(weight / _TOTAL_WEIGHT) / np.linalg.norm(block)
+        vector[index * FIELD_DIM:(index + 1) * FIELD_DIM] = block * scale
+    return vector
+
+
+def _place_key(name):
+    """Gazetteer id of a place name or alias ('Bombay' -> mumbai), else its normalized name.
+
+    An alias that qualifies the place's own name ('navi mumbai', 'old delhi')
+    is an area of its own and keeps its name.
+    """
+    place, matched, _ = get_gazetteer()[0].lookup(name)
+    if place is None:
+        return normalize_place_name(name)
+    own_names = {place['id'], normalize_place_name(place['name'])}
+    if matched not in own_names and set(matched.split()) & set(' '.join(own_names).split()):
+        return matched
+    return place['id']
+
+
+def _conditions_key(text):
+    """Special conditions as a sorted list of normalized items: 'Diabetic, wheelchair user'."""
+    items = {' '.join(_WORD_RE.findall(item.lower())) for item in re.split(r'[,;\n]', text)}
+    return ', '.join(sorted(item for item in items if item))
+
+
+_NORMALIZERS = {'destination': _place_key, 'starting_location': _place_key, 'special_conditions': _conditions_key}
+
+
+def _exact_key(inputs):
+    key = []
+    for field in EXACT_FIELDS:
+        value = str(inputs.get(field) or '').strip().lower()
+        normalize = _NORMALIZERS.get(field)
+        key.append(normalize(value) if normalize else value)
+    return tuple(key)
+
+
+class SemanticCache:
+    """Fixed-capacity vector index of itineraries; the least recently used row is replaced when full."""
+
+    def __init__(self, capacity=SEMANTIC_CACHE_SIZE, threshold=SEMANTIC_CACHE_THRESHOLD,
+                 budget_tolerance=SEMANTIC_CACHE_BUDGET_TOLERANCE):
+        self.capacity = capacity
+        self.threshold = threshold
+        self.budget_tolerance = budget_tolerance
+        self._vectors = np.zeros((capacity, EMBEDDING_DIM), dtype=np.float32)
+        self._budgets = np.zeros(capacity, dtype=np.float64)
+        self._groups = np.full(capacity, -1, dtype=np.int64)  # id of the exact-field key, -1 for empty
+        self._last_used = np.zeros(capacity, dtype=np.float64)
+        self._entries = [None] * capacity  # (inputs, itinerary)
+        self._group_ids = {}
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def lookup(self, inputs):
+        """The closest cached itinerary for a request, or None below the threshold."""
+        started = time.perf_counter()
+        query = embed(inputs)
+        budget = float(inputs.get('budget') or 0)
+        with self._lock:
+            group = self._group_ids.get(_exact_key(inputs))
+            match = None
+            if group is not None:
+                size = self._size
+                budgets = self._budgets[:size]
+                eligible = (self._groups[:size] == group) & (
+                    np.abs(budgets - budget) <= self.budget_tolerance * np.maximum(budgets, budget)
+                )
+                # Scoring every row is cheaper than gathering the eligible ones first
+                similarities = np.where(eligible, self._vectors[:size] @ query, -1.0)
+                row = int(np.argmax(similarities))
+                if similarities[row] >= self.threshold:
+                    self._last_used[row] = time.monotonic()
+                    cached_inputs, itinerary = self._entries[row]
+                    match = CacheMatch(itinerary, cached_inputs, round(float(similarities[row]), 3))
+        LOOKUP_DURATION.observe('itinerary', time.perf_counter() - started)
+        LOOKUPS.inc('hit' if match else 'miss')
+        return match
+
+    def add(self, inputs, itinerary):
+        """Cache a freshly generated itinerary for its request."""
+        vector = embed(inputs)
+        key = _exact_key(inputs)
+        with self._lock:
+            group = self._group_ids.setdefault(key, len(self._group_ids))
+            if self._size < self.capacity:
+                row = self._size
+                self._size += 1
+            else:
+                row = int(np.argmin(self._last_used))
+            self._vectors[row] = vector
+            self._budgets[row] = float(inputs.get('budget') or 0)
+            self._groups[row] = group
+            self._last_used[row] = time.monotonic()
+            self._entries[row] = (dict(inputs), itinerary)
+            ENTRIES.set('itinerary', self._size)
+
+    def __len__(self):
+        return self._size
+
+
+_cache = SemanticCache() if SEMANTIC_CACHE_ENABLED else None
+
+
+def lookup_itinerary(inputs):
+    """A cached itinerary from a near-duplicate request, or None (also when the cache is disabled)."""
+    return _cache.lookup(inputs) if _cache is not None else None
+
+
+def remember_itinerary(inputs, itinerary):
+    """Add a generated itinerary to the cache."""
+    if _cache is not None and itinerary:
+        _cache.add(inputs, itinerary)
@@ -0,0 +1,221 @@
+"""
+Session Store
+Keeps every session's generated plan out of st.session_state, so memory per
+worker is bounded by the sessions that are actually in use.
+
+The large plan artifacts (itinerary text, forecast, map HTML) are pickled,
+compressed and kept once in a process-wide content-addressed cache; a session
+only holds references to them, so sessions that planned the same route or
+forecast share one copy. Saving a plan also records a hash of its contents,
+which keys its exports without serializing the plan again on every render. Each session may reference at most SESSION_MAX_BYTES
+of compressed artifacts - over the cap the map HTML is dropped first (the
+route tab falls back to the static map), then the forecast. Sessions idle
+for SESSION_IDLE_TTL seconds lose their plan and unreferenced artifacts are
+freed.
+"""
+
+import hashlib
+import json
+import pickle
+import threading
+import time
+import zlib
+from dataclasses import dataclass, replace
+
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from config.constants import SESSION_MAX_BYTES, SESSION_IDLE_TTL, SESSION_SWEEP_INTERVAL
+from utils.trip_plan import STAGE_OUTPUTS
+from utils.telemetry import Counter, Gauge, Histogram, register_metric, record_event, METRIC_PREFIX
+
+# Plan attributes stored compressed in the shared cache, the rest stay inline
+ARTIFACT_FIELDS = ('itinerary', 'weather_forecast', 'map_html')
+
+# Artifacts given up, in order, when a session is over its byte cap
+DROP_ORDER = ('map_html', 'weather_forecast')
+
+COMPRESSION_LEVEL = 6
+BYTE_BUCKETS = (1024, 4096, 16384, 65536, 131072, 262144, 524288, 1048576)
+
+SESSIONS = register_metric(Gauge(
+    f"{METRIC_PREFIX}_session_store_sessions", "Sessions holding a plan", "pool"
+))
+STORED_BYTES = register_metric(Gauge(
+    f"{METRIC_PREFIX}_session_store_bytes", "Bytes of plan artifacts in the shared cache", "kind"
+))
+SESSION_BYTES = register_metric(Gauge(
+    f"{METRIC_PREFIX}_session_store_bytes_per_session", "Compressed artifact bytes referenced per session", "stat"
+))
+PLAN_BYTES = register_metric(Histogram(
+    f"{METRIC_PREFIX}_session_plan_bytes", "Compressed artifact bytes of each stored plan", "pool", BYTE_BUCKETS
+))
+EVICTIONS = register_metric(Counter(
+    f"{METRIC_PREFIX}_session_store_evictions_total", "Plans or artifacts dropped from the session store", "reason"
+))
+
+
+@dataclass
+class _Blob:
+    data: bytes
+    raw_size: int
+    refs: int = 0
+
+
+@dataclass
+class _SessionEntry:
+    skeleton: object  # TripPlan with the artifact fields set to None
+    refs: dict        # artifact field -> blob digest
+    nbytes: int
+    last_access: float
+
+
+_blobs = {}     # digest -> _Blob
+_sessions = {}  # session id -> _SessionEntry
+_lock = threading.Lock()
+_last_sweep = time.monotonic()
+
+
+def current_session_id():
+    """The Streamlit session id of the running script ('local' outside the runtime)."""
+    ctx = get_script_run_ctx()
+    return ctx.session_id if ctx else 'local'
+
+
+def _pack(value):
+    """(digest, compressed bytes, raw size) of a picklable value."""
+    raw = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+    return hashlib.sha256(raw).hexdigest(), zlib.compress(raw, COMPRESSION_LEVEL), len(raw)
+
+
+def _content_digest(plan, packed):
+    """Hash of the plan as stored: its inline fields and the digests of the artifacts it keeps."""
+    inline = {name: getattr(plan, name) for name in ('inputs', 'itinerary_match', 'weather_notice', 'start_coords',
+                                                     'dest_coords', 'distance_km', 'approx_time', 'route_error')}
+    inline['artifacts'] = {name: digest for name, (digest, _, _) in packed.items()}
+    payload = json.dumps(inline, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+
+
+def _release_locked(entry):
+    for digest in entry.refs.values():
+        blob = _blobs[digest]
+        blob.refs -= 1
+        if blob.refs == 0:
+            del _blobs[digest]
+
+
+def _publish_locked():
+    SESSIONS.set('plans', len(_sessions))
+    STORED_BYTES.set('compressed', sum(len(blob.data) for blob in _blobs.values()))
+    STORED_BYTES.set('raw', sum(blob.raw_size for blob in _blobs.values()))
+    sizes = [entry.nbytes for entry in _sessions.values()]
+    SESSION_BYTES.set('mean', round(sum(sizes) / len(sizes)) if sizes else 0)
+    SESSION_BYTES.set('max', max(sizes, default=0))
+
+
+def _sweep_locked(now):
+    global _last_sweep
+    _last_sweep = now
+    idle = [session_id for session_id, entry in _sessions.items() if now - entry.last_access > SESSION_IDLE_TTL]
+    for session_id in idle:
+        _release_locked(_sessions.pop(session_id))
+    if idle:
+        EVICTIONS.inc('idle', len(idle))
+        _publish_locked()
+
+
+def _maybe_sweep_locked(now):
+    if now - _last_sweep >= SESSION_SWEEP_INTERVAL:
+        _sweep_locked(now)
+
+
+def save_plan(session_id, plan):
+    """Store `plan` as the session's current plan, replacing the previous one."""
+    packed = {name: _pack(getattr(plan, name)) for name in ARTIFACT_FIELDS if getattr(plan, name) is not None}
+
+    # Enforce the per-session cap by giving up the artifacts that can be done without
+    stage_keys = dict(plan.stage_keys)
+    nbytes = sum(len(data) for _, data, _ in packed.values())
+    for name in DROP_ORDER:
+        if nbytes <= SESSION_MAX_BYTES:
+            break
+        if name in packed:
+            nbytes -= len(packed.pop(name)[1])
+            # Forget the stage so a resubmission computes it again
+            stage = next(stage for stage, outputs in STAGE_OUTPUTS.items() if name in outputs)
+            stage_keys.pop(stage, None)
+            EVICTIONS.inc('cap')
+            record_event('session_artifact_dropped', field=name, session_bytes=nbytes)
+
+    skeleton = replace(plan, stage_keys=stage_keys, content_digest=_content_digest(plan, packed),
+                       **{name: None for name in ARTIFACT_FIELDS})
+    now = time.monotonic()
+    with _lock:
+        refs = {}
+        for name, (digest, data, raw_size) in packed.items():
+            blob = _blobs.get(digest)
+            if blob is None:
+                blob = _blobs[digest] = _Blob(data, raw_size)
+            blob.refs += 1
+            refs[name] = digest
+
+        previous = _sessions.get(session_id)
+        _sessions[session_id] = _SessionEntry(skeleton, refs, nbytes, now)
+        if previous is not None:
+            _release_locked(previous)
+        PLAN_BYTES.observe('plans', nbytes)
+        _maybe_sweep_locked(now)
+        _publish_locked()
+
+
+def load_plan(session_id, fields=ARTIFACT_FIELDS):
+    """The session's current plan, rebuilt from the shared cache, or None.
+
+    Only the artifacts named in `fields` are decompressed, the others are left
+    None - a result tab loads just what it renders.
+    """
+    now = time.monotonic()
+    with _lock:
+        _maybe_sweep_locked(now)
+        entry = _sessions.get(session_id)
+        if entry is None:
+            return None
+        entry.last_access = now
+        blobs = {name: _blobs[digest].data for name, digest in entry.refs.items() if name in fields}
+        skeleton = entry.skeleton
+
+    artifacts = {name: pickle.loads(zlib.decompress(data)) for name, data in blobs.items()}
+    return replace(skeleton, stage_keys=dict(skeleton.stage_keys), inputs=dict(skeleton.inputs), **artifacts)
+
+
+def has_plan(session_id):
+    """Whether the session has a stored plan (without rebuilding it)."""
+    with _lock:
+        return session_id in _sessions
+
+
+def drop_plan(session_id):
+    """Forget the session's plan."""
+    with _lock:
+        entry = _sessions.pop(session_id, None)
+        if entry is not None:
+            _release_locked(entry)
+            _publish_locked()
+
+
+def evict_idle():
+    """Drop the plans of sessions idle for longer than SESSION_IDLE_TTL."""
+    with _lock:
+        _sweep_locked(time.monotonic())
+
+
+def store_stats():
+    """Sessions, shared artifacts and their sizes, for diagnostics."""
+    with _lock:
+        return {
+            'sessions': len(_sessions),
+            'artifacts': len(_blobs),
+            'compressed_bytes': sum(len(blob.data) for blob in _blobs.values()),
+            'raw_bytes': sum(blob.raw_size for blob in _blobs.values()),
+            'max_session_bytes': max((entry.nbytes for entry in _sessions.values()), default=0)
+        }
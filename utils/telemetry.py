@@ -0,0 +1,258 @@
+"""
+Telemetry
+Span-style timing for the submit pipeline. Every span is appended to a local
+JSONL file and observed into an in-process histogram per stage, which is
+served in Prometheus text format by a small metrics endpoint.
+
+Configuration (environment):
+    TELEMETRY_SPANS_FILE    - JSONL output path (default logs/spans.jsonl, empty disables)
+    TELEMETRY_METRICS_PORT  - metrics endpoint port (default 9464, 0 disables)
+"""
+
+import json
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from config.constants import LOG_DIR
+
+SPANS_FILE = os.getenv('TELEMETRY_SPANS_FILE', os.path.join(LOG_DIR, 'spans.jsonl'))
+METRICS_PORT = int(os.getenv('TELEMETRY_METRICS_PORT', '9464'))
+
+METRIC_PREFIX = 'travel_planner'
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60)
+
+# Span that is currently open in this thread/task, for parent links
+_current_span = ContextVar('current_span', default=None)
+
+
+class Histogram:
+    """Cumulative-bucket histogram with one series per label value."""
+
+    def __init__(self, name, help_text, label, buckets=DURATION_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.label = label
+        self.buckets = buckets
+        self._series = {}  # label value -> [bucket counts..., sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, label_value, value):
+        with self._lock:
+            series = self._series.get(label_value)
+            if series is None:
+                series = self._series[label_value] = [0] * (len(self.buckets) + 2)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for label_value, series in sorted(self._series.items()):
+                labels = f'{self.label}="{label_value}"'
+                for bound, count in zip(self.buckets, series):
+                    lines.append(f'{self.name}_bucket{{{labels},le="{bound}"}} {count}')
+                lines.append(f'{self.name}_bucket{{{labels},le="+Inf"}} {series[-1]}')
+                lines.append(f'{self.name}_sum{{{labels}}} {series[-2]:.6f}')
+                lines.append(f'{self.name}_count{{{labels}}} {series[-1]}')
+        return lines
+
+
+class Counter:
+    """Monotonic counter with one series per label value."""
+
+    def __init__(self, name, help_text, label):
+        self.name = name
+        self.help_text = help_text
+        self.label = label
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def inc(self, label_value, amount=1):
+        with self._lock:
+            self._series[label_value] = self._series.get(label_value, 0) + amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for label_value, value in sorted(self._series.items()):
+                lines.append(f'{self.name}{{{self.label}="{label_value}"}} {value}')
+        return lines
+
+
+class Gauge:
+    """Current value with one series per label value."""
+
+    def __init__(self, name, help_text, label):
+        self.name = name
+        self.help_text = help_text
+        self.label = label
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def set(self, label_value, value):
+        with self._lock:
+            self._series[label_value] = value
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} gauge"]
+        with self._lock:
+            for label_value, value in sorted(self._series.items()):
+                lines.append(f'{self.name}{{{self.label}="{label_value}"}} {value}')
+        return lines
+
+
+STAGE_DURATION = Histogram(
+    f"{METRIC_PREFIX}_stage_duration_seconds", "Duration of submit pipeline stages", "stage"
+)
+STAGE_ERRORS = Counter(
+    f"{METRIC_PREFIX}_stage_errors_total", "Stages that raised an exception", "stage"
+)
+EVENTS = Counter(
+    f"{METRIC_PREFIX}_events_total", "Notable pipeline events such as fallbacks", "event"
+)
+METRICS = [STAGE_DURATION, STAGE_ERRORS, EVENTS]
+
+
+def register_metric(metric):
+    """Add a metric to the /metrics output."""
+    METRICS.append(metric)
+    return metric
+
+
+class _SpanWriter:
+    """Appends span records to the JSONL file, one line per record."""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = None
+
+    def write(self, record):
+        if not self.path:
+            return
+        line = json.dumps(record, default=str) + "\n"
+        with self._lock:
+            try:
+                if self._file is None:
+                    os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+                    self._file = open(self.path, 'a', encoding='utf-8', buffering=1)
+                self._file.write(line)
+            except OSError as e:
+                print(f"Telemetry export failed: {e}")
+                self.path = None
+
+
+_writer = _SpanWriter(SPANS_FILE)
+
+
+@contextmanager
+def span(name, **attributes):
+    """
+    Time a block as a span named `name`.
+
+    Yields a dict of attributes the block can add to. The span is exported
+    to JSONL and observed into the stage duration histogram, also on error.
+    """
+    parent = _current_span.get()
+    record = {
+        'type': 'span',
+        'name': name,
+        'trace_id': parent['trace_id'] if parent else uuid.uuid4().hex[:16],
+        'span_id': uuid.uuid4().hex[:16],
+        'parent_id': parent['span_id'] if parent else None,
+        'start': time.time(),
+        'attributes': attributes
+    }
+    token = _current_span.set(record)
+    started = time.perf_counter()
+    status = 'ok'
+    try:
+        yield attributes
+    except BaseException as e:
+        status = 'error'
+        attributes['error'] = f"{type(e).__name__}: {str(e)[:200]}"
+        STAGE_ERRORS.inc(name)
+        raise
+    finally:
+        duration = time.perf_counter() - started
+        _current_span.reset(token)
+        record['duration_s'] = round(duration, 6)
+        record['status'] = status
+        STAGE_DURATION.observe(name, duration)
+        _writer.write(record)
+
+
+def observe_duration(name, duration_s, **attributes):
+    """Record an already measured duration (e.g. time to first token) as a span."""
+    parent = _current_span.get()
+    STAGE_DURATION.observe(name, duration_s)
+    _writer.write({
+        'type': 'span',
+        'name': name,
+        'trace_id': parent['trace_id'] if parent else uuid.uuid4().hex[:16],
+        'span_id': uuid.uuid4().hex[:16],
+        'parent_id': parent['span_id'] if parent else None,
+        'start': time.time() - duration_s,
+        'duration_s': round(duration_s, 6),
+        'status': 'ok',
+        'attributes': attributes
+    })
+
+
+def record_event(name, **attributes):
+    """Record a point-in-time event, such as falling back to mock data."""
+    parent = _current_span.get()
+    EVENTS.inc(name)
+    _writer.write({
+        'type': 'event',
+        'name': name,
+        'trace_id': parent['trace_id'] if parent else None,
+        'parent_id': parent['span_id'] if parent else None,
+        'time': time.time(),
+        'attributes': attributes
+    })
+
+
+def render_metrics():
+    """All metrics in Prometheus text exposition format."""
+    lines = []
+    for metric in METRICS:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split('?')[0] != '/metrics':
+            self.send_error(404)
+            return
+        body = render_metrics().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # keep scrapes out of the app log
+
+
+def start_metrics_server(port=METRICS_PORT):
+    """Serve /metrics on a background thread; returns the server or None if disabled."""
+    if not port:
+        return None
+    try:
+        server = ThreadingHTTPServer(('0.0.0.0', port), _MetricsHandler)
+    except OSError as e:
+        print(f"Metrics endpoint not started on port {port}: {e}")
+        return None
+    threading.Thread(target=server.serve_forever, name='metrics-server', daemon=True).start()
+    return server
@@ -0,0 +1,103 @@
+"""
+Trip Plan
+The generated plan for one set of form inputs, kept per session in the
+session store (utils/session_store.py).
+
+Each stage (itinerary, weather, route, map) records a key hashed from the
+inputs it depends on. A resubmission only recomputes the stages whose inputs
+changed, and reruns with unchanged inputs re-render without recomputing.
+"""
+
+import hashlib
+import json
+from dataclasses import dataclass, field
+
+PLAN_FIELDS = (
+    'destination', 'starting_location', 'duration_days', 'budget', 'group_type',
+    'travel_mode', 'stay_preference', 'food_preference', 'interests', 'travel_goal',
+    'weather_preference', 'special_conditions'
+)
+
+# Values the form starts with, for inputs that leave a field out
+PLAN_DEFAULTS = {
+    'duration_days': 3, 'budget': 5000, 'group_type': 'Solo', 'travel_mode': 'Train',
+    'stay_preference': 'Hostel', 'food_preference': 'Veg', 'interests': '', 'travel_goal': '',
+    'weather_preference': '', 'special_conditions': ''
+}
+
+# Stage -> form fields it depends on, in execution order
+STAGE_FIELDS = {
+    'itinerary': PLAN_FIELDS,
+    'weather': ('destination', 'duration_days'),
+    'route': ('starting_location', 'destination', 'travel_mode'),
+    'map': ('starting_location', 'destination')
+}
+
+# Stage -> stage whose results it is built from
+STAGE_DEPENDS_ON = {'map': 'route'}
+
+# Stage -> plan attributes it produces
+STAGE_OUTPUTS = {
+    'itinerary': ('itinerary', 'itinerary_match'),
+    'weather': ('weather_forecast', 'weather_notice'),
+    'route': ('start_coords', 'dest_coords', 'distance_km', 'approx_time', 'route_error'),
+    'map': ('map_html',)
+}
+
+
+def hash_inputs(inputs, fields=PLAN_FIELDS):
+    """Stable short hash of the given form fields."""
+    payload = json.dumps({name: inputs.get(name) for name in fields}, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+
+
+@dataclass
+class TripPlan:
+    """Plan outputs for one set of form inputs, with per-stage cache keys."""
+    inputs: dict
+    inputs_hash: str
+    stage_keys: dict = field(default_factory=dict)
+    itinerary: str = None
+    itinerary_match: dict = None  # the near-duplicate request a reused itinerary was made for
+    weather_forecast: list = None
+    weather_notice: str = None
+    start_coords: tuple = None
+    dest_coords: tuple = None
+    distance_km: float = None
+    approx_time: float = None
+    route_error: str = None
+    map_html: str = None
+    content_digest: str = None  # hash of the stored contents, set by the session store
+
+    @classmethod
+    def for_inputs(cls, inputs, previous=None):
+        """New plan for inputs, reusing every stage of `previous` whose inputs are unchanged."""
+        plan = cls(inputs=dict(inputs), inputs_hash=hash_inputs(inputs))
+        if previous is None:
+            return plan
+
+        for stage in STAGE_FIELDS:
+            dependency = STAGE_DEPENDS_ON.get(stage)
+            if dependency and dependency not in plan.stage_keys:
+                continue
+            if previous.stage_keys.get(stage) == plan.stage_key(stage):
+                for name in STAGE_OUTPUTS[stage]:
+                    setattr(plan, name, getattr(previous, name))
+                plan.stage_keys[stage] = previous.stage_keys[stage]
+        return plan
+
+    def stage_key(self, stage):
+        """Cache key of a stage for this plan's inputs."""
+        return hash_inputs(self.inputs, STAGE_FIELDS[stage])
+
+    def pending_stages(self):
+        """Stages that still need to be computed, in execution order."""
+        return [stage for stage in STAGE_FIELDS if stage not in self.stage_keys]
+
+    def complete(self, stage, **outputs):
+        """Store a stage's outputs and mark it fresh."""
+        for name, value in outputs.items():
+            if name not in STAGE_OUTPUTS[stage]:
+                raise ValueError(f"'{name}' is not an output of stage '{stage}'")
+            setattr(self, name, value)
+        self.stage_keys[stage] = self.stage_key(stage)
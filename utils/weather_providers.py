@@ -0,0 +1,383 @@
+"""
+Weather Providers
+Daily forecasts from a chain of providers: Open-Meteo first, then the
+secondaries listed in WEATHER_PROVIDERS (MET Norway out of the box; more can
+be added with register_weather_provider).
+
+A provider's payload still in the forecast cache is served first, without
+touching its breaker or health counters. Network requests go through a
+circuit breaker: after WEATHER_BREAKER_FAILURES consecutive failures its
+circuit opens and it is skipped without a request for WEATHER_BREAKER_RESET
+seconds; then a single trial request decides whether it closes again.
+Success/failure counts and latency of requests are tracked per provider and
+exported as metrics. When no provider answers, WeatherUnavailable
+is raised - callers decide whether to show labeled sample data.
+"""
+
+import threading
+import time
+from collections import Counter as TallyCounter
+from datetime import datetime, timedelta, timezone
+
+from config.constants import (
+    MET_NORWAY_FORECAST_URL, WEATHER_PROVIDERS, WEATHER_PROVIDER_TIMEOUT, WEATHER_BREAKER_FAILURES,
+    WEATHER_BREAKER_RESET
+)
+from utils.cassette import http_session
+from utils.telemetry import Counter, Gauge, Histogram, register_metric, record_event, span, METRIC_PREFIX
+from utils.weather_utils import (
+    fetch_forecast_payload, fetch_forecast_payload_async, process_5day_forecast, get_weather_description,
+    get_weather_icon, _cached_payload, _store_payload
+)
+
+PROVIDER_LATENCY = register_metric(Histogram(
+    f"{METRIC_PREFIX}_weather_provider_latency_seconds", "Latency of weather provider requests", "provider"
+))
+PROVIDER_FAILURES = register_metric(Counter(
+    f"{METRIC_PREFIX}_weather_provider_failures_total", "Failed weather provider requests", "provider"
+))
+CIRCUIT_STATE = register_metric(Gauge(
+    f"{METRIC_PREFIX}_weather_provider_circuit_state", "Circuit state per provider (0 closed, 1 half-open, 2 open)",
+    "provider"
+))
+
+CLOSED, HALF_OPEN, OPEN = 'closed', 'half-open', 'open'
+_STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+LATENCY_SMOOTHING = 0.2  # weight of the newest request in the latency average
+
+
+class WeatherUnavailable(Exception):
+    """No weather provider could produce a forecast."""
+
+    def __init__(self, errors):
+        self.errors = errors  # provider name -> error message
+        detail = "; ".join(f"{name}: {error}" for name, error in errors.items()) or "no providers configured"
+        super().__init__(f"No weather provider available ({detail})")
+
+
+class CircuitBreaker:
+    """Consecutive-failure breaker with a single half-open trial request."""
+
+    def __init__(self, failure_threshold=WEATHER_BREAKER_FAILURES, reset_timeout=WEATHER_BREAKER_RESET):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow(self):
+        """Whether a request may go out now (claims the trial slot when half-open)."""
+        with self._lock:
+            if self.state == OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self.state = HALF_OPEN
+                self._trial_in_flight = False
+            if self.state == CLOSED:
+                return True
+            if self.state == HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.state = CLOSED
+            self.consecutive_failures = 0
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.consecutive_failures += 1
+            self._trial_in_flight = False
+            if self.state == HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+                self.state = OPEN
+                self.opened_at = time.monotonic()
+
+
+class WeatherProvider:
+    """
+    One forecast source. Subclasses implement fetch/fetch_async returning
+    daily forecast dicts in the shape process_5day_forecast produces, and
+    may implement cached to answer from a local cache without a request.
+    """
+    name = 'provider'
+    label = 'Provider'
+
+    def __init__(self):
+        self.breaker = CircuitBreaker()
+        self.successes = 0
+        self.failures = 0
+        self.latency_avg = None
+        self.last_error = None
+        self.last_success_at = None
+        self._lock = threading.Lock()
+        self._publish()
+
+    def cached(self, lat, lon, duration_days):
+        """Forecasts from a still-fresh cached payload, or None."""
+        return None
+
+    def fetch(self, lat, lon, duration_days):
+        raise NotImplementedError
+
+    async def fetch_async(self, lat, lon, duration_days, http_client):
+        raise NotImplementedError
+
+    def _publish(self):
+        CIRCUIT_STATE.set(self.name, _STATE_VALUES[self.breaker.state])
+
+    def record(self, duration_s, error=None):
+        """Track one request's outcome in the breaker, health counters and metrics."""
+        PROVIDER_LATENCY.observe(self.name, duration_s)
+        with self._lock:
+            if self.latency_avg is None:
+                self.latency_avg = duration_s
+            else:
+                self.latency_avg += LATENCY_SMOOTHING * (duration_s - self.latency_avg)
+            if error is None:
+                self.successes += 1
+                self.last_success_at = time.time()
+            else:
+                self.failures += 1
+                self.last_error = f"{type(error).__name__}: {str(error)[:200]}"
+        if error is None:
+            self.breaker.record_success()
+        else:
+            PROVIDER_FAILURES.inc(self.name)
+            was_open = self.breaker.state == OPEN
+            self.breaker.record_failure()
+            if self.breaker.state == OPEN and not was_open:
+                record_event('weather_circuit_open', provider=self.name, error=self.last_error)
+        self._publish()
+
+    def health(self):
+        with self._lock:
+            return {
+                'provider': self.name,
+                'state': self.breaker.state,
+                'successes': self.successes,
+                'failures': self.failures,
+                'consecutive_failures': self.breaker.consecutive_failures,
+                'latency_avg_s': round(self.latency_avg, 3) if self.latency_avg is not None else None,
+                'last_error': self.last_error,
+                'last_success_at': self.last_success_at
+            }
+
+    def _label(self, forecasts):
+        for forecast in forecasts:
+            forecast['source'] = self.label
+        return forecasts
+
+
+class OpenMeteoProvider(WeatherProvider):
+    name = 'open-meteo'
+    label = 'Open-Meteo'
+
+    def _process(self, payload, duration_days):
+        with span('forecast_processing'):
+            return self._label(process_5day_forecast(payload, duration_days))
+
+    def cached(self, lat, lon, duration_days):
+        payload = _cached_payload(lat, lon, self.name)
+        return None if payload is None else self._process(payload, duration_days)
+
+    def fetch(self, lat, lon, duration_days):
+        return self._process(fetch_forecast_payload(lat, lon, use_cache=False), duration_days)
+
+    async def fetch_async(self, lat, lon, duration_days, http_client):
+        payload = await fetch_forecast_payload_async(lat, lon, http_client, use_cache=False)
+        return self._process(payload, duration_days)
+
+
+# MET Norway symbol code (without _day/_night) -> closest WMO weather code
+MET_SYMBOL_CODES = {
+    'clearsky': 0, 'fair': 1, 'partlycloudy': 2, 'cloudy': 3, 'fog': 45,
+    'lightrain': 61, 'rain': 63, 'heavyrain': 65,
+    'lightrainshowers': 80, 'rainshowers': 81, 'heavyrainshowers': 82,
+    'lightsleet': 71, 'sleet': 73, 'heavysleet': 75, 'lightsnow': 71, 'snow': 73, 'heavysnow': 75,
+    'lightsleetshowers': 85, 'sleetshowers': 85, 'heavysleetshowers': 86,
+    'lightsnowshowers': 85, 'snowshowers': 85, 'heavysnowshowers': 86
+}
+HOURLY_SAMPLE_HOURS = (6, 9, 12, 15, 18, 21, 0, 3)  # the weather tab's hourly columns
+
+
+def _met_weather_code(symbol):
+    base = symbol.split('_')[0]
+    if 'thunder' in base:
+        return 95
+    return MET_SYMBOL_CODES.get(base, 2)
+
+
+def process_met_norway_forecast(payload, duration_days, lon):
+    """Daily forecasts from a MET Norway locationforecast/complete payload.
+
+    Its timestamps are UTC; days are grouped by approximate local solar time
+    (longitude / 15 hours), which is close enough for daily highs and lows.
+    """
+    offset = timedelta(hours=lon / 15)
+    days = {}
+    for entry in payload['properties']['timeseries']:
+        local = datetime.fromisoformat(entry['time'].replace('Z', '+00:00')).astimezone(timezone.utc) + offset
+        data = entry['data']
+        instant = data['instant']['details']
+        period = data.get('next_1_hours') or data.get('next_6_hours') or {}
+        day = days.setdefault(local.date(), {'temps': [], 'humidity': [], 'wind': [], 'uv': [], 'rain': [],
+                                             'symbols': TallyCounter(), 'hourly': {}, 'hours': []})
+        day['hours'].append(local.hour + local.minute / 60)
+        day['temps'].append(instant['air_temperature'])
+        day['humidity'].append(instant.get('relative_humidity', 65))
+        day['wind'].append(instant.get('wind_speed', 0) * 3.6)  # m/s -> km/h
+        day['uv'].append(instant.get('ultraviolet_index_clear_sky', 0))
+        rain = period.get('details', {}).get('probability_of_precipitation')
+        if rain is not None:
+            day['rain'].append(rain)
+        symbol = period.get('summary', {}).get('symbol_code')
+        if symbol and 6 <= local.hour <= 18:
+            day['symbols'][symbol] += 1
+        day['hourly'].setdefault(local.hour, (instant['air_temperature'], rain or 0))
+
+    # The series ends part-way through its last day; a day needs half a day of data
+    dates = sorted(days)
+    dates = dates[:1] + [date for date in dates[1:] if max(days[date]['hours']) - min(days[date]['hours']) >= 12]
+
+    forecasts = []
+    for date in dates[:duration_days]:
+        day = days[date]
+        code = _met_weather_code(day['symbols'].most_common(1)[0][0]) if day['symbols'] else 2
+        samples = [day['hourly'][hour] for hour in HOURLY_SAMPLE_HOURS if hour in day['hourly']]
+        forecasts.append({
+            'date': date.strftime('%a, %d %b'),
+            'day_name': date.strftime('%A'),
+            'temp_max': round(max(day['temps'])),
+            'temp_min': round(min(day['temps'])),
+            'temp_avg': round((max(day['temps']) + min(day['temps'])) / 2),
+            'description': get_weather_description(code),
+            'icon': get_weather_icon(code),
+            'rain_chance': round(max(day['rain'])) if day['rain'] else 0,
+            'uv_index': round(max(day['uv']), 1),
+            'wind_speed': round(max(day['wind']), 1),
+            'hourly_temps': [round(temp) for temp, _ in samples],
+            'hourly_rain': [round(rain) for _, rain in samples],
+            'humidity_avg': round(sum(day['humidity']) / len(day['humidity']))
+        })
+    return forecasts
+
+
+class MetNorwayProvider(WeatherProvider):
+    """MET Norway's free locationforecast API (requires an identifying User-Agent)."""
+    name = 'met-norway'
+    label = 'MET Norway'
+    user_agent = 'travel_planner_app'
+
+    def _params(self, lat, lon):
+        return {'lat': round(lat, 4), 'lon': round(lon, 4)}
+
+    def _process(self, payload, lon, duration_days):
+        with span('forecast_processing', provider=self.name):
+            return self._label(process_met_norway_forecast(payload, duration_days, lon))
+
+    def cached(self, lat, lon, duration_days):
+        payload = _cached_payload(lat, lon, self.name)
+        return None if payload is None else self._process(payload, lon, duration_days)
+
+    def fetch(self, lat, lon, duration_days):
+        with span('weather_fetch', provider=self.name) as attributes:
+            response = http_session().get(MET_NORWAY_FORECAST_URL, params=self._params(lat, lon),
+                                          headers={'User-Agent': self.user_agent}, timeout=WEATHER_PROVIDER_TIMEOUT)
+            attributes['status_code'] = response.status_code
+        response.raise_for_status()
+        payload = response.json()
+        forecasts = self._process(payload, lon, duration_days)
+        _store_payload(lat, lon, payload, self.name)  # only payloads that processed
+        return forecasts
+
+    async def fetch_async(self, lat, lon, duration_days, http_client):
+        with span('weather_fetch', provider=self.name) as attributes:
+            response = await http_client.get(MET_NORWAY_FORECAST_URL, params=self._params(lat, lon),
+                                             headers={'User-Agent': self.user_agent},
+                                             timeout=WEATHER_PROVIDER_TIMEOUT)
+            attributes['status_code'] = response.status_code
+        response.raise_for_status()
+        payload = response.json()
+        forecasts = self._process(payload, lon, duration_days)
+        _store_payload(lat, lon, payload, self.name)  # only payloads that processed
+        return forecasts
+
+
+PROVIDER_CLASSES = {
+    OpenMeteoProvider.name: OpenMeteoProvider,
+    MetNorwayProvider.name: MetNorwayProvider
+}
+
+_providers = None
+_providers_lock = threading.Lock()
+
+
+def get_weather_providers():
+    """The provider chain configured by WEATHER_PROVIDERS, created once per process."""
+    global _providers
+    with _providers_lock:
+        if _providers is None:
+            unknown = [name for name in WEATHER_PROVIDERS if name not in PROVIDER_CLASSES]
+            if unknown:
+                print(f"Ignoring unknown weather providers: {', '.join(unknown)}")
+            _providers = [PROVIDER_CLASSES[name]() for name in WEATHER_PROVIDERS if name in PROVIDER_CLASSES]
+        return list(_providers)
+
+
+def register_weather_provider(provider, index=None):
+    """Add a provider instance to the chain (at `index`, or as the last fallback)."""
+    get_weather_providers()
+    with _providers_lock:
+        _providers.insert(len(_providers) if index is None else index, provider)
+
+
+def provider_health():
+    """Health and latency of every configured provider."""
+    return [provider.health() for provider in get_weather_providers()]
+
+
+def fetch_daily_forecast(lat, lon, duration_days):
+    """Forecast from the first healthy provider that answers; raises WeatherUnavailable."""
+    errors = {}
+    for provider in get_weather_providers():
+        # Cached payloads are served even with the circuit open and are not counted as requests
+        forecasts = provider.cached(lat, lon, duration_days)
+        if forecasts is not None:
+            return forecasts
+        if not provider.breaker.allow():
+            errors[provider.name] = 'circuit open'
+            continue
+        started = time.perf_counter()
+        try:
+            forecasts = provider.fetch(lat, lon, duration_days)
+        except Exception as e:
+            provider.record(time.perf_counter() - started, e)
+            errors[provider.name] = f"{type(e).__name__}: {e}"
+            continue
+        provider.record(time.perf_counter() - started)
+        return forecasts
+    raise WeatherUnavailable(errors)
+
+
+async def fetch_daily_forecast_async(lat, lon, duration_days, http_client):
+    """Non-blocking fetch_daily_forecast over an httpx.AsyncClient."""
+    errors = {}
+    for provider in get_weather_providers():
+        forecasts = provider.cached(lat, lon, duration_days)
+        if forecasts is not None:
+            return forecasts
+        if not provider.breaker.allow():
+            errors[provider.name] = 'circuit open'
+            continue
+        started = time.perf_counter()
+        try:
+            forecasts = await provider.fetch_async(lat, lon, duration_days, http_client)
+        except Exception as e:
+            provider.record(time.perf_counter() - started, e)
+            errors[provider.name] = f"{type(e).__name__}: {e}"
+            continue
+        provider.record(time.perf_counter() - started)
+        return forecasts
+    raise WeatherUnavailable(errors)
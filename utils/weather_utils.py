@@ -1,51 +1,173 @@
-import requests
+import threading
+import time
+
 import streamlit as st
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 
-def get_weather_forecast(destination, duration_days):
-    """Get 5-day weather forecast using free Open-Meteo API"""
+from config.constants import (
+    OPEN_METEO_FORECAST_URL, WEATHER_FORECAST_DAYS, WEATHER_PROVIDER_TIMEOUT, WEATHER_SAMPLE_FALLBACK
+)
+from utils.cassette import http_session
+from utils.climatology import climatology_forecasts, SEED_SOURCE
+from utils.telemetry import span, record_event
+
+# Raw forecast payloads are shared by every session, batch worker and API request for a while
+FORECAST_CACHE_TTL = 30 * 60  # seconds
+_forecast_cache = {}  # (provider, lat, lon) rounded to ~1 km -> (fetched_at, payload)
+_forecast_cache_lock = threading.Lock()
+
+# Days whose numbers are illustrative or approximate - never packed for
+UNRELIABLE_SOURCES = ('sample', SEED_SOURCE)
+
+def reliable_forecasts(forecasts):
+    """The forecast days that packing suggestions may be based on"""
+    return [f for f in forecasts or [] if f.get('source') not in UNRELIABLE_SOURCES]
+
+def _forecast_params(lat, lon):
+    # Open-Meteo API - 7-day forecast, completely free
+    return {
+        'latitude': lat,
+        'longitude': lon,
+        'daily': 'temperature_2m_max,temperature_2m_min,precipitation_probability_mean,weathercode,uv_index_max,wind_speed_10m_max',
+        'hourly': 'temperature_2m,relative_humidity_2m,precipitation_probability,weathercode',
+        'timezone': 'auto',
+        'forecast_days': WEATHER_FORECAST_DAYS
+    }
+
+def _cached_payload(lat, lon, provider='open-meteo'):
+    with _forecast_cache_lock:
+        cached = _forecast_cache.get((provider, round(lat, 2), round(lon, 2)))
+    if cached and time.time() - cached[0] < FORECAST_CACHE_TTL:
+        return cached[1]
+    return None
+
+def _store_payload(lat, lon, payload, provider='open-meteo'):
+    with _forecast_cache_lock:
+        _forecast_cache[(provider, round(lat, 2), round(lon, 2))] = (time.time(), payload)
+
+def fetch_forecast_payload(lat, lon, timeout=WEATHER_PROVIDER_TIMEOUT, use_cache=True):
+    """Fetch the raw 7-day Open-Meteo payload for a point, cached for FORECAST_CACHE_TTL
+
+    use_cache=False always downloads (the fresh payload is still cached).
+    """
+    payload = _cached_payload(lat, lon) if use_cache else None
+    if payload is not None:
+        return payload
+
+    with span('weather_fetch', provider='open-meteo') as attributes:
+        response = http_session().get(OPEN_METEO_FORECAST_URL, params=_forecast_params(lat, lon), timeout=timeout)
+        attributes['status_code'] = response.status_code
+    response.raise_for_status()
+    payload = response.json()
+    _store_payload(lat, lon, payload)
+    return payload
+
+async def fetch_forecast_payload_async(lat, lon, http_client, timeout=WEATHER_PROVIDER_TIMEOUT, use_cache=True):
+    """Non-blocking fetch_forecast_payload over an httpx.AsyncClient, sharing its cache"""
+    payload = _cached_payload(lat, lon) if use_cache else None
+    if payload is not None:
+        return payload
+
+    with span('weather_fetch', provider='open-meteo') as attributes:
+        response = await http_client.get(OPEN_METEO_FORECAST_URL, params=_forecast_params(lat, lon), timeout=timeout)
+        attributes['status_code'] = response.status_code
+    response.raise_for_status()
+    payload = response.json()
+    _store_payload(lat, lon, payload)
+    return payload
+
+def _sample_forecast(destination, duration_days, error=None):
+    """Labeled sample forecast plus notice, recorded as a mock fallback event
+
+    With WEATHER_SAMPLE_FALLBACK off no forecast is returned instead.
+    """
+    if error is None:
+        reason, cause = 'no_coordinates', f"Could not find coordinates for {destination}"
+    else:
+        status = getattr(getattr(error, 'response', None), 'status_code', None)
+        reason = f'http_{status}' if status else type(error).__name__
+        cause = "Live weather services are unavailable right now"
+    record_event('weather_mock_fallback', reason=reason, destination=destination)
+    if not WEATHER_SAMPLE_FALLBACK:
+        return [], f"{cause} - no forecast available."
+    return create_detailed_mock_weather(duration_days), f"{cause} - showing SAMPLE weather, not a real forecast."
+
+def _with_climatology(forecasts, coords, duration_days):
+    """Fill the trip days after the live forecast window with typical conditions"""
+    missing = duration_days - len(forecasts)
+    if missing <= 0:
+        return forecasts
+    return forecasts + climatology_forecasts(coords, date.today() + timedelta(days=len(forecasts)), missing)
+
+def _fallback_forecast(destination, duration_days, coords, error):
+    """Typical conditions for the whole trip when no provider answers, else labeled sample data"""
+    forecasts = climatology_forecasts(coords, date.today(), duration_days)
+    if not forecasts:
+        return _sample_forecast(destination, duration_days, error)
+    record_event('weather_climatology_fallback', destination=destination)
+    return forecasts, "Live forecast unavailable - showing typical conditions for the season instead."
+
+def fetch_weather_forecast(destination, duration_days, coords=None):
+    """Get the forecast without any Streamlit calls
+
+    Returns (forecasts, notice); notice explains why typical conditions,
+    sample data or no data is shown and is None for a live forecast. Days
+    beyond the live forecast window come from the climatology store. Every
+    day carries its 'source': a provider's name, 'climatology' or 'sample'.
+    """
+    from utils.weather_providers import fetch_daily_forecast
     try:
-        from utils.map_utils import get_coordinates
-        coords = get_coordinates(destination)
+        if coords is None:
+            from utils.map_utils import get_coordinates
+            coords = get_coordinates(destination)
         
         if not coords:
-            st.warning(f"Could not find coordinates for {destination}")
-            return create_detailed_mock_weather(duration_days)  # FIXED: changed from create_mock_weather
-            
-        lat, lon = coords
+            return _sample_forecast(destination, duration_days)
         
-        # Open-Meteo API - 7-day forecast, completely free
-        url = "https://api.open-meteo.com/v1/forecast"
-        params = {
-            'latitude': lat,
-            'longitude': lon,
-            'daily': 'temperature_2m_max,temperature_2m_min,precipitation_probability_mean,weathercode,uv_index_max,wind_speed_10m_max',
-            'hourly': 'temperature_2m,relative_humidity_2m,precipitation_probability,weathercode',
-            'timezone': 'auto',
-            'forecast_days': 7  # Get 7 days forecast
-        }
+        try:
+            forecasts = fetch_daily_forecast(*coords, duration_days)
+        except Exception as e:
+            return _fallback_forecast(destination, duration_days, coords, e)
+        return _with_climatology(forecasts, coords, duration_days), None
+            
+    except Exception as e:
+        return _sample_forecast(destination, duration_days, e)
+
+async def fetch_weather_forecast_async(destination, duration_days, http_client, coords=None):
+    """Non-blocking fetch_weather_forecast; same (forecasts, notice) result"""
+    from utils.weather_providers import fetch_daily_forecast_async
+    try:
+        if coords is None:
+            from utils.map_utils import get_coordinates_async
+            coords = await get_coordinates_async(destination, http_client)
         
-        response = requests.get(url, params=params, timeout=10)
+        if not coords:
+            return _sample_forecast(destination, duration_days)
         
-        if response.status_code == 200:
-            data = response.json()
-            return process_5day_forecast(data, duration_days)
-        else:
-            st.info("Using sample weather data")
-            return create_detailed_mock_weather(duration_days)
+        try:
+            forecasts = await fetch_daily_forecast_async(*coords, duration_days, http_client)
+        except Exception as e:
+            return _fallback_forecast(destination, duration_days, coords, e)
+        return _with_climatology(forecasts, coords, duration_days), None
             
     except Exception as e:
-        st.info("Using sample weather data")
-        return create_detailed_mock_weather(duration_days)
+        return _sample_forecast(destination, duration_days, e)
+
+def get_weather_forecast(destination, duration_days):
+    """Get the trip's weather forecast using the free weather providers"""
+    forecasts, notice = fetch_weather_forecast(destination, duration_days)
+    if notice:
+        st.info(notice)
+    return forecasts
 
 def process_5day_forecast(data, duration_days):
-    """Process 5-day detailed forecast"""
+    """Process the detailed daily forecast (the whole live window, up to the trip length)"""
     forecasts = []
     
     daily = data['daily']
     
-    # Show 5 days or trip duration, whichever is smaller
-    days_to_show = min(5, duration_days)
+    # Show every forecast day or the trip duration, whichever is smaller
+    days_to_show = min(len(daily['time']), duration_days)
     
     for i in range(days_to_show):
         # Get hourly data for this day to show variation
@@ -100,6 +222,8 @@ def get_weather_description(weather_code):
         45: 'Foggy', 48: 'Foggy', 51: 'Light Drizzle', 53: 'Moderate Drizzle',
         55: 'Dense Drizzle', 61: 'Light Rain', 63: 'Moderate Rain', 65: 'Heavy Rain',
         80: 'Light Showers', 81: 'Moderate Showers', 82: 'Heavy Showers',
+        71: 'Light Snow', 73: 'Snow', 75: 'Heavy Snow', 77: 'Snow Grains',
+        85: 'Snow Showers', 86: 'Heavy Snow Showers',
         95: 'Thunderstorm', 96: 'Thunderstorm with Hail', 99: 'Severe Thunderstorm'
     }
     return codes.get(weather_code, 'Partly Cloudy')
@@ -116,6 +240,8 @@ def get_weather_icon(weather_code):
         return '10d'
     elif weather_code in [95, 96, 99]:
         return '11d'
+    elif weather_code in [71, 73, 75, 77, 85, 86]:
+        return '13d'
     else:
         return '02d'
 
@@ -140,7 +266,8 @@ def create_detailed_mock_weather(duration_days):
             'wind_speed': [12, 15, 20, 25, 10][i % 5],
             'hourly_temps': day_temps[:8],  # 8 samples for the day
             'hourly_rain': [10, 5, 0, 0, 20, 40, 30, 10],
-            'humidity_avg': [60, 65, 75, 80, 55][i % 5]
+            'humidity_avg': [60, 65, 75, 80, 55][i % 5],
+            'source': 'sample'
         })
     
     return forecasts
@@ -156,35 +283,47 @@ def get_weather_emoji(icon_code):
     }
     return emoji_map.get(icon_code, '🌈')
 
+TABLE_DAYS_PER_ROW = 7  # longer trips get one forecast table per week
+
 def display_weather_forecast(forecasts, destination):
-    """Display 5-day detailed weather forecast"""
-    st.subheader(f"🌤️ 5-Day Weather Forecast for {destination}")
+    """Display the detailed daily forecast, with typical conditions for days beyond it"""
+    st.subheader(f"🌤️ Weather Outlook for {destination}")
     
     if not forecasts:
         st.info("Weather data unavailable. Check destination spelling.")
         return
     
-    # Display daily forecast cards
-    cols = st.columns(len(forecasts))
+    if forecasts[0].get('source') == 'sample':
+        st.warning("⚠️ **Sample data** - live weather was unavailable, so these numbers are illustrative only.")
+    else:
+        sources = sorted({f['source'] for f in forecasts if f.get('source') not in (None, 'climatology')})
+        notes = [f"Forecast: {', '.join(sources)}"] if sources else []
+        if any(f.get('source') == 'climatology' for f in forecasts):
+            notes.append("days marked *typical* show seasonal normals, not a forecast")
+        if notes:
+            st.caption(" · ".join(notes))
     
-    for i, forecast in enumerate(forecasts):
-        with cols[i]:
-            emoji = get_weather_emoji(forecast['icon'])
-            
-            st.subheader(f"{forecast['date']}")
-            st.write(f"**{forecast['day_name']}** {emoji}")
-            
-            st.metric(
-                label="High / Low",
-                value=f"{forecast['temp_max']}°C",
-                delta=f"{forecast['temp_min']}°C"
-            )
-            
-            st.caption(f"**{forecast['description']}**")
-            st.caption(f"💧 Humidity: {forecast['humidity_avg']}%")
-            st.caption(f"🌧️ Rain: {forecast['rain_chance']}%")
-            st.caption(f"🌬️ Wind: {forecast['wind_speed']} km/h")
-            st.caption(f"☀️ UV: {forecast['uv_index']}")
+    # Daily forecast as tables: a column per day instead of 7 elements per card, one table per week
+    rows = [
+        ("🌡️ High / Low", lambda f: f"**{f['temp_max']}°C** / {f['temp_min']}°C"),
+        ("☁️ Conditions", lambda f: f['description']),
+        ("💧 Humidity", lambda f: f"{f['humidity_avg']}%"),
+        ("🌧️ Rain", lambda f: f"{f['rain_chance']}%"),
+        ("🌬️ Wind", lambda f: f"{f['wind_speed']} km/h"),
+        ("☀️ UV", lambda f: f"{f['uv_index']}")
+    ]
+    tables = []
+    for start in range(0, len(forecasts), TABLE_DAYS_PER_ROW):
+        week = forecasts[start:start + TABLE_DAYS_PER_ROW]
+        header = "| | " + " | ".join(
+            f"**{f['date']}**<br>{f['day_name']} {get_weather_emoji(f['icon'])}"
+            + ("<br>*typical*" if f.get('source') == 'climatology' else "") for f in week
+        ) + " |"
+        table_lines = [header, "|---" * (len(week) + 1) + "|"]
+        for label, value in rows:
+            table_lines.append(f"| {label} | " + " | ".join(value(f) for f in week) + " |")
+        tables.append("\n".join(table_lines))
+    st.markdown("\n\n".join(tables), unsafe_allow_html=True)
     
     # Detailed analysis
     st.subheader("📊 Weather Analysis")
@@ -208,21 +347,24 @@ def display_weather_forecast(forecasts, destination):
         st.subheader(f"⏰ {forecasts[0]['day_name']} - Hourly Overview")
         hours = ['6AM', '9AM', '12PM', '3PM', '6PM', '9PM', '12AM', '3AM']
         
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            st.write("**Temperature**")
-            for hour, temp in zip(hours, forecasts[0]['hourly_temps']):
-                st.write(f"{hour}: {temp}°C")
-        
-        with col2:
-            st.write("**Rain Chance**")
-            for hour, rain in zip(hours, forecasts[0]['hourly_rain']):
-                st.write(f"{hour}: {rain}%")
+        # One dataframe for both hourly series instead of a write per value
+        temps = forecasts[0]['hourly_temps']
+        rains = forecasts[0]['hourly_rain']
+        count = min(len(hours), len(temps), len(rains))
+        st.dataframe(
+            {
+                'Time': hours[:count],
+                'Temperature (°C)': temps[:count],
+                'Rain Chance (%)': rains[:count]
+            },
+            hide_index=True,
+            use_container_width=True
+        )
 
 def get_weather_packing_tips(forecasts):
-    """Generate detailed packing tips based on 5-day forecast"""
+    """Generate detailed packing tips based on the trip's forecast (sample and seed days are ignored)"""
     tips = []
+    forecasts = reliable_forecasts(forecasts)
     
     if not forecasts:
         return tips